@@ -0,0 +1,34 @@
+"""add_rate_limit_buckets
+
+Revision ID: 0b5e7a3c9f12
+Revises: f4c8d1e6a925
+Create Date: 2026-10-19 11:03:54.270391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b5e7a3c9f12'
+down_revision: Union[str, None] = 'f4c8d1e6a925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: no WAL for every login attempt; the buckets are emptied after a crash
+    op.create_table('rate_limit_buckets',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('key'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
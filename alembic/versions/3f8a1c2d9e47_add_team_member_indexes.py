@@ -0,0 +1,28 @@
+"""add_team_member_indexes
+
+Revision ID: 3f8a1c2d9e47
+Revises: 910e77aa8945
+Create Date: 2026-10-18 10:12:40.514213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c2d9e47'
+down_revision: Union[str, None] = '910e77aa8945'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_team_members_parent_level', 'team_members', ['parent_user_id', 'level'], unique=False)
+    op.create_index('ix_team_members_child', 'team_members', ['child_user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_team_members_child', table_name='team_members')
+    op.drop_index('ix_team_members_parent_level', table_name='team_members')
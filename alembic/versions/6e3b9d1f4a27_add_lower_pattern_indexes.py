@@ -0,0 +1,39 @@
+"""add_lower_pattern_indexes
+
+Revision ID: 6e3b9d1f4a27
+Revises: b3f7d2a8e614
+Create Date: 2026-10-19 21:05:37.618204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e3b9d1f4a27'
+down_revision: Union[str, None] = 'b3f7d2a8e614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Admin search matches short name/email input with lower(column) LIKE 'x%'
+LOWER_PATTERN_INDEXES = [
+    ('ix_users_name_lower_pattern', 'users', 'name'),
+    ('ix_users_email_lower_pattern', 'users', 'email'),
+]
+
+
+def upgrade() -> None:
+    # Build indexes without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, column in LOWER_PATTERN_INDEXES:
+            op.create_index(name, table, [sa.text(f'lower({column}) text_pattern_ops')], unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in LOWER_PATTERN_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""add_activity_log_indexes
+
+Revision ID: 8a6c3e9d2b41
+Revises: 5d2f8b4e1c73
+Create Date: 2026-10-19 15:46:02.113857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a6c3e9d2b41'
+down_revision: Union[str, None] = '5d2f8b4e1c73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_activity_logs_created_at', ['created_at']),
+    ('ix_activity_logs_action_type_created_at', ['action_type', 'created_at']),
+    ('ix_activity_logs_entity', ['entity_type', 'entity_id']),
+]
+
+
+def upgrade() -> None:
+    # /admin/activity pages newest first, optionally by action type or entity
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'activity_logs', columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='activity_logs', postgresql_concurrently=True, if_exists=True)
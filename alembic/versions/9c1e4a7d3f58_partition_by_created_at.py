@@ -0,0 +1,190 @@
+"""partition_by_created_at
+
+Revision ID: 9c1e4a7d3f58
+Revises: 8a6c3e9d2b41
+Create Date: 2026-10-19 16:41:08.273915
+
+Rebuilds transactions, activity_logs and notifications as tables range
+partitioned by month on created_at. Each table is renamed, recreated as a
+partitioned parent with the same columns, refilled with INSERT ... SELECT
+and the old table dropped, so the migration rewrites every row and holds
+exclusive locks on the three tables until it commits: run it in a
+maintenance window.
+
+Postgres requires every unique key of a partitioned table to include the
+partition column, which means:
+  * primary keys become (id, created_at); ids still come from the same
+    sequences and stay unique,
+  * transactions.transaction_uid stays unique through the transaction_uids
+    table, filled by a BEFORE INSERT trigger,
+  * foreign keys can no longer reference transactions(id), so the ones from
+    commissions.transaction_id and notifications.related_transaction_id are
+    dropped.
+
+created_at becomes NOT NULL, since it picks the partition. Rows without one
+are not given a made-up date: the upgrade stops before changing anything and
+lists how many rows of each table need a created_at set by the operator.
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e4a7d3f58'
+down_revision: Union[str, None] = '8a6c3e9d2b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('transactions', 'activity_logs', 'notifications')
+
+# Months created past the current one; frozen copy of the PARTITION_MONTHS_AHEAD
+# default, which the app uses to keep this window filled
+MONTHS_AHEAD = 3
+
+INBOUND_FOREIGN_KEYS = (
+    ('commissions', 'commissions_transaction_id_fkey', 'transaction_id'),
+    ('notifications', 'notifications_related_transaction_id_fkey', 'related_transaction_id'),
+)
+
+NEW_INDEXES = (
+    ('ix_transactions_created_at', 'transactions', ['created_at']),
+    ('ix_transactions_user_id_created_at', 'transactions', ['user_id', 'created_at']),
+    ('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at']),
+)
+
+SECONDARY_INDEXES = """
+SELECT pg_get_indexdef(i.indexrelid)
+FROM pg_index i
+WHERE i.indrelid = CAST(:table AS regclass)
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+"""
+
+FOREIGN_KEYS = """
+SELECT conname, pg_get_constraintdef(oid)
+FROM pg_constraint
+WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+"""
+
+CLAIM_UID_FUNCTION = """
+CREATE OR REPLACE FUNCTION transactions_claim_uid() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_uids (transaction_uid) VALUES (NEW.transaction_uid);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+CLAIM_UID_TRIGGER = """
+CREATE TRIGGER transactions_claim_uid
+BEFORE INSERT ON transactions
+FOR EACH ROW EXECUTE FUNCTION transactions_claim_uid()
+"""
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rebuild(table: str, partitioned: bool) -> None:
+    """Recreate `table` (partitioned or plain) with its columns, checks, indexes and foreign keys."""
+    connection = op.get_bind()
+    indexes = [
+        # A partitioned parent's index definitions read "ON ONLY <table>"
+        definition.replace(' ON ONLY ', ' ON ', 1)
+        for definition in connection.execute(sa.text(SECONDARY_INDEXES), {'table': table}).scalars()
+    ]
+    foreign_keys = connection.execute(sa.text(FOREIGN_KEYS), {'table': table}).all()
+
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+
+    if partitioned:
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)'
+        )
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+
+        first = connection.execute(sa.text(f"SELECT CAST(date_trunc('month', min(created_at)) AS date) FROM {old}")).scalar()
+        current = date.today().replace(day=1)
+        month = min(first or current, current)
+        while month <= add_months(current, MONTHS_AHEAD):
+            following = add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+            )
+            month = following
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old} CASCADE')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({'id, created_at' if partitioned else 'id'})")
+    for definition in indexes:
+        op.execute(definition)
+    for name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+
+
+def check_created_at() -> None:
+    """Refuse to partition tables with rows whose created_at is NULL."""
+    connection = op.get_bind()
+    missing = {
+        table: connection.execute(sa.text(f'SELECT count(*) FROM {table} WHERE created_at IS NULL')).scalar()
+        for table in TABLES
+    }
+    missing = {table: count for table, count in missing.items() if count}
+    if missing:
+        raise RuntimeError(
+            'Cannot partition by created_at while rows have none: '
+            + ', '.join(f'{table}: {count} rows' for table, count in missing.items())
+            + '. Set it (e.g. UPDATE <table> SET created_at = ... WHERE created_at IS NULL) and re-run the upgrade.'
+        )
+
+
+def upgrade() -> None:
+    check_created_at()
+
+    for table, name, _ in INBOUND_FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+
+    for table in TABLES:
+        rebuild(table, partitioned=True)
+
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+    op.create_table('transaction_uids',
+    sa.Column('transaction_uid', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('transaction_uid')
+    )
+    op.execute('INSERT INTO transaction_uids (transaction_uid) SELECT transaction_uid FROM transactions')
+    op.execute(CLAIM_UID_FUNCTION)
+    op.execute(CLAIM_UID_TRIGGER)
+
+
+def downgrade() -> None:
+    # Rows of detached (archived) partitions are not brought back
+    op.execute('DROP TRIGGER transactions_claim_uid ON transactions')
+    op.execute('DROP FUNCTION transactions_claim_uid()')
+    op.drop_table('transaction_uids')
+
+    for name, table, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table)
+
+    for table in TABLES:
+        rebuild(table, partitioned=False)
+
+    op.create_unique_constraint('transactions_transaction_uid_key', 'transactions', ['transaction_uid'])
+    for table, name, column in INBOUND_FOREIGN_KEYS:
+        op.create_foreign_key(name, table, 'transactions', [column], ['id'])
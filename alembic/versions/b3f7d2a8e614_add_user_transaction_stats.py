@@ -0,0 +1,48 @@
+"""add_user_transaction_stats
+
+Revision ID: b3f7d2a8e614
+Revises: 9c1e4a7d3f58
+Create Date: 2026-10-19 18:27:44.091356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f7d2a8e614'
+down_revision: Union[str, None] = '9c1e4a7d3f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months are IST, like the timestamps the API returns
+BACKFILL = """
+INSERT INTO user_transaction_stats (user_id, month, type, status, count, crypto_amount, gross_inr_amount, net_inr_amount)
+SELECT user_id, CAST(date_trunc('month', created_at + interval '5 hours 30 minutes') AS date), type, COALESCE(status, 'pending'),
+       count(*), COALESCE(sum(crypto_amount), 0), COALESCE(sum(gross_inr_amount), 0), COALESCE(sum(net_inr_amount), 0)
+FROM transactions
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def upgrade() -> None:
+    op.create_table('user_transaction_stats',
+    sa.Column('user_id', sa.BigInteger(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('crypto_amount', sa.DECIMAL(precision=18, scale=6), server_default=sa.text('0'), nullable=False),
+    sa.Column('gross_inr_amount', sa.DECIMAL(precision=18, scale=2), server_default=sa.text('0'), nullable=False),
+    sa.Column('net_inr_amount', sa.DECIMAL(precision=18, scale=2), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'month', 'type', 'status')
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.drop_table('user_transaction_stats')
@@ -0,0 +1,43 @@
+"""add_user_counters
+
+Revision ID: c51e7b3a8d02
+Revises: 3f8a1c2d9e47
+Create Date: 2026-10-18 11:03:18.227604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e7b3a8d02'
+down_revision: Union[str, None] = '3f8a1c2d9e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('team_size', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    # total_commission_earned becomes the commission counter; it was never written before
+    op.alter_column('users', 'total_commission_earned', server_default=sa.text('0'))
+
+    # Backfill from the source tables
+    op.execute("""
+        UPDATE users u SET team_size = t.team_size
+        FROM (SELECT parent_user_id, count(*) AS team_size FROM team_members GROUP BY parent_user_id) t
+        WHERE u.id = t.parent_user_id
+    """)
+    op.execute("""
+        UPDATE users u SET total_commission_earned = COALESCE(c.total_commission, 0)
+        FROM users x
+        LEFT JOIN (SELECT referrer_user_id, sum(commission_amount) AS total_commission FROM commissions GROUP BY referrer_user_id) c
+            ON c.referrer_user_id = x.id
+        WHERE u.id = x.id AND u.total_commission_earned IS DISTINCT FROM COALESCE(c.total_commission, 0)
+    """)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'total_commission_earned', server_default=None)
+    op.drop_column('users', 'team_size')
@@ -0,0 +1,45 @@
+"""add_commission_levels_and_outbox
+
+Revision ID: d7b2e94f1a6c
+Revises: c51e7b3a8d02
+Create Date: 2026-10-18 12:41:09.836152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b2e94f1a6c'
+down_revision: Union[str, None] = 'c51e7b3a8d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('commissions', sa.Column('level', sa.Integer(), server_default=sa.text('1'), nullable=False))
+    op.create_unique_constraint('commissions_transaction_id_referrer_user_id_key', 'commissions', ['transaction_id', 'referrer_user_id'])
+
+    op.create_table('outbox_events',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('available_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.CheckConstraint("status IN ('pending', 'processed', 'failed')"),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_events_pending', 'outbox_events', ['available_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_events_pending', table_name='outbox_events', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_table('outbox_events')
+    op.drop_constraint('commissions_transaction_id_referrer_user_id_key', 'commissions', type_='unique')
+    op.drop_column('commissions', 'level')
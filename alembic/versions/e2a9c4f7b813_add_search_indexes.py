@@ -0,0 +1,50 @@
+"""add_search_indexes
+
+Revision ID: e2a9c4f7b813
+Revises: d7b2e94f1a6c
+Create Date: 2026-10-18 14:20:51.402917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4f7b813'
+down_revision: Union[str, None] = 'd7b2e94f1a6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ('ix_users_phone_number_trgm', 'users', 'phone_number'),
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_transactions_uid_trgm', 'transactions', 'transaction_uid'),
+]
+
+PATTERN_INDEXES = [
+    ('ix_users_phone_number_pattern', 'users', 'phone_number'),
+    ('ix_transactions_uid_pattern', 'transactions', 'transaction_uid'),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Build indexes without blocking writes on large tables
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(name, table, [column], unique=False, postgresql_using='gin',
+                            postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, column in PATTERN_INDEXES:
+            op.create_index(name, table, [column], unique=False,
+                            postgresql_ops={column: 'varchar_pattern_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in PATTERN_INDEXES + TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,88 @@
+"""add_exchange_rate_history
+
+Revision ID: f4c8d1e6a925
+Revises: e2a9c4f7b813
+Create Date: 2026-10-19 09:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8d1e6a925'
+down_revision: Union[str, None] = 'e2a9c4f7b813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Reconstruct the history from the rates deposits were priced at: one row
+# each time the rate differs from the previous deposit's. effective_at is the
+# first deposit seen at that rate, so the real change may have been earlier.
+BACKFILL_FROM_DEPOSITS = """
+INSERT INTO exchange_rate_history (rate, effective_at)
+SELECT exchange_rate, created_at
+FROM (
+    SELECT exchange_rate, created_at,
+           LAG(exchange_rate) OVER (ORDER BY created_at, id) AS previous_rate
+    FROM transactions
+    WHERE type = 'crypto_deposit' AND exchange_rate IS NOT NULL AND created_at IS NOT NULL
+) deposits
+WHERE previous_rate IS DISTINCT FROM exchange_rate
+"""
+
+# Then the current setting, unless the last deposit already used it
+BACKFILL_CURRENT_SETTING = """
+INSERT INTO exchange_rate_history (rate, effective_at, changed_by_admin_id)
+SELECT s.setting_value::numeric(10, 2),
+       GREATEST(COALESCE(s.updated_at, CURRENT_TIMESTAMP), (SELECT max(effective_at) FROM exchange_rate_history)),
+       s.updated_by_admin_id
+FROM platform_settings s
+WHERE s.setting_key = 'usdt_to_inr_rate'
+  AND s.setting_value ~ '^[0-9]+(\\.[0-9]+)?$'
+  AND s.setting_value::numeric(10, 2) IS DISTINCT FROM (
+      SELECT rate FROM exchange_rate_history ORDER BY effective_at DESC, id DESC LIMIT 1
+  )
+"""
+
+
+APPEND_ONLY_FUNCTION = """
+CREATE OR REPLACE FUNCTION exchange_rate_history_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'exchange_rate_history is append-only';
+END;
+$$ LANGUAGE plpgsql
+"""
+
+APPEND_ONLY_TRIGGER = """
+CREATE TRIGGER exchange_rate_history_append_only
+BEFORE UPDATE OR DELETE ON exchange_rate_history
+FOR EACH STATEMENT EXECUTE FUNCTION exchange_rate_history_append_only()
+"""
+
+
+def upgrade() -> None:
+    op.create_table('exchange_rate_history',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('rate', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('effective_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('changed_by_admin_id', sa.BigInteger(), nullable=True),
+    sa.ForeignKeyConstraint(['changed_by_admin_id'], ['admins.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exchange_rate_history_effective_at', 'exchange_rate_history', ['effective_at'], unique=False)
+
+    op.execute(BACKFILL_FROM_DEPOSITS)
+    op.execute(BACKFILL_CURRENT_SETTING)
+
+    op.execute(APPEND_ONLY_FUNCTION)
+    op.execute(APPEND_ONLY_TRIGGER)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS exchange_rate_history_append_only ON exchange_rate_history")
+    op.execute("DROP FUNCTION IF EXISTS exchange_rate_history_append_only()")
+    op.drop_index('ix_exchange_rate_history_effective_at', table_name='exchange_rate_history')
+    op.drop_table('exchange_rate_history')
@@ -0,0 +1,128 @@
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import engine, CONNECT_ARGS
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+class Broker:
+    """Cross-worker pub/sub on top of Postgres LISTEN/NOTIFY.
+
+    Messages are published inside the caller's transaction with pg_notify, so
+    they are delivered to every worker (including the sender) only once that
+    transaction commits. A daemon thread per worker holds one dedicated
+    connection, LISTENs on the subscribed channels and calls the handlers.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._reconnect_hooks: List[Callable[[], None]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.connected = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, channel: str, handler: Handler):
+        self._handlers[channel].append(handler)
+
+    def add_reconnect_hook(self, hook: Callable[[], None]):
+        """Register a callback for after a dropped connection is re-established (messages may have been missed)."""
+        self._reconnect_hooks.append(hook)
+
+    @staticmethod
+    def publish(db: Session, channel: str, payload: Dict[str, Any]):
+        """Queue a message; it is sent when `db` commits."""
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": json.dumps(payload, default=str)})
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="broker-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _connect(self):
+        # LISTEN needs a session-level connection, so skip a transaction-mode pooler if one is configured
+        url = make_url(settings.broker_database_url) if settings.broker_database_url else engine.url
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(dsn, **CONNECT_ARGS)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in self._handlers:
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    def _dispatch(self, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning("Ignoring malformed broker message on %s", channel)
+            return
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(message)
+            except Exception:
+                logger.exception("Broker handler for %s failed", channel)
+
+    def _run(self):
+        backoff = 1
+        first_connect = True
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                self.connected = True
+                self.last_error = None
+                backoff = 1
+                if not first_connect:
+                    for hook in self._reconnect_hooks:
+                        hook()
+                first_connect = False
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._dispatch(notify.channel, notify.payload)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("Broker connection lost: %s", e)
+            finally:
+                self.connected = False
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+            if not self._stop.is_set():
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+broker = Broker()
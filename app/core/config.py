@@ -8,11 +8,95 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    db_pool_mode: str = "queue"  # queue, or null when an external pooler (PgBouncer) pools connections
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30
+    db_pool_recycle_seconds: int = 3600
+    db_pool_use_lifo: bool = False
+    db_pre_ping: str = "idle"  # always, idle (only connections idle longer than db_pre_ping_idle_seconds) or off
+    db_pre_ping_idle_seconds: float = 30
+    db_transaction_pooling: bool = False  # behind a transaction-mode pooler: no prepared statements
+    broker_database_url: str = ""  # direct (unpooled) URL for LISTEN/NOTIFY; defaults to database_url
+
+    # Read replica (dashboards and listings)
+    replica_database_url: str = ""  # empty = all reads go to the primary
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_interval_seconds: float = 2.0
+    read_your_writes_seconds: float = 10.0  # reads stay on the primary this long after a principal's write
+    db_max_connections: int = 100  # server-side limit shared by all workers
+    db_reserved_connections: int = 10  # left free for migrations, scripts and admin sessions
+
+    # Server
+    web_concurrency: int = 1  # worker processes (gunicorn.conf.py)
+    graceful_timeout_seconds: int = 30
+    schema_check_on_startup: str = "warn"  # off, warn or fail when the DB is not at the Alembic head
+    startup_warm_connections: int = 2  # pool connections opened in parallel before serving
+    platform_settings_cache_ttl_seconds: float = 30.0
 
     # Security
     secret_key: str = "your-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 30
+    auth_stateless_validation: bool = True  # check access tokens against the in-memory revocation list, not the DB
+
+    # Rate limiting (token buckets: burst, then per_minute) for login and registration
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # memory (per worker) or postgres (shared by all workers)
+    rate_limit_memory_max_keys: int = 100000
+    rate_limit_trust_forwarded_for: bool = False  # key by the first X-Forwarded-For address (behind a proxy)
+    rate_limit_login_ip_burst: int = 20
+    rate_limit_login_ip_per_minute: float = 10
+    rate_limit_login_account_burst: int = 5
+    rate_limit_login_account_per_minute: float = 1
+    rate_limit_register_ip_burst: int = 5
+    rate_limit_register_ip_per_minute: float = 1
+
+    # Referrals
+    referral_max_depth: int = 0  # 0 = unlimited
+    referral_cache_size: int = 10000
+    referral_cache_ttl_seconds: int = 3600
+    referral_negative_cache_ttl_seconds: int = 60
+
+    # Admin search
+    search_count_cap: int = 1000
+
+    # Admin lookup (in-memory typeahead index)
+    lookup_index_enabled: bool = True
+    lookup_delta_max: int = 50000  # rebuild once this many keys were added since the last build
+
+    # Outbox worker
+    outbox_worker_enabled: bool = True
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_batch_size: int = 100
+    outbox_max_attempts: int = 5
+
+    # Activity (audit) log, written in batches by a background task
+    activity_log_enabled: bool = True
+    activity_log_buffer_size: int = 50000  # oldest entries are dropped beyond this
+    activity_log_batch_size: int = 500
+    activity_log_flush_interval_seconds: float = 1.0
+    activity_log_max_attempts: int = 3  # then rows are written one by one and failing ones dropped
+
+    # Monthly partitions of transactions, activity_logs and notifications
+    partition_maintenance_enabled: bool = True
+    partition_months_ahead: int = 3  # future months kept created
+    partition_maintenance_interval_seconds: float = 3600.0
+    partition_retention_months: int = 24  # older months are archived by manage_partitions.py
+    partition_archive_dir: str = "archive"
+
+    # Observability
+    metrics_enabled: bool = True
+    sql_profiling_enabled: bool = False  # per-request SQL recorder, slow request log and Server-Timing
+    sql_profiling_slow_request_ms: int = 500
+    sql_profiling_repeat_threshold: int = 5  # same statement this often in one request looks like N+1
+
+    # Readiness probe
+    health_cache_ttl_seconds: float = 2.0
+    health_db_timeout_seconds: float = 2.0
+    health_max_pool_utilization: float = 1.0  # not ready once this share of pool + overflow is checked out
+    health_max_loop_lag_ms: float = 500.0
 
     # AWS S3
     aws_access_key_id: str = ""
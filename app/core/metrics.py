@@ -0,0 +1,149 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter("http_requests", "HTTP requests by route and status", ["method", "route", "status"])
+REQUEST_SQL_STATEMENTS = Counter(
+    "http_request_sql_statements", "SQL statements executed by requests, per route", ["method", "route"]
+)
+REQUEST_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Time spent in SQL per request", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+SQL_STATEMENT_DURATION = Histogram("sql_statement_duration_seconds", "SQL statement latency", buckets=SQL_BUCKETS)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool (including connects)", buckets=SQL_BUCKETS
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size")
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out")
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond pool_size (negative while the pool is not full)")
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify latency", ["operation"], buckets=LATENCY_BUCKETS
+)
+RATE_LIMIT_REJECTIONS = Counter("rate_limit_rejections", "Requests rejected with 429, by rate limit rule", ["rule"])
+ACTIVITY_LOG_BUFFERED = Gauge("activity_log_buffered", "Activity log entries waiting to be flushed")
+ACTIVITY_LOG_DROPPED = Counter("activity_log_dropped", "Activity log entries dropped because the buffer was full or they could not be written")
+WEBSOCKET_CONNECTIONS = Gauge("websocket_connections", "Open notification WebSockets", ["role"])
+
+
+class SQLStats:
+    """SQL statement count and time for the current request."""
+
+    __slots__ = ("statements", "duration")
+
+    def __init__(self):
+        self.statements = 0
+        self.duration = 0.0
+
+
+# Set per request by MetricsMiddleware. The object is mutated rather than
+# replaced so updates made in threadpool endpoints are visible afterwards.
+current_sql_stats: ContextVar[Optional[SQLStats]] = ContextVar("current_sql_stats", default=None)
+
+
+def instrument_engine(engine: Engine, pool_gauges: bool = True) -> None:
+    """Time every statement and attribute it to the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        SQL_STATEMENT_DURATION.observe(elapsed)
+        stats = current_sql_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.duration += elapsed
+
+    if pool_gauges and isinstance(engine.pool, QueuePool):
+        POOL_SIZE.set_function(lambda: engine.pool.size())
+        POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+        POOL_OVERFLOW.set_function(lambda: engine.pool.overflow())
+
+
+class CheckoutTimer:
+    """Pool mixin that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(CheckoutTimer, QueuePool):
+    pass
+
+
+class TimedNullPool(CheckoutTimer, NullPool):
+    pass
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and SQL usage per route template.
+
+    Routes are labelled by their path template (e.g. /admin/transactions/{transaction_id})
+    so label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # Labelled children are cached; .labels() costs more than the observation itself
+        self._children: Dict[Tuple[str, str, int], tuple] = {}
+
+    def _metrics_for(self, method: str, route: str, status_code: int) -> tuple:
+        key = (method, route, status_code)
+        children = self._children.get(key)
+        if children is None:
+            children = (
+                REQUEST_DURATION.labels(method, route),
+                REQUEST_SQL_STATEMENTS.labels(method, route),
+                REQUEST_SQL_DURATION.labels(method, route),
+                REQUESTS.labels(method, route, str(status_code)),
+            )
+            self._children[key] = children
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = SQLStats()
+        token = current_sql_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_sql_stats.reset(token)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            duration, statements, sql_duration, requests = self._metrics_for(method, route_path, status_code)
+            duration.observe(elapsed)
+            statements.inc(stats.statements)
+            sql_duration.observe(stats.duration)
+            requests.inc()
@@ -0,0 +1,196 @@
+import functools
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEBUG_HEADER = b"x-debug-timing"
+TOP_STATEMENTS = 5
+MAX_STATEMENT_LENGTH = 500
+
+
+class QueryRecorder:
+    """Statements and timing spans collected during one request.
+
+    Statements are grouped by their SQL text. SQLAlchemy sends parameters
+    separately, so the same text repeated many times within one request is
+    the signature of an N+1 loop.
+    """
+
+    def __init__(self):
+        self.statements: Dict[str, List[float]] = {}  # sql -> [count, total seconds]
+        self.statement_count = 0
+        self.db_time = 0.0
+        self.spans: Dict[str, float] = {}
+        self.span_db_time: Dict[str, float] = {}
+        self._active_spans = set()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        entry = self.statements.get(statement)
+        if entry is None:
+            self.statements[statement] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+        self.statement_count += 1
+        self.db_time += elapsed
+
+    def repeated(self, threshold: int) -> List[Dict[str, Any]]:
+        return [
+            {"sql": sql[:MAX_STATEMENT_LENGTH], "count": count, "total_ms": round(total * 1000, 2)}
+            for sql, (count, total) in self.statements.items()
+            if count >= threshold
+        ]
+
+    def top(self, n: int = TOP_STATEMENTS) -> List[Dict[str, Any]]:
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:n]
+        return [
+            {"sql": sql[:MAX_STATEMENT_LENGTH], "count": count, "total_ms": round(total * 1000, 2)}
+            for sql, (count, total) in ranked
+        ]
+
+
+current_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("current_recorder", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Time a section of the current request; nested spans of the same name count once."""
+    recorder = current_recorder.get()
+    if recorder is None or name in recorder._active_spans:
+        yield
+        return
+
+    recorder._active_spans.add(name)
+    started = time.perf_counter()
+    db_started = recorder.db_time
+    try:
+        yield
+    finally:
+        recorder._active_spans.discard(name)
+        recorder.spans[name] = recorder.spans.get(name, 0.0) + time.perf_counter() - started
+        recorder.span_db_time[name] = recorder.span_db_time.get(name, 0.0) + recorder.db_time - db_started
+
+
+def profiled(name: str):
+    """Decorator form of span(), for dependencies such as get_current_user."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def install(engine: Engine) -> None:
+    """Feed every statement executed during a profiled request to its recorder."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_recorder.get() is not None:
+            conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        recorder = current_recorder.get()
+        if recorder is not None and conn.info.get("profile_start"):
+            recorder.record(statement, time.perf_counter() - conn.info["profile_start"].pop())
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that reports its encoding time to the request recorder."""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return super().render(content)
+
+
+class ProfilingMiddleware:
+    """Opt-in per-request SQL profiler (SQL_PROFILING_ENABLED).
+
+    Records every statement issued while serving a request, from any session,
+    logs a structured report with the top statements when the request is slow
+    or repeats a statement at least sql_profiling_repeat_threshold times, and
+    adds a Server-Timing header when the request carries X-Debug-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        debug = any(name == DEBUG_HEADER for name, _ in scope["headers"])
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if debug:
+                    timing = self.server_timing(recorder, time.perf_counter() - started)
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_recorder.reset(token)
+            self.report(scope, recorder, status_code, time.perf_counter() - started)
+
+    @staticmethod
+    def server_timing(recorder: QueryRecorder, total: float) -> str:
+        auth = recorder.spans.get("auth", 0.0)
+        serialize = recorder.spans.get("serialize", 0.0)
+        # Auth time minus its own queries, so db + auth + serialize + app adds up to the total
+        auth_own = auth - recorder.span_db_time.get("auth", 0.0)
+        app_time = max(total - recorder.db_time - auth_own - serialize, 0.0)
+        parts = [
+            f'db;dur={recorder.db_time * 1000:.2f};desc="{recorder.statement_count} queries"',
+            f"auth;dur={auth * 1000:.2f}",
+            f"serialize;dur={serialize * 1000:.2f}",
+            f"app;dur={app_time * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ]
+        return ", ".join(parts)
+
+    @staticmethod
+    def report(scope, recorder: QueryRecorder, status_code: int, total: float) -> None:
+        repeated = recorder.repeated(settings.sql_profiling_repeat_threshold)
+        slow = total * 1000 >= settings.sql_profiling_slow_request_ms
+        if not slow and not repeated:
+            return
+
+        route = scope.get("route")
+        logger.warning("Request SQL profile %s", json.dumps({
+            "reasons": (["slow"] if slow else []) + (["repeated_statements"] if repeated else []),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(total * 1000, 2),
+            "db_ms": round(recorder.db_time * 1000, 2),
+            "statements": recorder.statement_count,
+            "spans_ms": {name: round(value * 1000, 2) for name, value in recorder.spans.items()},
+            "repeated_statements": repeated,
+            "top_statements": recorder.top(),
+        }))
@@ -0,0 +1,162 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_REJECTIONS
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class Rule(NamedTuple):
+    """Token bucket: up to `burst` requests at once, refilled at `per_minute`."""
+    name: str
+    burst: int
+    per_minute: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60.0
+
+
+class MemoryBackend:
+    """Buckets in a per-process LRU dict.
+
+    Each worker keeps its own buckets, so with N workers a client can get up
+    to N times the configured rate.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, rule: Rule, key: str) -> Tuple[bool, float]:
+        bucket_key = f"{rule.name}:{key}"
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(bucket_key, (rule.burst, now))
+            tokens = min(rule.burst, tokens + (now - updated) * rule.refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[bucket_key] = (tokens, now)
+            self._buckets.move_to_end(bucket_key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+class PostgresBackend:
+    """Buckets in an UNLOGGED table, shared by every worker.
+
+    Refill and take happen in one INSERT ... ON CONFLICT DO UPDATE, so a check
+    is a single round trip and concurrent requests for the same key serialize
+    on the row lock. Buckets idle for longer than PURGE_AFTER are deleted
+    every PURGE_INTERVAL seconds by whichever request comes along.
+    """
+
+    TAKE_SQL = text("""
+        INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+        VALUES (:key, CAST(:burst AS double precision) - 1, true, clock_timestamp())
+        ON CONFLICT (key) DO UPDATE SET (tokens, allowed, updated_at) = (
+            SELECT CASE WHEN refill.tokens >= 1 THEN refill.tokens - 1 ELSE refill.tokens END,
+                   refill.tokens >= 1,
+                   clock_timestamp()
+            FROM (
+                SELECT LEAST(CAST(:burst AS double precision),
+                             b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at)::double precision * :rate) AS tokens
+            ) refill
+        )
+        RETURNING allowed, tokens
+    """)
+    PURGE_SQL = text("DELETE FROM rate_limit_buckets WHERE updated_at < clock_timestamp() - make_interval(secs => :seconds)")
+    PURGE_INTERVAL = 60.0
+    PURGE_AFTER = 3600.0
+
+    def __init__(self):
+        self._next_purge = 0.0
+
+    def take(self, rule: Rule, key: str) -> Tuple[bool, float]:
+        with engine.begin() as connection:
+            allowed, tokens = connection.execute(
+                self.TAKE_SQL, {"key": f"{rule.name}:{key}", "burst": rule.burst, "rate": rule.refill_per_second}
+            ).one()
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + self.PURGE_INTERVAL
+                connection.execute(self.PURGE_SQL, {"seconds": self.PURGE_AFTER})
+        return allowed, tokens
+
+
+class RateLimiter:
+    """Token-bucket throttling for the unauthenticated auth endpoints.
+
+    Checks run before the endpoint touches the database session or bcrypt,
+    so a rejected request costs one dict lookup (or one UPSERT with the
+    postgres backend) and returns 429 with Retry-After.
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, Rule] = {
+            "login_ip": Rule("login_ip", settings.rate_limit_login_ip_burst, settings.rate_limit_login_ip_per_minute),
+            "login_account": Rule(
+                "login_account", settings.rate_limit_login_account_burst, settings.rate_limit_login_account_per_minute
+            ),
+            "register_ip": Rule("register_ip", settings.rate_limit_register_ip_burst, settings.rate_limit_register_ip_per_minute),
+        }
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            if settings.rate_limit_backend == "postgres":
+                self._backend = PostgresBackend()
+            else:
+                self._backend = MemoryBackend(settings.rate_limit_memory_max_keys)
+        return self._backend
+
+    @staticmethod
+    def client_ip(request: Request) -> str:
+        if settings.rate_limit_trust_forwarded_for:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    def check(self, rule_name: str, key: str) -> None:
+        """Take a token from `key`'s bucket or raise 429."""
+        if not settings.rate_limit_enabled:
+            return
+        rule = self.rules[rule_name]
+        try:
+            allowed, tokens = self.backend.take(rule, key)
+        except Exception as e:
+            # Throttling must not take logins down with it
+            logger.warning("Rate limit check failed, allowing request: %s", e)
+            return
+        if allowed:
+            return
+        RATE_LIMIT_REJECTIONS.labels(rule.name).inc()
+        retry_after = math.ceil((1 - tokens) / rule.refill_per_second) if rule.refill_per_second > 0 else 3600
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts. Please try again later",
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
+
+    def check_login(self, request: Request, account: str) -> None:
+        self.check("login_ip", self.client_ip(request))
+        self.check("login_account", account.strip().lower())
+
+    def check_register(self, request: Request) -> None:
+        self.check("register_ip", self.client_ip(request))
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,33 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.profiling import span
+
+
+def orjson_default(value: Any) -> Any:
+    """Types orjson does not handle natively, encoded as jsonable_encoder would."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Not the app's default_response_class: endpoints with a response_model
+    are already encoded straight to bytes by pydantic-core, and a custom
+    default class would turn that off. Endpoints that build plain dicts
+    return this directly, which skips both jsonable_encoder and json.dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,87 @@
+from typing import FrozenSet, Mapping, Optional
+
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.db.database import get_db_context
+from app.models.user import User
+from app.models.admin import Admin
+
+REVOCATION_CHANNEL = "auth_revocations"
+
+
+class RevocationList:
+    """Ids of users and admins whose access tokens must be refused.
+
+    A blocked or inactive user is rare, so the whole list is two small sets
+    of ints, loaded at startup and updated over the broker when an account
+    is blocked or unblocked. With it, get_current_user checks a token
+    without a database round trip. Until the first load succeeds `ready` is
+    False and callers fall back to the database.
+
+    It also holds the current role of every admin (there are few), so a
+    role change takes effect on tokens issued before it.
+    """
+
+    def __init__(self):
+        self._users: FrozenSet[int] = frozenset()
+        self._admins: FrozenSet[int] = frozenset()
+        self._admin_roles: Mapping[int, str] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._users) + len(self._admins)
+
+    def is_user_blocked(self, user_id: int) -> bool:
+        return user_id in self._users
+
+    def is_admin_blocked(self, admin_id: int) -> bool:
+        return admin_id in self._admins
+
+    def admin_role(self, admin_id: int) -> Optional[str]:
+        """The admin's current role, or None if not known yet."""
+        return self._admin_roles.get(admin_id)
+
+    def load(self, db: Session) -> None:
+        users = db.execute(
+            select(User.id).where(or_(User.is_blocked.is_(True), User.is_active.is_not(True)))
+        ).scalars()
+        admins = db.execute(select(Admin.id, Admin.role, Admin.is_active)).all()
+        # Sets are swapped whole, so readers never see a partial update
+        self._users = frozenset(users)
+        self._admins = frozenset(admin.id for admin in admins if admin.is_active is not True)
+        self._admin_roles = {admin.id: admin.role for admin in admins}
+        self.ready = True
+
+    def reload(self) -> None:
+        with get_db_context() as db:
+            self.load(db)
+
+    def warm(self) -> None:
+        self.reload()
+
+    def start(self) -> None:
+        broker.subscribe(REVOCATION_CHANNEL, self.apply)
+        # Blocks announced while the listener was disconnected were missed
+        broker.add_reconnect_hook(self.reload)
+
+    def apply(self, message: dict) -> None:
+        """Broker handler (also called locally after commit)."""
+        subject_id = int(message["id"])
+        if message["kind"] == "admin":
+            self._admins = self._admins | {subject_id} if message["blocked"] else self._admins - {subject_id}
+            if message.get("role"):
+                self._admin_roles = {**self._admin_roles, subject_id: message["role"]}
+        else:
+            self._users = self._users | {subject_id} if message["blocked"] else self._users - {subject_id}
+
+    @staticmethod
+    def announce(db: Session, kind: str, subject_id: int, blocked: bool, role: Optional[str] = None) -> dict:
+        """Publish a block or unblock (and an admin's role); delivered to every worker when `db` commits."""
+        message = {"kind": kind, "id": subject_id, "blocked": blocked, "role": role}
+        broker.publish(db, REVOCATION_CHANNEL, message)
+        return message
+
+
+revocation_list = RevocationList()
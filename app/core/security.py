@@ -1,15 +1,21 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.config import settings
+from app.core.profiling import profiled
+from app.core.revocation import revocation_list
 from app.db.database import get_db_context
 from app.models.user import User
 from app.models.admin import Admin
 
 security = HTTPBearer()
 
+ADMIN_ROLES = ("super_admin", "admin", "support")
+
+_NOT_DECODED = object()
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -17,7 +23,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
@@ -38,17 +44,62 @@ def decode_token(token: str) -> dict:
         )
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    payload = decode_token(credentials.credentials)
-    user_id = payload.get("sub")
-    if user_id is None:
+def request_token_payload(request: Request) -> Optional[dict]:
+    """The request's bearer token payload, or None without a valid token.
+
+    Decoded once per request: the result is kept on request.state for
+    request_principal (replica routing) and the get_current_* dependencies.
+    """
+    cached = getattr(request.state, "token_payload", _NOT_DECODED)
+    if cached is not _NOT_DECODED:
+        return cached
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    payload = None
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        except jwt.PyJWTError:
+            pass
+    request.state.token_payload = payload
+    return payload
+
+
+def _token_subject(request: Request, credentials: HTTPAuthorizationCredentials) -> tuple[dict, int]:
+    # Reuse the payload if the request's database session already decoded it;
+    # decode_token then only runs to report why a token is rejected
+    payload = request_token_payload(request) or decode_token(credentials.credentials)
+    subject = payload.get("sub")
+    if subject is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
+    return payload, int(subject)
+
+
+@profiled("auth")
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    payload, user_id = _token_subject(request, credentials)
+
+    if payload.get("role", "user") != "user":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+        )
+
+    # The signature proves the user existed when the token was issued; blocked
+    # and inactive users come from the in-memory revocation list
+    if settings.auth_stateless_validation and revocation_list.ready:
+        if revocation_list.is_user_blocked(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found or inactive",
+            )
+        return {"id": user_id, "role": "user"}
 
     with get_db_context() as db:
-        user = db.query(User).filter_by(id=int(user_id), is_active=True, is_blocked=False).first()
+        user = db.query(User.id).filter_by(id=user_id, is_active=True, is_blocked=False).first()
 
     if user is None:
         raise HTTPException(
@@ -56,56 +107,43 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="User not found or inactive",
         )
 
-    return {
-        "id": user.id,
-        "phone_number": user.phone_number,
-        "referral_code": user.referral_code,
-        "name": user.name,
-        "email": user.email,
-        "wallet_balance": float(user.wallet_balance),
-        "total_deposited": float(user.total_deposited),
-        "total_withdrawn": float(user.total_withdrawn),
-        "total_commission_earned": float(user.total_commission_earned),
-        "upi_id": user.upi_id,
-        "upi_holder_name": user.upi_holder_name,
-        "bank_name": user.bank_name,
-        "is_upi_bound": user.is_upi_bound,
-        "is_active": user.is_active,
-        "created_at": user.created_at
-    }
-
-
-def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    payload = decode_token(credentials.credentials)
-    admin_id = payload.get("sub")
-    if admin_id is None:
+    return {"id": user.id, "role": "user"}
+
+
+@profiled("auth")
+def get_current_admin(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    payload, admin_id = _token_subject(request, credentials)
+    role = payload.get("role")
+    if role not in ADMIN_ROLES:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
+            detail="Admin not found or inactive",
         )
 
+    # Deactivation and role changes are announced over the revocation list;
+    # the token's role only counts for admins the list doesn't know yet
+    if settings.auth_stateless_validation and revocation_list.ready:
+        if revocation_list.is_admin_blocked(admin_id):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Admin not found or inactive",
+            )
+        return {"id": admin_id, "role": revocation_list.admin_role(admin_id) or role}
+
     with get_db_context() as db:
-        admin = db.query(Admin).filter_by(id=int(admin_id), is_active=True).first()
+        admin = db.query(Admin.id, Admin.role).filter_by(id=admin_id, is_active=True).first()
         if admin is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Admin not found or inactive",
             )
 
-    return {
-        "id": admin.id,
-        "username": admin.username,
-        "email": admin.email,
-        "role": admin.role,
-        "permissions": admin.permissions,
-        "is_active": admin.is_active,
-        "created_at": admin.created_at
-    }
+    return {"id": admin.id, "role": admin.role}
 
 
-def get_current_super_admin(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+def get_current_super_admin(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get current super admin user."""
-    admin_data = get_current_admin(credentials)
+    admin_data = get_current_admin(request, credentials)
     if admin_data["role"] != "super_admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -122,6 +160,12 @@ def get_current_user_ws(token: str) -> Optional[tuple[int, str]]:
         role: str = payload.get("role", "user")
         if user_id is None:
             return None
+        if role in ADMIN_ROLES:
+            blocked = revocation_list.is_admin_blocked(int(user_id))
+        else:
+            blocked = revocation_list.is_user_blocked(int(user_id))
+        if blocked:
+            return None
         return int(user_id), role
     except jwt.PyJWTError:
         return None
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.db.database import engine, check_schema
+from app.services.settings_service import settings_service
+from app.services.exchange_rate_service import exchange_rate_service
+from app.core.revocation import revocation_list
+
+logger = logging.getLogger(__name__)
+
+
+def verify_schema() -> None:
+    """Compare the database with the Alembic head instead of running create_all."""
+    mode = settings.schema_check_on_startup
+    if mode == "off":
+        return
+    problem = check_schema()
+    if problem is None:
+        return
+    if mode == "fail":
+        raise RuntimeError(f"Database schema is not up to date: {problem}. Run 'alembic upgrade head'.")
+    logger.warning("Database schema is not up to date: %s. Run 'alembic upgrade head'.", problem)
+
+
+def open_connection():
+    connection = engine.connect()
+    connection.exec_driver_sql("SELECT 1")
+    return connection
+
+
+async def warm_pool(count: int) -> None:
+    """Open `count` pool connections concurrently so the first requests skip the TLS handshake."""
+    connections = await asyncio.gather(
+        *[asyncio.to_thread(open_connection) for _ in range(count)], return_exceptions=True
+    )
+    for connection in connections:
+        if isinstance(connection, Exception):
+            logger.warning("Could not warm a pool connection: %s", connection)
+        else:
+            connection.close()
+
+
+async def warm_up() -> None:
+    """Schema check, pool warm-up and cache loads (settings, exchange rates, revocation list), run in parallel."""
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        asyncio.to_thread(verify_schema),
+        warm_pool(settings.startup_warm_connections),
+        asyncio.to_thread(settings_service.warm),
+        asyncio.to_thread(exchange_rate_service.warm),
+        asyncio.to_thread(revocation_list.warm),
+        return_exceptions=True,
+    )
+    schema_result, _, settings_result, rates_result, revocation_result = results
+    if isinstance(schema_result, Exception):
+        raise schema_result
+    if isinstance(settings_result, Exception):
+        logger.warning("Could not preload platform settings: %s", settings_result)
+    if isinstance(rates_result, Exception):
+        logger.warning("Could not load exchange rate history: %s", rates_result)
+    if isinstance(revocation_result, Exception):
+        logger.warning("Could not load the revocation list, access tokens are checked in the database: %s", revocation_result)
+    logger.info("Startup warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
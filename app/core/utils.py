@@ -1,7 +1,11 @@
 from datetime import datetime, timezone, timedelta
+from typing import Annotated
+
+from pydantic import PlainSerializer
 
 # IST timezone offset (UTC+5:30)
 IST_OFFSET = timedelta(hours=5, minutes=30)
+IST = timezone(IST_OFFSET, "IST")
 
 
 def to_ist(dt: datetime | None) -> datetime | None:
@@ -9,13 +13,12 @@ def to_ist(dt: datetime | None) -> datetime | None:
     if dt is None:
         return None
 
-    # If datetime is naive (no timezone info), assume it's UTC
+    # Naive datetimes are UTC (that is how the database stores them); shifting
+    # and tagging is cheaper than astimezone()
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
+        return (dt + IST_OFFSET).replace(tzinfo=IST)
 
-    # Convert to IST
-    ist_tz = timezone(IST_OFFSET)
-    return dt.astimezone(ist_tz)
+    return dt.astimezone(IST)
 
 
 def to_ist_string(dt: datetime | None) -> str | None:
@@ -25,3 +28,8 @@ def to_ist_string(dt: datetime | None) -> str | None:
 
     ist_dt = to_ist(dt)
     return ist_dt.isoformat() if ist_dt else None
+
+
+# Datetime field rendered in IST. pydantic-core formats the returned datetime
+# itself, so only the conversion runs in Python.
+ISTDateTime = Annotated[datetime, PlainSerializer(to_ist, return_type=datetime)]
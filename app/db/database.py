@@ -1,36 +1,269 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from app.models import Base
 from app.models.user import User
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import TimedQueuePool, TimedNullPool, instrument_engine
+from app.core import profiling
 from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
 
-# Create engine with connection pooling and SSL parameters for Neon
-engine = create_engine(
-    settings.database_url,
-    echo=False,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=3600,  # Recycle connections every hour
-    pool_pre_ping=True,  # Enable connection health checks
-    connect_args={
-        "sslmode": "require",
-        "connect_timeout": 10,
-        "keepalives": 1,
-        "keepalives_idle": 30,
-        "keepalives_interval": 10,
-        "keepalives_count": 5,
-    }
-)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# SSL and keepalive parameters for Neon
+CONNECT_ARGS = {
+    "sslmode": "require",
+    "connect_timeout": 10,
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
+
+def pool_limits() -> tuple[int, int]:
+    """Pool size and overflow for one worker.
+
+    All workers together stay under db_max_connections, minus the reserved
+    connections and each worker's LISTEN connection.
+    """
+    budget = (settings.db_max_connections - settings.db_reserved_connections) // max(settings.web_concurrency, 1)
+    budget = max(budget - 1, 1)
+    pool_size = min(settings.db_pool_size, budget)
+    return pool_size, min(settings.db_max_overflow, budget - pool_size)
+
+
+def install_idle_ping(engine: Engine, idle_seconds: float) -> None:
+    """Validate a connection on checkout only if it sat idle in the pool for
+    longer than `idle_seconds`.
+
+    Unlike pool_pre_ping this skips the extra round trip for connections
+    that were in use moments ago; a failed ping makes the pool replace the
+    connection, as pre-ping would.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            raise DisconnectionError(str(e)) from e
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        # The ping left a transaction open on drivers without autocommit
+        dbapi_connection.rollback()
+
+
+def create_db_engine(
+    url: Optional[str] = None,
+    pool_mode: Optional[str] = None,
+    pre_ping: Optional[str] = None,
+    transaction_pooling: Optional[bool] = None,
+) -> Engine:
+    """Build an engine from Settings; arguments override the matching setting.
+
+    pool_mode:   "queue" keeps a pool per worker; "null" opens a connection per
+                 checkout, for when an external pooler (PgBouncer, Neon's
+                 pooled endpoint) does the pooling.
+    pre_ping:    "always" (pool_pre_ping), "idle" (only past
+                 db_pre_ping_idle_seconds) or "off".
+    transaction_pooling: disable server-side prepared statements, which do
+                 not survive a transaction-mode pooler handing the session
+                 to another client.
+    """
+    url = make_url(url or settings.database_url)
+    pool_mode = pool_mode or settings.db_pool_mode
+    pre_ping = pre_ping or settings.db_pre_ping
+    if transaction_pooling is None:
+        transaction_pooling = settings.db_transaction_pooling
+
+    connect_args = dict(CONNECT_ARGS)
+    if transaction_pooling and url.get_driver_name() == "psycopg":
+        connect_args["prepare_threshold"] = None
+
+    options = {}
+    if pool_mode == "null":
+        options["poolclass"] = TimedNullPool
+    else:
+        pool_size, max_overflow = pool_limits()
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_use_lifo=settings.db_pool_use_lifo,
+            pool_pre_ping=pre_ping == "always",
+        )
+
+    new_engine = create_engine(url, echo=False, connect_args=connect_args, **options)
+    if pool_mode != "null" and pre_ping == "idle":
+        install_idle_ping(new_engine, settings.db_pre_ping_idle_seconds)
+    return new_engine
+
+
+engine = create_db_engine()
+instrument_engine(engine)
+if settings.sql_profiling_enabled:
+    profiling.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for dashboards and listings
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.replica_database_url:
+    replica_engine = create_db_engine(url=settings.replica_database_url)
+    instrument_engine(replica_engine, pool_gauges=False)
+    if settings.sql_profiling_enabled:
+        profiling.install(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+
+# Read-your-writes markers shared between workers
+READ_YOUR_WRITES_CHANNEL = "read_your_writes"
+
+def request_principal(request: Request) -> Optional[str]:
+    """Who is making the request ("user:12", "admin:3"), from the bearer token."""
+    # app.core.security imports this module
+    from app.core.security import request_token_payload
+    payload = request_token_payload(request)
+    if payload is None:
+        return None
+    return f"{payload.get('role', 'user')}:{payload.get('sub')}"
+
+
+class ReplicaRouter:
+    """Decides whether a read-only request can be served by the replica.
+
+    A principal that committed a write is pinned to the primary for
+    read_your_writes_seconds so it sees its own changes, and everyone falls
+    back to the primary while the replica lags more than replica_max_lag_seconds
+    (or cannot be reached). Lag is measured at most once per
+    replica_lag_check_interval_seconds per worker.
+
+    The committing worker pins the principal straight away and announces it
+    over the broker in the same transaction, so every other worker pins it
+    too by the time the client sees the response. A principal is announced
+    at most once per half read_your_writes_seconds per worker, so receivers
+    pin it for one and a half read_your_writes_seconds.
+    """
+
+    LAG_QUERY = text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self):
+        self.sticky = TTLCache(maxsize=100000, ttl=settings.read_your_writes_seconds)
+        self._announced = TTLCache(maxsize=100000, ttl=settings.read_your_writes_seconds / 2)
+        self.lag: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if ReplicaSessionLocal is None:
+            return
+        from app.core.broker import broker
+        broker.subscribe(READ_YOUR_WRITES_CHANNEL, self.apply)
 
-def get_db():
+    def apply(self, message: dict) -> None:
+        """Broker handler: another worker's principal committed a write.
+
+        Pinned for 1.5x read_your_writes_seconds: the sender does not
+        re-announce writes within half that time, so the last of them may be
+        up to half a TTL newer than this message.
+        """
+        self.mark_write(message.get("principal"), ttl=settings.read_your_writes_seconds * 1.5)
+
+    def announce(self, session: Session, principal: Optional[str]) -> None:
+        """Publish the principal's write to the other workers when `session` commits."""
+        if ReplicaSessionLocal is None or not principal or self._announced.get(principal):
+            return
+        from app.core.broker import broker
+        broker.publish(session, READ_YOUR_WRITES_CHANNEL, {"principal": principal})
+        self._announced.set(principal, True)
+
+    def mark_write(self, principal: Optional[str], ttl: Optional[float] = None) -> None:
+        if principal:
+            self.sticky.set(principal, True, ttl=ttl)
+
+    def measure_lag(self) -> Optional[float]:
+        try:
+            with replica_engine.connect() as connection:
+                return float(connection.execute(self.LAG_QUERY).scalar())
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            return None
+
+    def replica_healthy(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at >= settings.replica_lag_check_interval_seconds and self._lock.acquire(blocking=False):
+            try:
+                self.lag = self.measure_lag()
+                self._checked_at = now
+            finally:
+                self._lock.release()
+        return self.lag is not None and self.lag <= settings.replica_max_lag_seconds
+
+    def use_replica(self, principal: Optional[str]) -> bool:
+        if ReplicaSessionLocal is None:
+            return False
+        if principal and self.sticky.get(principal):
+            return False
+        return self.replica_healthy()
+
+
+replica_router = ReplicaRouter()
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _announce_principal_write(session):
+    replica_router.announce(session, session.info.get("principal"))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _mark_principal_after_commit(session):
+    # Read-your-writes: the committing principal reads from the primary for a while
+    replica_router.mark_write(session.info.get("principal"))
+
+
+def get_db(request: Request):
     """Get database session for FastAPI dependency injection."""
-    db = SessionLocal()
+    db = SessionLocal(info={"principal": request_principal(request)})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: the replica when configured, caught up
+    and the caller has not written recently; otherwise the primary."""
+    if replica_router.use_replica(request_principal(request)):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
     try:
         yield db
     finally:
@@ -48,10 +281,31 @@ def get_db_context():
 
 
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables (local development only; Alembic owns the schema)."""
     Base.metadata.create_all(bind=engine)
 
 
+def check_schema() -> Optional[str]:
+    """Compare the database's Alembic revision with the head of the migration scripts.
+
+    Returns a description of the mismatch, or None when the schema is current.
+    """
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+
+    if current == heads:
+        return None
+    return f"database is at {sorted(current) or 'no revision'}, migrations head is {sorted(heads)}"
+
+
 class Database:
     @staticmethod
     def get_users(limit, offset):
@@ -8,3 +8,8 @@ from app.models.settings import PlatformSetting
 from app.models.log import ActivityLog
 from app.models.notification import Notification
 from app.models.wallet import CryptoWallet
+from app.models.outbox import OutboxEvent
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_limit import RateLimitBucket
+from app.models.refresh_token import RefreshToken
+from app.models.transaction_stats import UserTransactionStats
@@ -1,3 +1,7 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+# Trigram indexes used by admin search need the pg_trgm extension
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, DECIMAL, BigInteger, ForeignKey, CheckConstraint, text
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, BigInteger, ForeignKey, CheckConstraint, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -8,7 +8,8 @@ class Commission(Base):
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     referrer_user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
     referred_user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
-    transaction_id = Column(BigInteger, ForeignKey('transactions.id'), nullable=False)
+    transaction_id = Column(BigInteger, nullable=False)  # transactions.id, not enforced (partitioned)
+    level = Column(Integer, default=1, server_default=text('1'), nullable=False)
 
     commission_percent = Column(DECIMAL(5, 2), nullable=False)
     base_amount = Column(DECIMAL(15, 2), nullable=False)
@@ -23,8 +24,11 @@ class Commission(Base):
     # Relationships
     referrer = relationship("User", foreign_keys=[referrer_user_id], back_populates="commissions_earned")
     referred = relationship("User", foreign_keys=[referred_user_id], back_populates="commissions_received")
-    transaction = relationship("Transaction", back_populates="commissions")
+    transaction = relationship(
+        "Transaction", primaryjoin="foreign(Commission.transaction_id) == Transaction.id", back_populates="commissions"
+    )
 
     __table_args__ = (
         CheckConstraint("status IN ('pending', 'credited', 'cancelled')"),
+        UniqueConstraint('transaction_id', 'referrer_user_id'),
     )
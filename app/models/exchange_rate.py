@@ -0,0 +1,32 @@
+from sqlalchemy import Column, DateTime, DECIMAL, BigInteger, ForeignKey, Index, DDL, event, text
+from app.models.base import Base
+
+class ExchangeRate(Base):
+    """Append-only history of usdt_to_inr_rate; a row is added whenever the setting changes."""
+    __tablename__ = 'exchange_rate_history'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    rate = Column(DECIMAL(10, 2), nullable=False)
+    effective_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'), nullable=False)
+    changed_by_admin_id = Column(BigInteger, ForeignKey('admins.id'), nullable=True)
+
+    __table_args__ = (
+        Index('ix_exchange_rate_history_effective_at', 'effective_at'),
+    )
+
+# Past rates are audit data: reject UPDATE and DELETE
+APPEND_ONLY_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION exchange_rate_history_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'exchange_rate_history is append-only';
+END;
+$$ LANGUAGE plpgsql
+""")
+APPEND_ONLY_TRIGGER = DDL("""
+CREATE TRIGGER exchange_rate_history_append_only
+BEFORE UPDATE OR DELETE ON exchange_rate_history
+FOR EACH STATEMENT EXECUTE FUNCTION exchange_rate_history_append_only()
+""")
+
+event.listen(ExchangeRate.__table__, "after_create", APPEND_ONLY_FUNCTION)
+event.listen(ExchangeRate.__table__, "after_create", APPEND_ONLY_TRIGGER)
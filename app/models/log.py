@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, DateTime, Text, BigInteger, ForeignKey, JSON, text
+from sqlalchemy import Column, String, DateTime, Text, BigInteger, ForeignKey, JSON, Index, DDL, event, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class ActivityLog(Base):
+    """Partitioned by month on created_at (primary key (id, created_at))."""
     __tablename__ = 'activity_logs'
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -18,8 +19,19 @@ class ActivityLog(Base):
     user_agent = Column(Text)
     log_metadata = Column(JSON)
 
-    created_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(DateTime, primary_key=True, server_default=text('CURRENT_TIMESTAMP'), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="activity_logs")
     admin = relationship("Admin", back_populates="activity_logs")
+
+    __mapper_args__ = {"primary_key": [id]}
+
+    __table_args__ = (
+        Index('ix_activity_logs_created_at', 'created_at'),
+        Index('ix_activity_logs_action_type_created_at', 'action_type', 'created_at'),
+        Index('ix_activity_logs_entity', 'entity_type', 'entity_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+event.listen(ActivityLog.__table__, "after_create", DDL("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT"))
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, BigInteger, ForeignKey, CheckConstraint, text
+from sqlalchemy import Column, String, Boolean, DateTime, Text, BigInteger, ForeignKey, CheckConstraint, Index, DDL, event, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class Notification(Base):
+    """Partitioned by month on created_at (primary key (id, created_at))."""
     __tablename__ = 'notifications'
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -15,14 +16,22 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     read_at = Column(DateTime, nullable=True)
 
-    related_transaction_id = Column(BigInteger, ForeignKey('transactions.id'), nullable=True)
+    related_transaction_id = Column(BigInteger, nullable=True)  # transactions.id, not enforced
 
-    created_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(DateTime, primary_key=True, server_default=text('CURRENT_TIMESTAMP'), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="notifications")
-    transaction = relationship("Transaction", back_populates="notifications")
+    transaction = relationship(
+        "Transaction", primaryjoin="foreign(Notification.related_transaction_id) == Transaction.id", back_populates="notifications"
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
 
     __table_args__ = (
         CheckConstraint("type IN ('info', 'success', 'warning', 'transaction')"),
+        Index('ix_notifications_user_id_created_at', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
+
+event.listen(Notification.__table__, "after_create", DDL("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT"))
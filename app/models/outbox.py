@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, BigInteger, JSON, CheckConstraint, Index, text
+from app.models.base import Base
+
+class OutboxEvent(Base):
+    __tablename__ = 'outbox_events'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    status = Column(String(20), default='pending', nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+
+    available_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'processed', 'failed')"),
+        Index('ix_outbox_events_pending', 'available_at', postgresql_where=text("status = 'pending'")),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Boolean, DateTime, Float, text
+from app.models.base import Base
+
+class RateLimitBucket(Base):
+    """Token buckets for the postgres rate limit backend. UNLOGGED: losing them on a crash is harmless."""
+    __tablename__ = 'rate_limit_buckets'
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    allowed = Column(Boolean, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=text('CURRENT_TIMESTAMP'), nullable=False)
+
+    __table_args__ = {'prefixes': ['UNLOGGED']}
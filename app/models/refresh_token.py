@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, CheckConstraint, Index, text
+from app.models.base import Base
+
+class RefreshToken(Base):
+    """One refresh token per row, stored as a SHA-256 hash.
+
+    Each refresh replaces the token with a new one in the same family; a
+    token presented after it was replaced means the family leaked and the
+    whole family is revoked.
+    """
+    __tablename__ = 'refresh_tokens'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False)
+    subject_type = Column(String(10), nullable=False)
+    subject_id = Column(BigInteger, nullable=False)
+
+    created_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    expires_at = Column(DateTime, nullable=False)
+    rotated_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("subject_type IN ('user', 'admin')"),
+        Index('ix_refresh_tokens_family_id', 'family_id'),
+        Index('ix_refresh_tokens_subject', 'subject_type', 'subject_id'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, BigInteger, ForeignKey, UniqueConstraint, text
+from sqlalchemy import Column, Integer, DateTime, BigInteger, ForeignKey, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -18,4 +18,6 @@ class TeamMember(Base):
 
     __table_args__ = (
         UniqueConstraint('parent_user_id', 'child_user_id'),
+        Index('ix_team_members_parent_level', 'parent_user_id', 'level'),
+        Index('ix_team_members_child', 'child_user_id'),
     )
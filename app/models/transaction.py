@@ -1,12 +1,14 @@
-from sqlalchemy import Column, String, DateTime, DECIMAL, Text, BigInteger, ForeignKey, CheckConstraint, text
+from sqlalchemy import Column, String, DateTime, DECIMAL, Text, BigInteger, ForeignKey, CheckConstraint, Index, Table, DDL, event, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 class Transaction(Base):
+    """Partitioned by month on created_at, so the table's primary key is
+    (id, created_at); the ORM still identifies rows by id alone."""
     __tablename__ = 'transactions'
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    transaction_uid = Column(String(50), unique=True, nullable=False)
+    transaction_uid = Column(String(50), nullable=False)  # unique via transaction_uids
     user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
     type = Column(String(20), nullable=False)
     status = Column(String(20), default='pending')
@@ -39,16 +41,57 @@ class Transaction(Base):
     payment_reference = Column(String(100))
     payment_completed_at = Column(DateTime, nullable=True)
 
-    created_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(DateTime, primary_key=True, server_default=text('CURRENT_TIMESTAMP'), nullable=False)
     updated_at = Column(DateTime, server_default=text('CURRENT_TIMESTAMP'))
 
     # Relationships
     user = relationship("User", back_populates="transactions")
     admin = relationship("Admin", back_populates="transactions_reviewed")
-    commissions = relationship("Commission", back_populates="transaction")
-    notifications = relationship("Notification", back_populates="transaction")
+    # No foreign keys can point at a partitioned table's id, so these joins are declared
+    commissions = relationship(
+        "Commission", primaryjoin="Transaction.id == foreign(Commission.transaction_id)", back_populates="transaction"
+    )
+    notifications = relationship(
+        "Notification", primaryjoin="Transaction.id == foreign(Notification.related_transaction_id)", back_populates="transaction"
+    )
+
+    __mapper_args__ = {"primary_key": [id]}
 
     __table_args__ = (
         CheckConstraint("type IN ('crypto_deposit', 'upi_payout', 'withdrawal', 'commission')"),
         CheckConstraint("status IN ('pending', 'processing', 'approved', 'rejected', 'completed', 'failed')"),
+        # Admin search: prefix and trigram matches on transaction UIDs
+        Index('ix_transactions_uid_pattern', 'transaction_uid', postgresql_ops={'transaction_uid': 'varchar_pattern_ops'}),
+        Index('ix_transactions_uid_trgm', 'transaction_uid', postgresql_using='gin', postgresql_ops={'transaction_uid': 'gin_trgm_ops'}),
+        # Newest-first listings, per partition
+        Index('ix_transactions_created_at', 'created_at'),
+        Index('ix_transactions_user_id_created_at', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
+
+# A unique index on a partitioned table must include created_at, so UIDs are
+# kept unique across partitions (archived ones included) by this side table
+transaction_uids = Table(
+    'transaction_uids', Base.metadata,
+    Column('transaction_uid', String(50), primary_key=True),
+)
+
+UID_UNIQUE_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION transactions_claim_uid() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO transaction_uids (transaction_uid) VALUES (NEW.transaction_uid);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""")
+UID_UNIQUE_TRIGGER = DDL("""
+CREATE TRIGGER transactions_claim_uid
+BEFORE INSERT ON transactions
+FOR EACH ROW EXECUTE FUNCTION transactions_claim_uid()
+""")
+
+# Rows outside every monthly partition land here until
+# partition_service creates their month
+event.listen(Transaction.__table__, "after_create", DDL("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT"))
+event.listen(Transaction.__table__, "after_create", UID_UNIQUE_FUNCTION)
+event.listen(Transaction.__table__, "after_create", UID_UNIQUE_TRIGGER)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, String, DECIMAL, BigInteger, ForeignKey, text
+from app.models.base import Base
+
+class UserTransactionStats(Base):
+    """Per-user transaction counts and sums by IST month, type and status.
+
+    Kept up to date by TransactionStatsService in the same database
+    transaction that creates or reviews a transaction.
+    """
+    __tablename__ = 'user_transaction_stats'
+
+    user_id = Column(BigInteger, ForeignKey('users.id'), primary_key=True)
+    month = Column(Date, primary_key=True)  # first day of the month, IST
+    type = Column(String(20), primary_key=True)
+    status = Column(String(20), primary_key=True)
+
+    count = Column(BigInteger, server_default=text('0'), nullable=False)
+    crypto_amount = Column(DECIMAL(18, 6), server_default=text('0'), nullable=False)
+    gross_inr_amount = Column(DECIMAL(18, 2), server_default=text('0'), nullable=False)
+    net_inr_amount = Column(DECIMAL(18, 2), server_default=text('0'), nullable=False)
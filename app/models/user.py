@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, DECIMAL, BigInteger, ForeignKey, text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, DECIMAL, BigInteger, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -20,9 +20,12 @@ class User(Base):
     wallet_balance = Column(DECIMAL(15, 2), default=0.00)
     total_deposited = Column(DECIMAL(15, 2), default=0.00)
     total_withdrawn = Column(DECIMAL(15, 2), default=0.00)
-    total_commission_earned = Column(DECIMAL(15, 2), default=0.00)
+    total_commission_earned = Column(DECIMAL(15, 2), default=0.00, server_default=text('0'))
     total_usd_sent = Column(DECIMAL(15, 2), default=0.00)
 
+    # Denormalized counters (see ReconciliationService)
+    team_size = Column(Integer, default=0, server_default=text('0'), nullable=False)
+
     # UPI Details
     upi_id = Column(String(100))
     upi_holder_name = Column(String(100))
@@ -53,3 +56,14 @@ class User(Base):
     commissions_received = relationship("Commission", foreign_keys="Commission.referred_user_id", back_populates="referred")
     activity_logs = relationship("ActivityLog", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
+
+    __table_args__ = (
+        # Admin search: prefix matches on phone numbers, trigram matches for substrings
+        Index('ix_users_phone_number_pattern', 'phone_number', postgresql_ops={'phone_number': 'varchar_pattern_ops'}),
+        Index('ix_users_phone_number_trgm', 'phone_number', postgresql_using='gin', postgresql_ops={'phone_number': 'gin_trgm_ops'}),
+        Index('ix_users_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_users_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        # Short case-insensitive prefixes: lower(name) LIKE 'x%'
+        Index('ix_users_name_lower_pattern', text('lower(name) text_pattern_ops')),
+        Index('ix_users_email_lower_pattern', text('lower(email) text_pattern_ops')),
+    )
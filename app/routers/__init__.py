@@ -4,4 +4,8 @@ from .transactions import router as transactions
 from .dashboard import router as dashboard
 from .notifications import router as notifications
 from .storage import router as storage
-from .app_config import router as app_config
\ No newline at end of file
+from .app_config import router as app_config
+from .lookup import router as lookup
+from .metrics import router as metrics
+from .health import router as health
+from .activity import router as activity
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_read_db
+from app.schemas.activity import ActivityType, PaginatedActivityResponse
+from app.services.activity_service import activity_service
+from app.core.security import get_current_admin
+
+router = APIRouter()
+
+@router.get("/admin/activity", response_model=PaginatedActivityResponse)
+def get_activity(
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    action_type: Optional[ActivityType] = None,
+    user_id: Optional[int] = None,
+    admin_id: Optional[int] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_admin: dict = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Audit log, newest first. Entries appear within a flush interval of the action."""
+    return activity_service.query(
+        db,
+        page=page,
+        limit=limit,
+        action_type=action_type.value if action_type else None,
+        user_id=user_id,
+        admin_id=admin_id,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        since=since,
+        until=until
+    )
@@ -1,10 +1,14 @@
 import json
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.models.settings import PlatformSetting
-from app.schemas.settings import TelegramLinksResponse, TelegramLink, BannerImagesResponse
+from app.schemas.settings import TelegramLinksResponse, TelegramLink, BannerImagesResponse, ExchangeRateResponse
+from app.services.exchange_rate_service import exchange_rate_service
+from app.services.settings_service import settings_service
 
 router = APIRouter()
 
@@ -40,3 +44,19 @@ def get_home_banners(db: Session = Depends(get_db)):
         return BannerImagesResponse(banners=[])
     except (json.JSONDecodeError, TypeError):
         return BannerImagesResponse(banners=[])
+
+
+@router.get("/config/exchange-rate", response_model=ExchangeRateResponse)
+def get_exchange_rate(at: Optional[datetime] = None, db: Session = Depends(get_db)):
+    """Get the USDT to INR rate now, or the rate that was in force at `at`.
+
+    Clients connected to /ws/{user_id} also receive an "exchange_rate_updated"
+    message whenever the rate changes, so there is no need to poll this.
+    """
+    historical = exchange_rate_service.rate_at(at or datetime.utcnow())
+    if historical is None:
+        if at is not None:
+            raise HTTPException(status_code=404, detail="No exchange rate recorded at that time")
+        return ExchangeRateResponse(rate=settings_service.get_platform_settings(db).usdt_to_inr_rate)
+    rate, effective_at = historical
+    return ExchangeRateResponse(rate=rate, effective_at=effective_at)
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
-from app.schemas.user import UserRegister, UserLogin, UserResponse, TokenResponse, AdminRegister, AdminResponse, AdminLogin, AdminTokenResponse
+from app.schemas.user import UserRegister, UserLogin, UserResponse, TokenResponse, AdminRegister, AdminUpdate, AdminResponse, AdminLogin, AdminTokenResponse, RefreshTokenRequest, RefreshTokenResponse
 from app.services.auth_service import auth_service
+from app.services.token_service import token_service
+from app.services.activity_service import activity_service
+from app.schemas.activity import ActivityType
 from app.core.security import get_current_user, get_current_super_admin
+from app.core.rate_limit import rate_limiter
 
 router = APIRouter()
 
 @router.post("/auth/register", response_model=UserResponse)
-def register(user: UserRegister, db: Session = Depends(get_db)):
+def register(request: Request, user: UserRegister, db: Session = Depends(get_db)):
     """Register a new user with phone number, password, and optional referral code."""
+    rate_limiter.check_register(request)
     new_user = auth_service.register_user(db, user)
     return UserResponse(
         id=new_user.id,
@@ -20,9 +25,30 @@ def register(user: UserRegister, db: Session = Depends(get_db)):
     )
 
 @router.post("/auth/login", response_model=TokenResponse)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+def login(request: Request, user: UserLogin, db: Session = Depends(get_db)):
     """Login user and return JWT token."""
-    return auth_service.login_user(db, user)
+    rate_limiter.check_login(request, user.phone_number)
+    try:
+        response = auth_service.login_user(db, user)
+    except HTTPException as e:
+        activity_service.record(
+            ActivityType.USER_LOGIN_FAILED.value, request,
+            description=e.detail, metadata={"phone_number": user.phone_number}
+        )
+        raise
+    activity_service.record(ActivityType.USER_LOGIN.value, request, user_id=response.user.id)
+    return response
+
+@router.post("/auth/refresh", response_model=RefreshTokenResponse)
+def refresh(token: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token and refresh token (the old one stops working)."""
+    return token_service.rotate(db, token.refresh_token)
+
+@router.post("/auth/logout", response_model=dict)
+def logout(token: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Revoke a refresh token and every token rotated from the same login."""
+    token_service.logout(db, token.refresh_token)
+    return {"message": "Logged out successfully"}
 
 @router.post("/auth/admin/register", response_model=AdminResponse)
 def register_admin(
@@ -40,7 +66,43 @@ def register_admin(
         message="Admin registered successfully"
     )
 
+@router.put("/auth/admin/{admin_id}", response_model=AdminResponse)
+def update_admin(
+    request: Request,
+    admin_id: int,
+    admin_update: AdminUpdate,
+    current_admin: dict = Depends(get_current_super_admin),
+    db: Session = Depends(get_db)
+):
+    """Activate, deactivate or change the role of an admin (Super Admin only)."""
+    if admin_id == current_admin['id']:
+        raise HTTPException(status_code=400, detail="Cannot change your own account")
+    admin = token_service.update_admin(db, admin_id, admin_update.is_active, admin_update.role)
+    activity_service.record(
+        ActivityType.ADMIN_UPDATE.value, request, admin_id=current_admin['id'],
+        entity_type="admin", entity_id=admin_id, metadata=admin_update.model_dump(exclude_none=True)
+    )
+    return AdminResponse(
+        id=admin.id,
+        username=admin.username,
+        email=admin.email,
+        role=admin.role,
+        is_active=admin.is_active,
+        created_at=admin.created_at,
+        message="Admin updated successfully"
+    )
+
 @router.post("/auth/admin/login", response_model=AdminTokenResponse)
-def login_admin(admin: AdminLogin, db: Session = Depends(get_db)):
+def login_admin(request: Request, admin: AdminLogin, db: Session = Depends(get_db)):
     """Login admin and return JWT token."""
-    return auth_service.login_admin(db, admin)
+    rate_limiter.check_login(request, f"admin:{admin.username}")
+    try:
+        response = auth_service.login_admin(db, admin)
+    except HTTPException as e:
+        activity_service.record(
+            ActivityType.ADMIN_LOGIN_FAILED.value, request,
+            description=e.detail, metadata={"username": admin.username}
+        )
+        raise
+    activity_service.record(ActivityType.ADMIN_LOGIN.value, request, admin_id=response.admin.id)
+    return response
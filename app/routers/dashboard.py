@@ -3,10 +3,11 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.core.security import get_current_admin
+from app.core.responses import ORJSONResponse
 from app.services.notification_service import notification_service
 
 router = APIRouter()
@@ -22,10 +23,10 @@ async def websocket_notifications(websocket: WebSocket):
     except WebSocketDisconnect:
         notification_service.disconnect(websocket)
 
-@router.get("/dashboard/stats")
+@router.get("/dashboard/stats", response_class=ORJSONResponse)
 def get_dashboard_stats(
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get overall dashboard statistics."""
     # User stats
@@ -51,7 +52,7 @@ def get_dashboard_stats(
         Transaction.status.in_(['approved', 'completed'])
     ).scalar() or 0
     
-    return {
+    return ORJSONResponse({
         "users": {
             "total": total_users,
             "active": active_users
@@ -69,13 +70,13 @@ def get_dashboard_stats(
         "revenue": {
             "platform_fees": float(total_platform_fees)
         }
-    }
+    })
 
-@router.get("/dashboard/transactions-chart")
+@router.get("/dashboard/transactions-chart", response_class=ORJSONResponse)
 def get_transactions_chart(
     days: int = 30,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get transaction data for charts (last N days)."""
     end_date = datetime.utcnow()
@@ -105,7 +106,7 @@ def get_transactions_chart(
         Transaction.created_at >= start_date
     ).group_by(Transaction.status).all()
     
-    return {
+    return ORJSONResponse({
         "daily_transactions": [
             {"date": str(item.date), "count": item.count}
             for item in daily_transactions
@@ -118,13 +119,13 @@ def get_transactions_chart(
             {"status": item.status, "count": item[1]}
             for item in status_breakdown
         ]
-    }
+    })
 
-@router.get("/dashboard/users-chart")
+@router.get("/dashboard/users-chart", response_class=ORJSONResponse)
 def get_users_chart(
     days: int = 30,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user registration data for charts."""
     end_date = datetime.utcnow()
@@ -148,19 +149,19 @@ def get_users_chart(
             "cumulative": total
         })
     
-    return {
+    return ORJSONResponse({
         "daily_registrations": [
             {"date": str(item.date), "count": item.count}
             for item in daily_users
         ],
         "cumulative_users": cumulative_users
-    }
+    })
 
-@router.get("/dashboard/revenue-chart")
+@router.get("/dashboard/revenue-chart", response_class=ORJSONResponse)
 def get_revenue_chart(
     days: int = 30,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get revenue data for charts."""
     end_date = datetime.utcnow()
@@ -176,23 +177,23 @@ def get_revenue_chart(
         Transaction.platform_fee_amount > 0
     ).group_by(func.date(Transaction.created_at)).all()
     
-    return {
+    return ORJSONResponse({
         "daily_fees": [
             {"date": str(item.date), "fees": float(item.fees or 0)}
             for item in daily_fees
         ]
-    }
+    })
 
-@router.get("/dashboard/recent-activity")
+@router.get("/dashboard/recent-activity", response_class=ORJSONResponse)
 def get_recent_activity(
     limit: int = 10,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get recent transaction activity."""
     recent_transactions = db.query(Transaction).order_by(Transaction.created_at.desc()).limit(limit).all()
     
-    return [
+    return ORJSONResponse([
         {
             "id": t.id,
             "transaction_uid": t.transaction_uid,
@@ -203,4 +204,4 @@ def get_recent_activity(
             "created_at": t.created_at
         }
         for t in recent_transactions
-    ]
+    ])
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+
+from app.schemas.health import ReadinessResponse
+from app.services.health_service import health_service
+
+router = APIRouter()
+
+@router.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and its event loop is serving requests."""
+    return {"status": "alive"}
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness(response: Response):
+    """Readiness probe: database, pool, broker and event loop checks (503 when not ready)."""
+    result = await health_service.readiness()
+    if result.status != "ready":
+        response.status_code = 503
+    return result
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.schemas.lookup import LookupResponse, LookupIndexStats
+from app.services.lookup_service import lookup_service
+from app.core.security import get_current_admin
+
+router = APIRouter()
+
+@router.get("/admin/lookup", response_model=LookupResponse)
+def lookup(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1, le=50),
+    current_admin: dict = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Typeahead over phone numbers, referral codes and transaction UIDs by prefix."""
+    return lookup_service.lookup(db, q, limit)
+
+@router.get("/admin/lookup/stats", response_model=LookupIndexStats)
+def lookup_stats(current_admin: dict = Depends(get_current_admin)):
+    """Size and memory footprint of this worker's lookup index."""
+    return lookup_service.stats()
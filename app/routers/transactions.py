@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from typing import List, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.core.security import get_current_user, get_current_admin
-from app.schemas.transaction import TransactionResponse, TransactionDetail, AdminTransactionApproval, PaginatedTransactionResponse, TransactionUserInfo, UPIPayoutCreate, TransactionStatus
+from app.schemas.transaction import TransactionResponse, TransactionDetail, AdminTransactionApproval, PaginatedTransactionResponse, TransactionUserInfo, UPIPayoutCreate, TransactionStatus, QuoteType, TransactionQuote, BatchQuoteRequest, BatchQuoteResponse, TransactionSummary
 from app.schemas.settings import SettingUpdate
 from app.services.transaction_service import transaction_service
+from app.services.transaction_stats_service import transaction_stats_service
+from app.services.search_service import search_service
+from app.services.settings_service import settings_service
+from app.services.pricing_service import pricing_service
+from app.services.exchange_rate_service import exchange_rate_service, RATE_SETTING_KEY
+from app.services.activity_service import activity_service
+from app.schemas.activity import ActivityType
 from app.models.transaction import Transaction
 from app.models.settings import PlatformSetting
 from app.models.user import User
@@ -36,6 +43,7 @@ def create_deposit_transaction(
 
 @router.post("/transactions/upi-payout", response_model=TransactionResponse)
 def create_upi_payout_request(
+    request: Request,
     user_phone: str = Form(...),
     upi_amount: Decimal = Form(...),
     payment_reference: str = Form(...),
@@ -47,7 +55,7 @@ def create_upi_payout_request(
     db: Session = Depends(get_db)
 ):
     """Create a UPI payout request for a user by phone number with payment reference, crypto amount, and remaining crypto."""
-    return transaction_service.create_upi_payout(
+    transaction = transaction_service.create_upi_payout(
         db=db,
         user_phone=user_phone,
         upi_amount=upi_amount,
@@ -57,13 +65,19 @@ def create_upi_payout_request(
         crypto_network=crypto_network,
         user_notes=user_notes
     )
+    activity_service.record(
+        ActivityType.UPI_PAYOUT_CREATE.value, request, user_id=current_user['id'],
+        entity_type="transaction", entity_id=transaction.id,
+        metadata={"transaction_uid": transaction.transaction_uid, "upi_amount": str(upi_amount), "user_phone": user_phone}
+    )
+    return transaction
 
 @router.get("/transactions/my-transactions", response_model=List[TransactionResponse])
 def get_user_transactions(
     limit: int = 20,
     offset: int = 0,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user's transactions."""
     transactions = db.query(Transaction).filter_by(user_id=current_user['id']).order_by(Transaction.created_at.desc()).limit(limit).offset(offset).all()
@@ -94,6 +108,29 @@ def get_user_balance(
         "total_commission_earned": user.total_commission_earned
     }
 
+@router.get("/transactions/summary", response_model=TransactionSummary)
+def get_transaction_summary(
+    months: int = Query(12, ge=1, le=120),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Counts by type and status, and monthly totals for the last `months` months."""
+    return transaction_stats_service.summary(db, current_user['id'], months)
+
+@router.get("/transactions/quote", response_model=TransactionQuote)
+def get_transaction_quote(
+    type: QuoteType,
+    amount: Decimal = Query(..., gt=0),
+    at: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Preview the fee, bonus and net amount for a deposit (USDT) or UPI payout (INR).
+
+    With `at`, deposits are priced at the exchange rate in force at that time.
+    """
+    return pricing_service.quote(db, type, amount, at)
+
 @router.get("/transactions/{transaction_id}", response_model=TransactionDetail)
 def get_transaction_detail(
     transaction_id: int,
@@ -120,20 +157,18 @@ def get_pending_transactions(
     limit: int = 20,
     search: Optional[str] = None,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all pending transactions for admin review with pagination and search."""
     query = db.query(Transaction).join(User, Transaction.user_id == User.id).filter(Transaction.status == 'pending')
 
     # Add search filter if provided
+    total_capped = False
     if search:
-        query = query.filter(
-            (User.phone_number.ilike(f"%{search}%")) |
-            (User.name.ilike(f"%{search}%")) |
-            (Transaction.transaction_uid.ilike(f"%{search}%"))
-        )
-
-    total = query.count()
+        query = query.filter(search_service.transaction_filter(search))
+        total, total_capped = search_service.bounded_count(query)
+    else:
+        total = query.count()
     transactions = query.order_by(Transaction.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
 
     # Create response objects with user data
@@ -149,7 +184,8 @@ def get_pending_transactions(
         total=total,
         page=page,
         limit=limit,
-        total_pages=(total + limit - 1) // limit
+        total_pages=(total + limit - 1) // limit,
+        total_capped=total_capped
     )
 
 @router.get("/admin/transactions", response_model=PaginatedTransactionResponse)
@@ -159,7 +195,7 @@ def get_all_transactions(
     page: int = 1,
     limit: int = 20,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all transactions for admin review with pagination."""
     query = db.query(Transaction).join(User, Transaction.user_id == User.id)
@@ -195,7 +231,7 @@ def search_transactions_by_mobile(
     page: int = 1,
     limit: int = 20,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search transactions by user's mobile number with pagination."""
     query = db.query(Transaction).join(User, Transaction.user_id == User.id).filter(User.phone_number == mobile_number)
@@ -218,6 +254,15 @@ def search_transactions_by_mobile(
         total_pages=(total + limit - 1) // limit
     )
 
+@router.post("/admin/transactions/quote/batch", response_model=BatchQuoteResponse)
+def quote_transactions_batch(
+    quote_request: BatchQuoteRequest,
+    current_admin: dict = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Price many amounts at the current settings, with totals. Amounts outside the limits are flagged, not rejected."""
+    return pricing_service.quote_batch(db, quote_request.type, quote_request.amounts)
+
 @router.get("/admin/transactions/{transaction_id}", response_model=TransactionDetail)
 def get_admin_transaction_detail(
     transaction_id: int,
@@ -237,6 +282,7 @@ def get_admin_transaction_detail(
 
 @router.put("/admin/transactions/{transaction_id}/review", response_model=dict)
 def review_transaction(
+    request: Request,
     transaction_id: int,
     approval: AdminTransactionApproval,
     current_admin: dict = Depends(get_current_admin),
@@ -254,10 +300,16 @@ def review_transaction(
         transaction_fee=approval.transaction_fee,
         platform_fee=approval.platform_fee
     )
+    activity_service.record(
+        ActivityType.TRANSACTION_REVIEW.value, request, admin_id=current_admin['id'],
+        entity_type="transaction", entity_id=transaction_id,
+        description=approval.rejection_reason, metadata={"status": approval.status.value}
+    )
     return {"message": "Transaction reviewed successfully"}
 
 @router.put("/admin/transactions/{transaction_id}/approve", response_model=dict)
 def approve_transaction(
+    request: Request,
     transaction_id: int,
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
@@ -269,10 +321,15 @@ def approve_transaction(
         admin_id=current_admin['id'],
         status=TransactionStatus.APPROVED
     )
+    activity_service.record(
+        ActivityType.TRANSACTION_REVIEW.value, request, admin_id=current_admin['id'],
+        entity_type="transaction", entity_id=transaction_id, metadata={"status": TransactionStatus.APPROVED.value}
+    )
     return {"message": "Transaction approved successfully"}
 
 @router.post("/admin/transactions/upi-payout", response_model=TransactionResponse)
 def create_admin_upi_payout(
+    request: Request,
     user_phone: str = Form(...),
     upi_amount: Decimal = Form(...),
     payment_reference: str = Form(...),
@@ -290,7 +347,7 @@ def create_admin_upi_payout(
     if not user:
         raise HTTPException(status_code=404, detail="User not found with the provided phone number")
 
-    return transaction_service.create_admin_upi_payout(
+    transaction = transaction_service.create_admin_upi_payout(
         db=db,
         user_id=user.id,
         upi_amount=upi_amount,
@@ -301,6 +358,12 @@ def create_admin_upi_payout(
         user_notes=user_notes,
         admin_notes=admin_notes
     )
+    activity_service.record(
+        ActivityType.UPI_PAYOUT_CREATE.value, request, user_id=user.id, admin_id=current_admin['id'],
+        entity_type="transaction", entity_id=transaction.id,
+        metadata={"transaction_uid": transaction.transaction_uid, "upi_amount": str(upi_amount)}
+    )
+    return transaction
 
 @router.get("/admin/settings", response_model=List[dict])
 def get_all_platform_settings(
@@ -324,6 +387,7 @@ def get_all_platform_settings(
 
 @router.put("/admin/settings", response_model=dict)
 def update_platform_setting(
+    request: Request,
     setting: SettingUpdate,
     current_admin: dict = Depends(get_current_admin),
     db: Session = Depends(get_db)
@@ -348,6 +412,19 @@ def update_platform_setting(
             updated_by_admin_id=current_admin['id']
         )
         db.add(new_setting)
-    
+
+    # Rate changes are also kept in the append-only history and pushed to WebSocket clients
+    rate_entry = None
+    if setting.setting_key == RATE_SETTING_KEY:
+        rate_entry = exchange_rate_service.record_change(db, setting.setting_value, current_admin['id'])
+
+    settings_service.announce_change(db)
     db.commit()
+    settings_service.invalidate()
+    if rate_entry is not None:
+        exchange_rate_service.apply(exchange_rate_service.message(rate_entry))
+    activity_service.record(
+        ActivityType.SETTING_UPDATE.value, request, admin_id=current_admin['id'], entity_type="platform_setting",
+        metadata={"setting_key": setting.setting_key, "setting_value": setting.setting_value}
+    )
     return {"message": "Setting updated successfully"}
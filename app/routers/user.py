@@ -1,10 +1,16 @@
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.schemas.user import UserProfile, TeamMemberSchema, CommissionSchema, BindUPI, BindBankAccount, PaginatedUserResponse
+from app.db.database import get_db, get_read_db
+from app.schemas.user import UserProfile, TeamMemberSchema, CommissionSchema, BindUPI, BindBankAccount, PaginatedUserResponse, UserBlockUpdate
+from app.schemas.team import TeamTree, PaginatedTeamResponse
 from app.services.user_service import user_service
+from app.services.team_service import team_service
+from app.services.search_service import search_service
+from app.services.token_service import token_service
+from app.services.activity_service import activity_service
+from app.schemas.activity import ActivityType
 from app.core.security import get_current_user, get_current_admin
 from app.models.user import User
 
@@ -18,18 +24,52 @@ def get_profile(
     """Get current user profile with wallet balance and team stats."""
     return user_service.get_user_profile(db, current_user['id'])
 
-@router.get("/user/team", response_model=List[TeamMemberSchema])
+@router.get("/user/team", response_model=List[TeamMemberSchema], deprecated=True)
 def get_team(
+    page: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=500),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
+):
+    """Get a page of team members referred by the current user.
+
+    Deprecated: use /user/team/members, which also returns totals.
+    """
+    return user_service.get_team_members(db, current_user['id'], page=page, limit=limit)
+
+@router.get("/user/team/members", response_model=PaginatedTeamResponse)
+def get_team_page(
+    level: Optional[int] = None,
+    root_user_id: Optional[int] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get a page of team members, optionally filtered by level.
+
+    Pass root_user_id (a member of your team) to expand that member's subtree;
+    levels are then relative to that member.
+    """
+    root_user_id = root_user_id or current_user['id']
+    team_service.ensure_in_team(db, current_user['id'], root_user_id)
+    return team_service.get_team_page(db, root_user_id, level=level, page=page, limit=limit)
+
+@router.get("/user/team/levels", response_model=TeamTree)
+def get_team_levels(
+    root_user_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get list of team members referred by the current user."""
-    return user_service.get_team_members(db, current_user['id'])
+    """Get member counts and deposit totals per team level."""
+    root_user_id = root_user_id or current_user['id']
+    team_service.ensure_in_team(db, current_user['id'], root_user_id)
+    return team_service.get_level_stats(db, root_user_id)
 
 @router.get("/user/commissions", response_model=List[CommissionSchema])
 def get_commissions(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get history of commissions earned."""
     return user_service.get_commissions(db, current_user['id'])
@@ -60,25 +100,27 @@ def search_users(
     page: int = 1,
     limit: int = 20,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search users by mobile number."""
-    query = db.query(User).filter(User.phone_number.ilike(f"%{mobile_number}%"))
+    query = db.query(User).filter(search_service.user_filter(mobile_number))
 
-    total = query.count()
-    users = query.order_by(User.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    total, total_capped = search_service.bounded_count(query)
+    user_ids = [
+        row.id for row in
+        query.with_entities(User.id).order_by(User.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    ]
 
-    # Create UserProfile objects with team size and commission
-    user_profiles = []
-    for user in users:
-        user_profiles.append(user_service.get_user_profile(db, user.id))
+    # Build UserProfile objects for the whole page in one query
+    user_profiles = user_service.get_user_profiles(db, user_ids)
 
     return PaginatedUserResponse(
         users=user_profiles,
         total=total,
         page=page,
         limit=limit,
-        total_pages=(total + limit - 1) // limit
+        total_pages=(total + limit - 1) // limit,
+        total_capped=total_capped
     )
 
 @router.get("/admin/users", response_model=PaginatedUserResponse)
@@ -87,29 +129,45 @@ def get_all_users(
     limit: int = 20,
     search: str = None,
     current_admin: dict = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get all users with pagination for admin."""
     query = db.query(User)
+    total_capped = False
     if search:
-        query = query.filter(
-            (User.name.ilike(f"%{search}%")) |
-            (User.email.ilike(f"%{search}%")) |
-            (User.phone_number.ilike(f"%{search}%"))
-        )
-
-    total = query.count()
-    users = query.order_by(User.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
-
-    # Create UserProfile objects with team size and commission
-    user_profiles = []
-    for user in users:
-        user_profiles.append(user_service.get_user_profile(db, user.id))
+        query = query.filter(search_service.user_filter(search))
+        total, total_capped = search_service.bounded_count(query)
+    else:
+        total = query.count()
+    user_ids = [
+        row.id for row in
+        query.with_entities(User.id).order_by(User.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    ]
+
+    # Build UserProfile objects for the whole page in one query
+    user_profiles = user_service.get_user_profiles(db, user_ids)
 
     return PaginatedUserResponse(
         users=user_profiles,
         total=total,
         page=page,
         limit=limit,
-        total_pages=(total + limit - 1) // limit
+        total_pages=(total + limit - 1) // limit,
+        total_capped=total_capped
+    )
+
+@router.put("/admin/users/{user_id}/block", response_model=dict)
+def set_user_blocked(
+    request: Request,
+    user_id: int,
+    block_update: UserBlockUpdate,
+    current_admin: dict = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Block or unblock a user. Blocking signs the user out everywhere."""
+    token_service.set_user_blocked(db, user_id, block_update.is_blocked)
+    activity_service.record(
+        ActivityType.USER_BLOCK.value, request, user_id=user_id, admin_id=current_admin['id'],
+        entity_type="user", entity_id=user_id, metadata={"is_blocked": block_update.is_blocked}
     )
+    return {"message": "User blocked successfully" if block_update.is_blocked else "User unblocked successfully"}
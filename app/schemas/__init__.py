@@ -20,6 +20,6 @@ from app.schemas.transaction import (
     TransactionDetail,
 )
 from app.schemas.commission import CommissionStatus, CommissionResponse
-from app.schemas.team import TeamMember, TeamStats
+from app.schemas.team import TeamMember, TeamStats, TeamLevelStats, TeamTree, PaginatedTeamResponse
 from app.schemas.notification import NotificationType, NotificationResponse
 from app.schemas.settings import PlatformSettings
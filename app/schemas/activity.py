@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from enum import Enum
+from typing import Optional, List, Dict, Any
+
+from app.core.utils import ISTDateTime
+
+
+class ActivityType(str, Enum):
+    USER_LOGIN = "user_login"
+    USER_LOGIN_FAILED = "user_login_failed"
+    ADMIN_LOGIN = "admin_login"
+    ADMIN_LOGIN_FAILED = "admin_login_failed"
+    TRANSACTION_REVIEW = "transaction_review"
+    UPI_PAYOUT_CREATE = "upi_payout_create"
+    SETTING_UPDATE = "setting_update"
+    USER_BLOCK = "user_block"
+    ADMIN_UPDATE = "admin_update"
+
+
+class ActivityLogResponse(BaseModel):
+    id: int
+    action_type: str
+    user_id: Optional[int] = None
+    admin_id: Optional[int] = None
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
+    description: Optional[str] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    log_metadata: Optional[Dict[str, Any]] = None
+    created_at: Optional[ISTDateTime] = None
+
+
+class PaginatedActivityResponse(BaseModel):
+    entries: List[ActivityLogResponse]
+    total: int
+    page: int
+    limit: int
+    total_pages: int
+    total_capped: bool = False
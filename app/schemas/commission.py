@@ -1,10 +1,9 @@
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-from app.core.utils import to_ist
+from app.core.utils import ISTDateTime
 
 
 class CommissionStatus(str, Enum):
@@ -18,16 +17,13 @@ class CommissionResponse(BaseModel):
     referrer_user_id: int
     referred_user_id: int
     transaction_id: int
+    level: int = 1
     commission_percent: Decimal
     base_amount: Decimal
     commission_amount: Decimal
     status: CommissionStatus
-    credited_at: Optional[datetime] = None
-    created_at: Optional[datetime] = None
-
-    @field_serializer("credited_at", "created_at")
-    def serialize_datetimes(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
+    credited_at: Optional[ISTDateTime] = None
+    created_at: Optional[ISTDateTime] = None
 
     class Config:
         from_attributes = True
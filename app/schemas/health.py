@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class HealthCheck(BaseModel):
+    ok: bool
+    detail: Optional[str] = None
+    value: Optional[float] = None
+
+
+class ReadinessResponse(BaseModel):
+    status: str  # "ready" or "not_ready"
+    checks: Dict[str, HealthCheck]
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from enum import Enum
+from typing import Optional, List, Dict
+
+from app.core.utils import ISTDateTime
+
+
+class LookupKind(str, Enum):
+    PHONE = "phone"
+    REFERRAL_CODE = "referral_code"
+    TRANSACTION_UID = "transaction_uid"
+
+
+class LookupMatch(BaseModel):
+    kind: LookupKind
+    value: str
+    id: int  # user id for phone/referral_code, transaction id for transaction_uid
+
+
+class LookupResponse(BaseModel):
+    query: str
+    matches: List[LookupMatch]
+    source: str  # "index" or "database" while the index is still building
+
+
+class LookupIndexStats(BaseModel):
+    ready: bool
+    built_at: Optional[ISTDateTime] = None
+    build_seconds: Optional[float] = None
+    entries: Dict[str, int]
+    memory_bytes: Dict[str, int]
+    total_memory_bytes: int
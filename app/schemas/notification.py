@@ -1,9 +1,8 @@
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 from enum import Enum
 
-from app.core.utils import to_ist
+from app.core.utils import ISTDateTime
 
 
 class NotificationType(str, Enum):
@@ -20,11 +19,7 @@ class NotificationResponse(BaseModel):
     type: NotificationType
     is_read: bool
     related_transaction_id: Optional[int] = None
-    created_at: datetime
-
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: datetime) -> datetime:
-        return to_ist(value)
+    created_at: ISTDateTime
 
     class Config:
         from_attributes = True
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from decimal import Decimal
 from typing import Optional, List
 
+from app.core.utils import ISTDateTime
+
 
 class PlatformSettings(BaseModel):
     usdt_to_inr_rate: Decimal = Decimal("85.00")
@@ -9,6 +11,7 @@ class PlatformSettings(BaseModel):
     bonus_percent: Decimal = Decimal("0.00")
     inr_bonus_ratio: Decimal = Decimal("1.00")
     commission_percent: Decimal = Decimal("0.00")
+    commission_level_percents: str = ""
     min_deposit_usdt: Decimal = Decimal("10.00")
     max_deposit_usdt: Decimal = Decimal("10000.00")
     min_withdrawal_inr: Decimal = Decimal("100.00")
@@ -32,6 +35,11 @@ class BannerImagesResponse(BaseModel):
     banners: List[str]
 
 
+class ExchangeRateResponse(BaseModel):
+    rate: Decimal  # INR per USDT
+    effective_at: Optional[ISTDateTime] = None  # None when no change has been recorded yet
+
+
 class SettingUpdate(BaseModel):
     setting_key: str
     setting_value: str
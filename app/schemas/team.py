@@ -1,9 +1,8 @@
-from pydantic import BaseModel, field_serializer
-from datetime import datetime
+from pydantic import BaseModel
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List
 
-from app.core.utils import to_ist
+from app.core.utils import ISTDateTime
 
 
 class TeamMember(BaseModel):
@@ -13,11 +12,8 @@ class TeamMember(BaseModel):
     name: Optional[str] = None
     level: int
     total_deposited: Decimal = Decimal("0.00")
-    joined_at: datetime
-
-    @field_serializer("joined_at")
-    def serialize_joined_at(self, value: datetime) -> datetime:
-        return to_ist(value)
+    direct_referrals: int = 0
+    joined_at: ISTDateTime
 
     class Config:
         from_attributes = True
@@ -29,3 +25,24 @@ class TeamStats(BaseModel):
     indirect_members: int
     total_commission_earned: Decimal
     team_total_deposited: Decimal
+
+
+class TeamLevelStats(BaseModel):
+    level: int
+    members: int
+    total_deposited: Decimal
+
+
+class TeamTree(BaseModel):
+    root_user_id: int
+    total_members: int
+    total_deposited: Decimal
+    levels: List[TeamLevelStats]
+
+
+class PaginatedTeamResponse(BaseModel):
+    members: List[TeamMember]
+    total: int
+    page: int
+    limit: int
+    total_pages: int
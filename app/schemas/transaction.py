@@ -1,10 +1,9 @@
-from pydantic import BaseModel, field_validator, field_serializer
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
-from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-from app.core.utils import to_ist
+from app.core.utils import ISTDateTime
 
 
 class TransactionType(str, Enum):
@@ -23,6 +22,11 @@ class TransactionStatus(str, Enum):
     FAILED = "failed"
 
 
+class QuoteType(str, Enum):
+    CRYPTO_DEPOSIT = "crypto_deposit"
+    UPI_PAYOUT = "upi_payout"
+
+
 class DepositCreate(BaseModel):
     crypto_network: str
     crypto_amount: Decimal
@@ -168,11 +172,7 @@ class TransactionResponse(BaseModel):
     platform_fee_amount: Optional[Decimal] = None
     bonus_amount: Optional[Decimal] = None
     payment_reference: Optional[str] = None
-    created_at: Optional[datetime] = None
-
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
+    created_at: Optional[ISTDateTime] = None
 
     class Config:
         from_attributes = True
@@ -185,13 +185,9 @@ class TransactionDetail(TransactionResponse):
     exchange_rate: Optional[Decimal] = None
     user_upi_id: Optional[str] = None
     rejection_reason: Optional[str] = None
-    admin_reviewed_at: Optional[datetime] = None
-    payment_completed_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
-
-    @field_serializer("admin_reviewed_at", "payment_completed_at", "updated_at")
-    def serialize_datetimes(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
+    admin_reviewed_at: Optional[ISTDateTime] = None
+    payment_completed_at: Optional[ISTDateTime] = None
+    updated_at: Optional[ISTDateTime] = None
 
 
 class AdminTransactionApproval(BaseModel):
@@ -209,3 +205,75 @@ class PaginatedTransactionResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    total_capped: bool = False
+
+
+class TransactionQuote(BaseModel):
+    type: QuoteType
+    amount: Decimal  # USDT for deposits, INR for payouts
+    exchange_rate: Decimal
+    rate_effective_at: Optional[ISTDateTime] = None  # set for deposits priced at a past time
+    platform_fee_percent: Decimal
+    bonus_percent: Decimal
+    gross_inr_amount: Decimal
+    platform_fee_amount: Decimal
+    bonus_amount: Decimal
+    net_inr_amount: Decimal
+
+
+MAX_BATCH_QUOTE_AMOUNTS = 10000
+
+
+class BatchQuoteRequest(BaseModel):
+    type: QuoteType
+    amounts: List[Decimal] = Field(..., min_length=1, max_length=MAX_BATCH_QUOTE_AMOUNTS)
+
+    @field_validator("amounts")
+    @classmethod
+    def validate_amounts(cls, v):
+        if any(amount <= 0 for amount in v):
+            raise ValueError("Amounts must be greater than 0")
+        return v
+
+
+class BatchQuoteItem(BaseModel):
+    amount: Decimal
+    gross_inr_amount: Decimal
+    platform_fee_amount: Decimal
+    bonus_amount: Decimal
+    net_inr_amount: Decimal
+    within_limits: bool
+
+
+class BatchQuoteResponse(BaseModel):
+    type: QuoteType
+    exchange_rate: Decimal
+    platform_fee_percent: Decimal
+    bonus_percent: Decimal
+    quotes: List[BatchQuoteItem]
+    total_gross_inr_amount: Decimal
+    total_platform_fee_amount: Decimal
+    total_bonus_amount: Decimal
+    total_net_inr_amount: Decimal
+
+
+class TransactionStatusCount(BaseModel):
+    type: TransactionType
+    status: TransactionStatus
+    count: int
+
+
+class MonthlyTransactionTotal(BaseModel):
+    month: str  # YYYY-MM, in IST
+    type: TransactionType
+    status: TransactionStatus
+    count: int
+    crypto_amount: Decimal
+    gross_inr_amount: Decimal
+    net_inr_amount: Decimal
+
+
+class TransactionSummary(BaseModel):
+    total_count: int
+    counts: List[TransactionStatusCount]  # all time
+    monthly: List[MonthlyTransactionTotal]  # newest month first
@@ -1,10 +1,9 @@
-from pydantic import BaseModel, field_validator, field_serializer, EmailStr
+from pydantic import BaseModel, field_validator, EmailStr
 from typing import Optional, List
-from datetime import datetime
 from decimal import Decimal
 import re
 
-from app.core.utils import to_ist
+from app.core.utils import ISTDateTime
 
 
 class UserRegister(BaseModel):
@@ -54,11 +53,7 @@ class UserProfile(BaseModel):
     total_commission: Optional[float] = 0.0
     referral_code: str
     is_active: Optional[bool] = True
-    created_at: Optional[datetime] = None
-
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
+    created_at: Optional[ISTDateTime] = None
 
     class Config:
         from_attributes = True
@@ -73,10 +68,25 @@ class UserResponse(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     user: UserProfile
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshTokenResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class UserBlockUpdate(BaseModel):
+    is_blocked: bool
+
+
 class UpdateProfile(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
@@ -139,6 +149,18 @@ class AdminRegister(BaseModel):
         return v
 
 
+class AdminUpdate(BaseModel):
+    is_active: Optional[bool] = None
+    role: Optional[str] = None
+
+    @field_validator("role")
+    @classmethod
+    def validate_role(cls, v):
+        if v is not None and v not in ("super_admin", "admin", "support"):
+            raise ValueError("Role must be super_admin, admin or support")
+        return v
+
+
 class AdminLogin(BaseModel):
     username: str
     password: str
@@ -150,11 +172,7 @@ class AdminProfile(BaseModel):
     email: str
     role: str
     is_active: Optional[bool] = True
-    created_at: Optional[datetime] = None
-
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
+    created_at: Optional[ISTDateTime] = None
 
     class Config:
         from_attributes = True
@@ -166,16 +184,13 @@ class AdminResponse(BaseModel):
     email: str
     role: str
     is_active: Optional[bool] = True
-    created_at: Optional[datetime] = None
+    created_at: Optional[ISTDateTime] = None
     message: str
 
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: Optional[datetime]) -> Optional[datetime]:
-        return to_ist(value)
-
 
 class AdminTokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     admin: AdminProfile
 
@@ -183,24 +198,16 @@ class AdminTokenResponse(BaseModel):
 class TeamMemberSchema(BaseModel):
     user_id: int
     phone_number: str
-    joined_at: datetime
+    joined_at: ISTDateTime
     level: int
 
-    @field_serializer("joined_at")
-    def serialize_joined_at(self, value: datetime) -> datetime:
-        return to_ist(value)
-
 
 class CommissionSchema(BaseModel):
     id: int
     amount: float
     from_user_id: int
     level: int
-    created_at: datetime
-
-    @field_serializer("created_at")
-    def serialize_created_at(self, value: datetime) -> datetime:
-        return to_ist(value)
+    created_at: ISTDateTime
 
 
 class PaginatedUserResponse(BaseModel):
@@ -209,3 +216,4 @@ class PaginatedUserResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    total_capped: bool = False
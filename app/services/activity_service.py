@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import ACTIVITY_LOG_DROPPED, ACTIVITY_LOG_BUFFERED
+from app.core.rate_limit import rate_limiter
+from app.db.database import get_db_context
+from app.models.log import ActivityLog
+from app.schemas.activity import ActivityLogResponse, PaginatedActivityResponse
+from app.services.search_service import search_service
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityService:
+    """Audit log of logins, transaction reviews, payouts and setting changes.
+
+    record() only appends to an in-memory ring buffer, so an audited action
+    costs no extra database round trip. A background task flushes the buffer
+    every activity_log_flush_interval_seconds with multi-row INSERTs of up
+    to activity_log_batch_size rows.
+
+    Durability is best-effort: entries are written within one flush interval
+    and drained on graceful shutdown, but a crashed worker loses what it had
+    not flushed. When a flush fails the batch goes back to the front of the
+    buffer for the next attempt. After activity_log_max_attempts failures
+    its rows are written one by one and any that still fail are logged and
+    dropped, so one bad entry cannot hold up the rest. Once the buffer holds
+    activity_log_buffer_size entries the oldest are dropped, which shows up
+    in the activity_log_dropped metric.
+    """
+
+    def __init__(self, maxlen: int):
+        self._buffer: deque = deque()
+        self._maxlen = maxlen
+        self._lock = threading.Lock()
+        # Failed attempts at writing the batch at the front of the buffer
+        self._attempts = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def _append(self, entries: List[Dict[str, Any]], front: bool = False) -> None:
+        with self._lock:
+            if front:
+                self._buffer.extendleft(reversed(entries))
+            else:
+                self._buffer.extend(entries)
+            overflow = len(self._buffer) - self._maxlen
+            for _ in range(max(overflow, 0)):
+                self._buffer.popleft()
+        if overflow > 0:
+            ACTIVITY_LOG_DROPPED.inc(overflow)
+
+    def record(
+        self,
+        action_type: str,
+        request: Optional[Request] = None,
+        user_id: Optional[int] = None,
+        admin_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        description: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Queue an audit entry; never touches the database."""
+        if not settings.activity_log_enabled:
+            return
+        self._append([{
+            "action_type": action_type,
+            "user_id": user_id,
+            "admin_id": admin_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "description": description,
+            "ip_address": rate_limiter.client_ip(request)[:45] if request else None,
+            "user_agent": request.headers.get("user-agent") if request else None,
+            "log_metadata": metadata,
+            "created_at": datetime.utcnow(),
+        }])
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._buffer.popleft() for _ in range(min(limit, len(self._buffer)))]
+
+    @staticmethod
+    def _insert(rows: List[Dict[str, Any]]) -> None:
+        with get_db_context() as db:
+            db.execute(insert(ActivityLog).values(rows))
+            db.commit()
+
+    def _insert_each(self, batch: List[Dict[str, Any]]) -> int:
+        """Write a batch that keeps failing row by row, dropping the rows that fail."""
+        written = 0
+        for index, row in enumerate(batch):
+            try:
+                self._insert([row])
+            except (OperationalError, InterfaceError):
+                # The database is unreachable, the rows are not at fault
+                self._append(batch[index:], front=True)
+                raise
+            except Exception as e:
+                ACTIVITY_LOG_DROPPED.inc()
+                logger.error("Dropped activity log entry %r: %s", row, getattr(e, "orig", e))
+            else:
+                written += 1
+        self._attempts = 0
+        return written
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        written = 0
+        while True:
+            batch = self._take(settings.activity_log_batch_size)
+            if not batch:
+                return written
+            if self._attempts >= settings.activity_log_max_attempts:
+                written += self._insert_each(batch)
+                continue
+            try:
+                self._insert(batch)
+            except Exception:
+                self._attempts += 1
+                self._append(batch, front=True)
+                raise
+            self._attempts = 0
+            written += len(batch)
+
+    async def run_worker(self, stop_event: asyncio.Event):
+        """Flush every activity_log_flush_interval_seconds until stop_event is set, then drain."""
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.activity_log_flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                # Full traceback for the first failure only, not on every tick
+                if self._attempts <= 1:
+                    logger.exception("Activity log flush failed; %d entries kept for the next attempt", len(self))
+                else:
+                    logger.warning(
+                        "Activity log flush failed (attempt %d); %d entries kept: %s",
+                        self._attempts, len(self), getattr(e, "orig", e)
+                    )
+
+    @staticmethod
+    def query(
+        db: Session,
+        page: int = 1,
+        limit: int = 50,
+        action_type: Optional[str] = None,
+        user_id: Optional[int] = None,
+        admin_id: Optional[int] = None,
+        entity_type: Optional[str] = None,
+        entity_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> PaginatedActivityResponse:
+        query = db.query(ActivityLog)
+        if action_type:
+            query = query.filter(ActivityLog.action_type == action_type)
+        if user_id is not None:
+            query = query.filter(ActivityLog.user_id == user_id)
+        if admin_id is not None:
+            query = query.filter(ActivityLog.admin_id == admin_id)
+        if entity_type:
+            query = query.filter(ActivityLog.entity_type == entity_type)
+        if entity_id is not None:
+            query = query.filter(ActivityLog.entity_id == entity_id)
+        if since is not None:
+            query = query.filter(ActivityLog.created_at >= since)
+        if until is not None:
+            query = query.filter(ActivityLog.created_at < until)
+
+        # The log only grows; cap the count like admin search does
+        total, total_capped = search_service.bounded_count(query)
+        entries = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).offset((page - 1) * limit).limit(limit).all()
+
+        return PaginatedActivityResponse(
+            entries=[ActivityLogResponse.model_validate(entry, from_attributes=True) for entry in entries],
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=(total + limit - 1) // limit,
+            total_capped=total_capped
+        )
+
+
+activity_service = ActivityService(settings.activity_log_buffer_size)
+
+ACTIVITY_LOG_BUFFERED.set_function(lambda: len(activity_service))
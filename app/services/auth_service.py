@@ -2,18 +2,30 @@ import bcrypt
 import secrets
 import string
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 
 from app.models.user import User
-from app.models.team import TeamMember
 from app.models.admin import Admin
 from app.schemas.user import UserRegister, UserLogin, AdminRegister, AdminLogin
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.metrics import PASSWORD_HASH_DURATION
 from app.core.security import create_access_token
+from app.services.team_service import team_service
+from app.services.lookup_service import lookup_service
+from app.services.token_service import token_service
 
 # Import all models to ensure relationships are configured before queries
 import app.models
 
+REFERRAL_CODE_ATTEMPTS = 5
+
+# referral_code -> user id, or None for codes known not to exist
+referral_code_cache = TTLCache(maxsize=settings.referral_cache_size, ttl=settings.referral_cache_ttl_seconds)
+_NOT_CACHED = object()
+
 class AuthService:
     @staticmethod
     def generate_referral_code(length: int = 8) -> str:
@@ -23,71 +35,76 @@ class AuthService:
 
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        with PASSWORD_HASH_DURATION.labels("hash").time():
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
-        return bcrypt.checkpw(password.encode(), hashed.encode())
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            return bcrypt.checkpw(password.encode(), hashed.encode())
 
     @classmethod
-    def get_unique_referral_code(cls, db: Session) -> str:
-        """Generate a unique referral code that doesn't exist in the database."""
-        while True:
-            code = cls.generate_referral_code()
-            existing = db.query(User).filter_by(referral_code=code).first()
-            if not existing:
-                return code
+    def resolve_referrer(cls, db: Session, referral_code: str) -> int:
+        """Return the id of the user owning a referral code, served from cache when possible."""
+        user_id = referral_code_cache.get(referral_code, _NOT_CACHED)
+        if user_id is _NOT_CACHED:
+            user_id = db.query(User.id).filter_by(referral_code=referral_code).scalar()
+            if user_id is None:
+                referral_code_cache.set(referral_code, None, ttl=settings.referral_negative_cache_ttl_seconds)
+            else:
+                referral_code_cache.set(referral_code, user_id)
+
+        if user_id is None:
+            raise HTTPException(status_code=400, detail="Invalid referral code")
+        return user_id
+
+    @classmethod
+    def insert_user_with_referral_code(cls, db: Session, **values) -> User:
+        """Insert a user with a freshly generated referral code.
+
+        Each attempt is a single INSERT ... ON CONFLICT (referral_code) DO NOTHING,
+        so a code collision returns no row instead of needing a lookup beforehand.
+        Other conflicts (e.g. phone number) still raise IntegrityError.
+        """
+        for _ in range(REFERRAL_CODE_ATTEMPTS):
+            stmt = (
+                pg_insert(User)
+                .values(referral_code=cls.generate_referral_code(), **values)
+                .on_conflict_do_nothing(index_elements=[User.referral_code])
+                .returning(User)
+            )
+            user = db.scalars(stmt).first()
+            if user is not None:
+                return user
+
+        raise HTTPException(status_code=500, detail="Could not allocate a referral code")
 
     @classmethod
     def register_user(cls, db: Session, user_data: UserRegister) -> User:
         password_hash = cls.hash_password(user_data.password)
-        referral_code = cls.get_unique_referral_code(db)
 
         referred_by_user_id = None
         if user_data.referral_code:
-            referrer = db.query(User).filter_by(referral_code=user_data.referral_code).first()
-            if not referrer:
-                raise HTTPException(status_code=400, detail="Invalid referral code")
-            referred_by_user_id = referrer.id
+            referred_by_user_id = cls.resolve_referrer(db, user_data.referral_code)
 
         try:
-            new_user = User(
+            new_user = cls.insert_user_with_referral_code(
+                db,
                 phone_number=user_data.phone_number,
                 password_hash=password_hash,
-                referral_code=referral_code,
                 referred_by_code=user_data.referral_code,
                 referred_by_user_id=referred_by_user_id
             )
-            db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
-
-            new_user_id = new_user.id
 
-            # Create team member relationship if referred
+            # Create team member relationships if referred
             if referred_by_user_id:
-                # Direct referral (level 1)
-                team_member = TeamMember(
-                    parent_user_id=referred_by_user_id,
-                    child_user_id=new_user_id,
-                    level=1
-                )
-                db.add(team_member)
-
-                # Get parent's referrers for indirect relationships
-                parents = db.query(TeamMember).filter_by(child_user_id=referred_by_user_id).order_by(TeamMember.level).all()
-
-                for parent in parents:
-                    new_level = parent.level + 1
-                    indirect_team_member = TeamMember(
-                        parent_user_id=parent.parent_user_id,
-                        child_user_id=new_user_id,
-                        level=new_level
-                    )
-                    db.add(indirect_team_member)
-
-                db.commit()
+                team_service.link_to_referrer(db, new_user.id, referred_by_user_id)
+
+            lookup_service.announce_user(db, new_user)
+            db.commit()
+            db.refresh(new_user)
 
+            referral_code_cache.set(new_user.referral_code, new_user.id)
             return new_user
         except IntegrityError:
             db.rollback()
@@ -108,6 +125,8 @@ class AuthService:
             raise HTTPException(status_code=400, detail="Account is blocked")
 
         access_token = create_access_token(data={"sub": str(user.id), "role": "user"})
+        refresh_token = token_service.issue_refresh_token(db, "user", user.id)
+        db.commit()
         
         user_profile = UserProfile(
             id=user.id,
@@ -120,9 +139,9 @@ class AuthService:
             wallet_balance=float(user.wallet_balance),
             total_deposited=float(user.total_deposited),
             total_withdrawn=float(user.total_withdrawn),
-            total_commission_earned=float(user.total_commission_earned),
-            team_size=0,  # Will be calculated if needed
-            total_commission=0.0,  # Will be calculated if needed
+            total_commission_earned=float(user.total_commission_earned or 0),
+            team_size=user.team_size or 0,
+            total_commission=float(user.total_commission_earned or 0),
             referral_code=user.referral_code,
             is_upi_bound=user.is_upi_bound,
             is_active=user.is_active,
@@ -131,6 +150,7 @@ class AuthService:
         
         return TokenResponse(
             access_token=access_token,
+            refresh_token=refresh_token,
             token_type="bearer",
             user=user_profile
         )
@@ -171,6 +191,8 @@ class AuthService:
                 raise HTTPException(status_code=400, detail="Account is inactive")
 
             access_token = create_access_token(data={"sub": str(admin.id), "role": admin.role})
+            refresh_token = token_service.issue_refresh_token(db, "admin", admin.id)
+            db.commit()
             
             admin_profile = AdminProfile(
                 id=admin.id,
@@ -183,6 +205,7 @@ class AuthService:
             
             return AdminTokenResponse(
                 access_token=access_token,
+                refresh_token=refresh_token,
                 token_type="bearer",
                 admin=admin_profile
             )
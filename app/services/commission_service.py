@@ -0,0 +1,116 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select, update, case, func, literal, BigInteger, Integer, String, DateTime, DECIMAL
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.commission import Commission
+from app.models.team import TeamMember
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.schemas.settings import PlatformSettings
+from app.services.settings_service import settings_service
+from app.services.outbox_service import outbox_service
+
+DEPOSIT_APPROVED_EVENT = "deposit_approved"
+
+
+class CommissionService:
+    @staticmethod
+    def get_level_percents(platform_settings: PlatformSettings) -> List[Decimal]:
+        """Commission percent per referral level, index 0 being level 1.
+
+        Uses the commission_level_percents setting (a JSON list such as
+        [5, 2, 1]) when it is set, otherwise commission_percent for direct
+        referrers only.
+        """
+        if platform_settings.commission_level_percents:
+            try:
+                level_percents = [Decimal(str(p)) for p in json.loads(platform_settings.commission_level_percents)]
+                if level_percents:
+                    return level_percents
+            except (json.JSONDecodeError, TypeError, ValueError, ArithmeticError):
+                pass
+        if platform_settings.commission_percent > 0:
+            return [platform_settings.commission_percent]
+        return []
+
+    @staticmethod
+    def credit_deposit(db: Session, transaction_id: int, level_percents: Optional[List[Decimal]] = None) -> int:
+        """Credit commissions to every ancestor of an approved deposit's user.
+
+        The commission rows for all levels are inserted by one INSERT ... SELECT
+        over team_members, and the same statement credits the amounts to the
+        referrers' wallet_balance (so they can be withdrawn, like an approved
+        deposit) and bumps their total_commission_earned counter through a
+        data-modifying CTE. Re-running it for the same
+        transaction is a no-op.
+        Returns the number of referrers credited.
+        """
+        transaction = db.query(Transaction.user_id, Transaction.net_inr_amount).filter(
+            Transaction.id == transaction_id,
+            Transaction.type == 'crypto_deposit',
+            Transaction.status == 'approved'
+        ).first()
+        if not transaction or not transaction.net_inr_amount:
+            return 0
+
+        if level_percents is None:
+            level_percents = CommissionService.get_level_percents(settings_service.get_platform_settings(db))
+        percents = {level: percent for level, percent in enumerate(level_percents, start=1) if percent > 0}
+        if not percents:
+            return 0
+
+        base_amount = literal(transaction.net_inr_amount, DECIMAL(15, 2))
+        percent = case(percents, value=TeamMember.level)
+        commissions = Commission.__table__
+        users = User.__table__
+
+        source = select(
+            TeamMember.parent_user_id,
+            literal(transaction.user_id, BigInteger),
+            literal(transaction_id, BigInteger),
+            TeamMember.level,
+            percent,
+            base_amount,
+            func.round(base_amount * percent / 100, 2),
+            literal('credited', String),
+            literal(datetime.utcnow(), DateTime),
+        ).where(
+            TeamMember.child_user_id == transaction.user_id,
+            TeamMember.level.in_(list(percents))
+        )
+
+        inserted = (
+            pg_insert(commissions)
+            .from_select(
+                ["referrer_user_id", "referred_user_id", "transaction_id", "level", "commission_percent",
+                 "base_amount", "commission_amount", "status", "credited_at"],
+                source
+            )
+            .on_conflict_do_nothing(index_elements=["transaction_id", "referrer_user_id"])
+            .returning(commissions.c.referrer_user_id, commissions.c.commission_amount)
+            .cte("inserted")
+        )
+
+        result = db.execute(
+            update(users)
+            .where(users.c.id == inserted.c.referrer_user_id)
+            .values(
+                wallet_balance=func.coalesce(users.c.wallet_balance, 0) + inserted.c.commission_amount,
+                total_commission_earned=func.coalesce(users.c.total_commission_earned, 0) + inserted.c.commission_amount,
+            )
+            .add_cte(inserted)
+        )
+        return result.rowcount
+
+    @classmethod
+    def handle_deposit_approved(cls, db: Session, payload: Dict[str, Any]) -> None:
+        cls.credit_deposit(db, payload["transaction_id"])
+
+
+outbox_service.register_handler(DEPOSIT_APPROVED_EVENT, CommissionService.handle_deposit_approved)
+
+commission_service = CommissionService()
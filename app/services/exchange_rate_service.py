@@ -0,0 +1,136 @@
+import asyncio
+import bisect
+import threading
+from array import array
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.utils import to_ist_string
+from app.db.database import get_db_context
+from app.models.exchange_rate import ExchangeRate
+from app.services.notification_service import notification_service
+
+RATE_CHANNEL = "exchange_rate"
+RATE_SETTING_KEY = "usdt_to_inr_rate"
+
+
+def _timestamp(dt: datetime) -> float:
+    # Naive datetimes are UTC, as stored in the database
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class ExchangeRateService:
+    """Rate at any point in time, from an in-memory copy of exchange_rate_history.
+
+    The history is kept as a sorted array of effective_at timestamps next to
+    a list of rates, so "rate at T" is one bisect. It is loaded at startup
+    and each new rate is published over the broker when its transaction
+    commits; every worker appends it and pushes it to its connected
+    WebSocket clients.
+    """
+
+    def __init__(self):
+        self._times = array("d")
+        self._rates: List[Decimal] = []
+        self._effective_at: List[datetime] = []
+        self._ids = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def load(self, db: Session) -> None:
+        rows = db.query(ExchangeRate.id, ExchangeRate.rate, ExchangeRate.effective_at).order_by(
+            ExchangeRate.effective_at, ExchangeRate.id
+        ).all()
+        times = array("d", (_timestamp(row.effective_at) for row in rows))
+        with self._lock:
+            self._times = times
+            self._rates = [row.rate for row in rows]
+            self._effective_at = [row.effective_at for row in rows]
+            self._ids = {row.id for row in rows}
+
+    def reload(self) -> None:
+        with get_db_context() as db:
+            self.load(db)
+
+    def warm(self) -> None:
+        self.reload()
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Follow rate changes from other workers; `loop` runs the WebSocket pushes."""
+        self._loop = loop
+        broker.subscribe(RATE_CHANNEL, self.apply)
+        # Changes announced while the listener was disconnected were missed
+        broker.add_reconnect_hook(self.reload)
+
+    def _insert(self, id_: int, rate: Decimal, effective_at: datetime) -> bool:
+        timestamp = _timestamp(effective_at)
+        with self._lock:
+            if id_ in self._ids:
+                return False
+            # Rows normally arrive in order, so this is an append
+            i = bisect.bisect_right(self._times, timestamp)
+            self._times.insert(i, timestamp)
+            self._rates.insert(i, rate)
+            self._effective_at.insert(i, effective_at)
+            self._ids.add(id_)
+            return True
+
+    def apply(self, message: dict) -> None:
+        """Broker handler: record a committed rate change and push it to WebSocket clients."""
+        effective_at = datetime.fromisoformat(message["effective_at"])
+        if not self._insert(message["id"], Decimal(message["rate"]), effective_at):
+            return
+        if self._loop is not None:
+            update = {"type": "exchange_rate_updated", "rate": message["rate"], "effective_at": to_ist_string(effective_at)}
+            self._loop.call_soon_threadsafe(lambda: self._loop.create_task(notification_service.broadcast_to_all(update)))
+
+    def rate_at(self, when: datetime) -> Optional[Tuple[Decimal, datetime]]:
+        """(rate, effective_at) in force at `when`, or None before the first recorded rate."""
+        timestamp = _timestamp(when)
+        with self._lock:
+            i = bisect.bisect_right(self._times, timestamp) - 1
+            if i < 0:
+                return None
+            return self._rates[i], self._effective_at[i]
+
+    def current(self) -> Optional[Tuple[Decimal, datetime]]:
+        with self._lock:
+            if not self._rates:
+                return None
+            return self._rates[-1], self._effective_at[-1]
+
+    @staticmethod
+    def record_change(db: Session, value: str, admin_id: Optional[int]) -> Optional[ExchangeRate]:
+        """Append `value` to the history if it differs from the latest rate; published when `db` commits."""
+        try:
+            rate = Decimal(value).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise HTTPException(status_code=400, detail="usdt_to_inr_rate must be a number")
+        if rate <= 0:
+            raise HTTPException(status_code=400, detail="usdt_to_inr_rate must be greater than 0")
+
+        latest = db.query(ExchangeRate).order_by(ExchangeRate.effective_at.desc(), ExchangeRate.id.desc()).first()
+        if latest is not None and latest.rate == rate:
+            return None
+
+        entry = ExchangeRate(rate=rate, effective_at=datetime.utcnow(), changed_by_admin_id=admin_id)
+        db.add(entry)
+        db.flush()
+        broker.publish(db, RATE_CHANNEL, ExchangeRateService.message(entry))
+        return entry
+
+    @staticmethod
+    def message(entry: ExchangeRate) -> dict:
+        return {"id": entry.id, "rate": str(entry.rate), "effective_at": entry.effective_at.isoformat()}
+
+
+exchange_rate_service = ExchangeRateService()
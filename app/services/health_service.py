@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app.core.broker import broker
+from app.core.config import settings
+from app.db.database import engine
+from app.schemas.health import HealthCheck, ReadinessResponse
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL_SECONDS = 0.5
+
+
+class HealthService:
+    """Readiness checks for the load balancer.
+
+    The result is cached for health_cache_ttl_seconds so frequent probes do
+    not each cost a database round trip.
+    """
+
+    def __init__(self):
+        self.loop_lag: Optional[float] = None
+        self._cached: Optional[ReadinessResponse] = None
+        self._cached_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def ping_database() -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    def check_pool() -> HealthCheck:
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return HealthCheck(ok=True, detail=f"{type(pool).__name__} has no size limit")
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        utilization = pool.checkedout() / capacity if capacity else 0.0
+        return HealthCheck(
+            ok=utilization < settings.health_max_pool_utilization,
+            detail=f"{pool.checkedout()}/{capacity} connections checked out",
+            value=round(utilization, 3)
+        )
+
+    async def check_database(self, pool: HealthCheck) -> HealthCheck:
+        # A saturated pool would block the ping for pool_timeout seconds
+        if not pool.ok:
+            return HealthCheck(ok=False, detail="skipped, pool saturated")
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.to_thread(self.ping_database), timeout=settings.health_db_timeout_seconds)
+        except asyncio.TimeoutError:
+            return HealthCheck(ok=False, detail="timed out")
+        except Exception as e:
+            return HealthCheck(ok=False, detail=str(e)[:200])
+        return HealthCheck(ok=True, value=round((time.perf_counter() - started) * 1000, 2))
+
+    @staticmethod
+    def check_broker() -> HealthCheck:
+        if not broker.running:
+            return HealthCheck(ok=True, detail="not started")
+        if broker.connected:
+            return HealthCheck(ok=True)
+        return HealthCheck(ok=False, detail=broker.last_error or "connecting")
+
+    def check_event_loop(self) -> HealthCheck:
+        if self.loop_lag is None:
+            return HealthCheck(ok=True, detail="not measured yet")
+        lag_ms = self.loop_lag * 1000
+        return HealthCheck(ok=lag_ms < settings.health_max_loop_lag_ms, value=round(lag_ms, 2))
+
+    async def readiness(self) -> ReadinessResponse:
+        async with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < settings.health_cache_ttl_seconds:
+                return self._cached
+
+            pool = self.check_pool()
+            checks = {
+                "database": await self.check_database(pool),
+                "pool": pool,
+                "broker": self.check_broker(),
+                "event_loop": self.check_event_loop(),
+            }
+            ready = all(check.ok for check in checks.values())
+            self._cached = ReadinessResponse(status="ready" if ready else "not_ready", checks=checks)
+            self._cached_at = time.monotonic()
+            if not ready:
+                logger.warning("Readiness check failed: %s", self._cached.model_dump_json())
+            return self._cached
+
+    async def monitor_loop_lag(self, stop_event: asyncio.Event):
+        """Measure how late the event loop wakes up from a short sleep."""
+        loop = asyncio.get_running_loop()
+        while not stop_event.is_set():
+            started = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+            self.loop_lag = max(loop.time() - started - LOOP_LAG_INTERVAL_SECONDS, 0.0)
+
+
+health_service = HealthService()
@@ -0,0 +1,299 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.database import engine, CONNECT_ARGS
+from app.models.user import User
+from app.models.transaction import Transaction
+
+COPY_BATCH_ROWS = 50000
+INDEX_BUILD_MEMORY = "512MB"
+
+USER_COLUMNS = (
+    "phone_number", "password_hash", "referral_code", "referred_by_code", "name", "email",
+    "wallet_balance", "total_deposited", "total_withdrawn", "total_commission_earned", "total_usd_sent",
+    "upi_id", "upi_holder_name", "bank_name", "is_upi_bound",
+    "account_number", "ifsc_code", "account_holder_name", "is_bank_bound",
+    "is_active", "is_blocked", "created_at", "updated_at", "last_login_at",
+)
+TRANSACTION_COLUMNS = (
+    "transaction_uid", "user_id", "user_phone_number", "type", "status",
+    "crypto_network", "crypto_wallet_address", "crypto_amount", "remaining_crypto", "crypto_tx_hash",
+    "screenshot_url", "user_notes", "exchange_rate", "platform_fee_percent", "platform_fee_amount",
+    "bonus_percent", "bonus_amount", "gross_inr_amount", "net_inr_amount", "user_upi_id", "user_bank_name",
+    "admin_notes", "rejection_reason", "payment_reference", "payment_completed_at", "created_at", "updated_at",
+)
+
+# Closure rows for every imported user, walking referred_by_user_id up to the
+# root. The path array stops cycles in legacy data from recursing forever.
+TEAM_CLOSURE_SQL = """
+WITH RECURSIVE chain(child_user_id, parent_user_id, level, path) AS (
+    SELECT u.id, u.referred_by_user_id, 1, ARRAY[u.id]
+    FROM users u JOIN import_users s ON s.id = u.id
+    WHERE u.referred_by_user_id IS NOT NULL
+  UNION ALL
+    SELECT c.child_user_id, p.referred_by_user_id, c.level + 1, c.path || p.id
+    FROM chain c JOIN users p ON p.id = c.parent_user_id
+    WHERE p.referred_by_user_id IS NOT NULL
+      AND NOT p.referred_by_user_id = ANY(c.path)
+      AND (%(max_depth)s = 0 OR c.level < %(max_depth)s)
+), inserted AS (
+    INSERT INTO team_members (parent_user_id, child_user_id, level)
+    SELECT parent_user_id, child_user_id, level FROM chain
+    ON CONFLICT (parent_user_id, child_user_id) DO NOTHING
+    RETURNING parent_user_id
+), team_sizes AS (
+    UPDATE users u SET team_size = u.team_size + n.members
+    FROM (SELECT parent_user_id, count(*) AS members FROM inserted GROUP BY parent_user_id) n
+    WHERE u.id = n.parent_user_id
+)
+SELECT count(*) FROM inserted
+"""
+
+# Folds the rows of an `inserted` CTE into user_transaction_stats (months in IST)
+TRANSACTION_STATS_SQL = """
+INSERT INTO user_transaction_stats AS t (user_id, month, type, status, count, crypto_amount, gross_inr_amount, net_inr_amount)
+SELECT user_id, CAST(date_trunc('month', created_at + interval '5 hours 30 minutes') AS date), type, status,
+       count(*), COALESCE(sum(crypto_amount), 0), COALESCE(sum(gross_inr_amount), 0), COALESCE(sum(net_inr_amount), 0)
+FROM inserted
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (user_id, month, type, status) DO UPDATE SET
+    count = t.count + excluded.count,
+    crypto_amount = t.crypto_amount + excluded.crypto_amount,
+    gross_inr_amount = t.gross_inr_amount + excluded.gross_inr_amount,
+    net_inr_amount = t.net_inr_amount + excluded.net_inr_amount
+"""
+
+
+def _python_defaults(table) -> Dict[str, Any]:
+    """Column defaults that only the ORM applies; raw INSERTs would leave NULLs."""
+    return {
+        column.name: column.default.arg
+        for column in table.columns
+        if column.default is not None and column.default.is_scalar and column.server_default is None
+    }
+
+
+class ImportService:
+    """Bulk imports of users and transactions with COPY.
+
+    Rows are streamed into a temporary staging table, then moved into the
+    real table with one INSERT ... SELECT that fills in the ORM-side defaults
+    and resolves references (referral codes, phone numbers). The whole
+    import is one transaction: any bad row rolls everything back.
+    """
+
+    @staticmethod
+    def connect() -> psycopg.Connection:
+        """A dedicated psycopg connection to the primary (COPY bypasses the ORM session)."""
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return psycopg.connect(dsn, **CONNECT_ARGS)
+
+    # Input
+
+    @staticmethod
+    def read_rows(path: str) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+        """Column names and a row iterator for a .csv or .ndjson/.jsonl file."""
+        file = open(path, newline="", encoding="utf-8")
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            reader = csv.DictReader(file)
+            columns = list(reader.fieldnames or [])
+
+            def rows():
+                with file:
+                    for row in reader:
+                        yield {key: (value if value != "" else None) for key, value in row.items()}
+
+            return columns, rows()
+
+        if suffix not in (".ndjson", ".jsonl"):
+            file.close()
+            raise ValueError(f"Unsupported file type {suffix!r}, expected .csv, .ndjson or .jsonl")
+
+        lines = (line for line in file if line.strip())
+        first_line = next(lines, None)
+        if first_line is None:
+            file.close()
+            return [], iter(())
+        first = json.loads(first_line)
+
+        def rows():
+            with file:
+                yield first
+                for line in lines:
+                    yield json.loads(line)
+
+        return list(first), rows()
+
+    @staticmethod
+    def check_columns(columns: Sequence[str], allowed: Sequence[str], required: Sequence[str]) -> List[str]:
+        unknown = [column for column in columns if column not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        missing = [column for column in required if column not in columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        return list(columns)
+
+    @staticmethod
+    def copy_rows(cursor: psycopg.Cursor, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """COPY tuples into `table`; None is written as NULL."""
+        count = 0
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+        return count
+
+    # Index deferral
+
+    @staticmethod
+    @contextmanager
+    def deferred_indexes(cursor: psycopg.Cursor, tables: Sequence[str]):
+        """Drop secondary indexes on `tables` and recreate them afterwards.
+
+        Indexes backing a primary key or unique constraint stay, since the
+        import relies on them. DDL is transactional, so a failed import
+        leaves the indexes in place. The tables stay locked against other
+        writers (and readers) until the import commits, so use this in a
+        maintenance window or on a staging database.
+        """
+        cursor.execute(
+            """
+            SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = ANY(%s::regclass[])
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """,
+            (list(tables),),
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {name}")
+        yield
+        cursor.execute(f"SET LOCAL maintenance_work_mem = '{INDEX_BUILD_MEMORY}'")
+        for _, definition in indexes:
+            # On a partitioned table the definition reads "ON ONLY", which
+            # would create an invalid index without its partition indexes
+            cursor.execute(definition.replace(" ON ONLY ", " ON ", 1))
+
+    # Imports
+
+    @classmethod
+    def import_users(cls, cursor: psycopg.Cursor, columns: Sequence[str], rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Import users, link referrers by referred_by_code and build their team closure rows."""
+        columns = cls.check_columns(columns, USER_COLUMNS, ("phone_number", "password_hash", "referral_code"))
+        report = {}
+
+        cursor.execute("CREATE TEMP TABLE import_users (LIKE users INCLUDING DEFAULTS) ON COMMIT DROP")
+        started = time.perf_counter()
+        report["rows"] = cls.copy_rows(cursor, "import_users", columns, ([row.get(c) for c in columns] for row in rows))
+        report["copy_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        defaults = _python_defaults(User.__table__)
+        target = [column.name for column in User.__table__.columns if column.name not in ("referred_by_user_id",)]
+        values = [
+            f"COALESCE(s.{name}, %(default_{name})s)" if name in defaults else f"s.{name}"
+            for name in target
+        ]
+        cursor.execute(
+            f"INSERT INTO users ({', '.join(target)}) SELECT {', '.join(values)} FROM import_users s",
+            {f"default_{name}": value for name, value in defaults.items()},
+        )
+        # Referrers may be existing users or anywhere in this file
+        cursor.execute(
+            """
+            UPDATE users u SET referred_by_user_id = r.id
+            FROM import_users s, users r
+            WHERE u.id = s.id AND r.referral_code = s.referred_by_code AND r.id <> u.id
+            """
+        )
+        report["linked_referrers"] = cursor.rowcount
+        report["insert_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cursor.execute(TEAM_CLOSURE_SQL, {"max_depth": settings.referral_max_depth})
+        report["team_rows"] = cursor.fetchone()[0]
+        report["team_seconds"] = time.perf_counter() - started
+        return report
+
+    @classmethod
+    def import_transactions(cls, cursor: psycopg.Cursor, columns: Sequence[str], rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Import transactions; the owner is given by user_id or user_phone_number."""
+        columns = cls.check_columns(columns, TRANSACTION_COLUMNS, ("transaction_uid", "type"))
+        if "user_id" not in columns and "user_phone_number" not in columns:
+            raise ValueError("Missing required columns: user_id or user_phone_number")
+        report = {}
+
+        cursor.execute("CREATE TEMP TABLE import_transactions (LIKE transactions INCLUDING DEFAULTS) ON COMMIT DROP")
+        cursor.execute("ALTER TABLE import_transactions ALTER COLUMN user_id DROP NOT NULL, ADD COLUMN user_phone_number varchar(15)")
+        started = time.perf_counter()
+        report["rows"] = cls.copy_rows(cursor, "import_transactions", columns, ([row.get(c) for c in columns] for row in rows))
+        report["copy_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cursor.execute(
+            """
+            UPDATE import_transactions s SET user_id = u.id
+            FROM users u
+            WHERE s.user_id IS NULL AND u.phone_number = s.user_phone_number
+            """
+        )
+        cursor.execute("SELECT transaction_uid, user_phone_number FROM import_transactions WHERE user_id IS NULL LIMIT 5")
+        unmatched = cursor.fetchall()
+        if unmatched:
+            sample = ", ".join(f"{uid} ({phone})" for uid, phone in unmatched)
+            raise ValueError(f"Transactions with no matching user: {sample}")
+
+        defaults = _python_defaults(Transaction.__table__)
+        target = [column.name for column in Transaction.__table__.columns]
+        values = [
+            f"COALESCE(s.{name}, %(default_{name})s)" if name in defaults else f"s.{name}"
+            for name in target
+        ]
+        # Imported rows count towards /transactions/summary like created ones
+        cursor.execute(
+            f"""
+            WITH inserted AS (
+                INSERT INTO transactions ({', '.join(target)}) SELECT {', '.join(values)} FROM import_transactions s
+                RETURNING user_id, created_at, type, status, crypto_amount, gross_inr_amount, net_inr_amount
+            )
+            {TRANSACTION_STATS_SQL}
+            """,
+            {f"default_{name}": value for name, value in defaults.items()},
+        )
+        report["insert_seconds"] = time.perf_counter() - started
+        return report
+
+    @classmethod
+    def run(cls, kind: str, path: str, defer_indexes: bool = True) -> Dict[str, Any]:
+        """Import one file in a single transaction and return timings."""
+        columns, rows = cls.read_rows(path)
+        importer = {"users": cls.import_users, "transactions": cls.import_transactions}[kind]
+        tables = {"users": ["users", "team_members"], "transactions": ["transactions"]}[kind]
+
+        started = time.perf_counter()
+        with cls.connect() as connection, connection.cursor() as cursor:
+            if defer_indexes:
+                with cls.deferred_indexes(cursor, tables):
+                    report = importer(cursor, columns, rows)
+                    index_started = time.perf_counter()
+                report["index_seconds"] = time.perf_counter() - index_started
+            else:
+                report = importer(cursor, columns, rows)
+            cursor.execute(f"ANALYZE {', '.join(tables)}")
+        report["total_seconds"] = time.perf_counter() - started
+        report["rows_per_second"] = report["rows"] / report["total_seconds"] if report["total_seconds"] else 0.0
+        return report
+
+
+import_service = ImportService()
@@ -0,0 +1,327 @@
+import bisect
+import logging
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.config import settings
+from app.db.database import get_db_context
+from app.models.user import User
+from app.models.transaction import Transaction
+from app.schemas.lookup import LookupKind, LookupMatch, LookupResponse, LookupIndexStats
+from app.services.search_service import search_service, PHONE_PATTERN, FULL_PHONE_DIGITS
+
+logger = logging.getLogger(__name__)
+
+LOOKUP_CHANNEL = "lookup_index"
+BUILD_BATCH_SIZE = 50000
+
+
+class _PackedKeys:
+    """Read-only sequence view over keys packed into one buffer, for bisect."""
+
+    __slots__ = ("keys", "offsets")
+
+    def __init__(self, keys: bytes, offsets: array):
+        self.keys = keys
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.keys[self.offsets[i]:self.offsets[i + 1]]
+
+
+class PrefixIndex:
+    """Sorted prefix index of ASCII keys to ids.
+
+    The bulk of the keys live in one packed buffer with uint32 offsets and an
+    int64 id array (roughly len(key) + 12 bytes per entry, versus ~70 bytes for
+    a list of str). The packed part is immutable and swapped on rebuild; keys
+    added afterwards go to a small sorted delta list until the next rebuild.
+    """
+
+    def __init__(self):
+        self._keys = bytes()
+        self._offsets = array("I", [0])
+        self._ids = array("q")
+        self._delta: List[Tuple[bytes, int]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_sorted(cls, rows: Iterable[Tuple[str, int]]) -> "PrefixIndex":
+        """Build from (key, id) rows already sorted bytewise by key."""
+        index = cls()
+        keys = bytearray()
+        for key, id_ in rows:
+            keys += key.encode()
+            index._offsets.append(len(keys))
+            index._ids.append(id_)
+        index._keys = bytes(keys)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._delta)
+
+    @property
+    def delta_size(self) -> int:
+        return len(self._delta)
+
+    def _main_range(self, prefix: bytes):
+        view = _PackedKeys(self._keys, self._offsets)
+        i = bisect.bisect_left(view, prefix)
+        while i < len(view):
+            key = view[i]
+            if not key.startswith(prefix):
+                return
+            yield key, self._ids[i]
+            i += 1
+
+    def _delta_range(self, prefix: bytes):
+        i = bisect.bisect_left(self._delta, (prefix,))
+        while i < len(self._delta) and self._delta[i][0].startswith(prefix):
+            yield self._delta[i]
+            i += 1
+
+    def _in_main(self, key: bytes, id_: int) -> bool:
+        view = _PackedKeys(self._keys, self._offsets)
+        i = bisect.bisect_left(view, key)
+        while i < len(view) and view[i] == key:
+            if self._ids[i] == id_:
+                return True
+            i += 1
+        return False
+
+    def add(self, key: str, id_: int) -> None:
+        """Add a key; adding an existing (key, id) pair is a no-op."""
+        encoded = key.encode()
+        with self._lock:
+            if self._in_main(encoded, id_):
+                return
+            i = bisect.bisect_left(self._delta, (encoded, id_))
+            if i < len(self._delta) and self._delta[i] == (encoded, id_):
+                return
+            self._delta.insert(i, (encoded, id_))
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Return up to `limit` (key, id) pairs whose key starts with `prefix`, in key order."""
+        encoded = prefix.encode()
+        with self._lock:
+            matches = []
+            for key, id_ in self._main_range(encoded):
+                if len(matches) >= limit:
+                    break
+                matches.append((key, id_))
+            for key, id_ in self._delta_range(encoded):
+                if len(matches) >= 2 * limit:
+                    break
+                matches.append((key, id_))
+        matches.sort()
+        return [(key.decode(), id_) for key, id_ in matches[:limit]]
+
+    def memory_bytes(self) -> int:
+        delta = sys.getsizeof(self._delta) + sum(
+            sys.getsizeof(item) + sys.getsizeof(item[0]) + sys.getsizeof(item[1]) for item in self._delta
+        )
+        return sys.getsizeof(self._keys) + sys.getsizeof(self._offsets) + sys.getsizeof(self._ids) + delta
+
+
+class LookupService:
+    """In-process typeahead index over phone numbers, referral codes and transaction UIDs.
+
+    Each worker builds the index at startup from Postgres (rows come back
+    already normalised and sorted, so the build streams straight into the
+    packed arrays). New users and transactions are announced with pg_notify
+    in the inserting transaction and applied by every worker when the broker
+    delivers them. Until the first build finishes, lookups fall back to the
+    database prefix search.
+    """
+
+    def __init__(self):
+        self.indexes: Dict[LookupKind, PrefixIndex] = {kind: PrefixIndex() for kind in LookupKind}
+        self.ready = False
+        self.built_at: Optional[datetime] = None
+        self.build_seconds: Optional[float] = None
+        self._building = False
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_phone(phone_number: str) -> str:
+        return "".join(ch for ch in phone_number if ch.isdigit())
+
+    # Building
+
+    @classmethod
+    def load_indexes(cls, db: Session) -> Dict[LookupKind, PrefixIndex]:
+        """Read all keys from the database, sorted bytewise (COLLATE "C") by Postgres."""
+        phone = func.regexp_replace(User.phone_number, r"\D", "", "g")
+        statements = {
+            LookupKind.PHONE: select(phone, User.id).order_by(phone.collate("C"), User.id),
+            LookupKind.REFERRAL_CODE: select(User.referral_code, User.id).order_by(User.referral_code.collate("C")),
+            LookupKind.TRANSACTION_UID: select(Transaction.transaction_uid, Transaction.id).order_by(
+                Transaction.transaction_uid.collate("C")
+            ),
+        }
+        return {
+            kind: PrefixIndex.from_sorted(db.execute(stmt.execution_options(yield_per=BUILD_BATCH_SIZE)))
+            for kind, stmt in statements.items()
+        }
+
+    def rebuild(self) -> None:
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            self._pending = []
+
+        started = time.perf_counter()
+        try:
+            with get_db_context() as db:
+                indexes = self.load_indexes(db)
+        except Exception:
+            logger.exception("Building the lookup index failed")
+            with self._lock:
+                self._building = False
+            return
+
+        with self._lock:
+            self.indexes = indexes
+            pending, self._pending = self._pending, []
+            self._building = False
+            self.ready = True
+            self.built_at = datetime.utcnow()
+            self.build_seconds = time.perf_counter() - started
+
+        # Apply changes that were announced while the snapshot was being read
+        for message in pending:
+            self.apply(message)
+        logger.info("Lookup index built in %.1fs (%d keys)", self.build_seconds, sum(len(i) for i in indexes.values()))
+
+    def rebuild_async(self) -> None:
+        threading.Thread(target=self.rebuild, name="lookup-index-build", daemon=True).start()
+
+    def start(self) -> None:
+        """Subscribe to index updates and build the index in the background."""
+        broker.subscribe(LOOKUP_CHANNEL, self.apply)
+        # Updates sent while the listener was disconnected are lost, so start over
+        broker.add_reconnect_hook(self.rebuild_async)
+        self.rebuild_async()
+
+    # Updates
+
+    def apply(self, message: dict) -> None:
+        with self._lock:
+            if self._building:
+                self._pending.append(message)
+                return
+            indexes = self.indexes
+
+        kind = LookupKind(message["kind"])
+        indexes[kind].add(message["key"], message["id"])
+        if indexes[kind].delta_size > settings.lookup_delta_max:
+            self.rebuild_async()
+
+    @classmethod
+    def announce_user(cls, db: Session, user: User) -> None:
+        """Publish a new user's phone number and referral code; delivered when `db` commits."""
+        if not settings.lookup_index_enabled:
+            return
+        broker.publish(db, LOOKUP_CHANNEL, {"kind": LookupKind.PHONE.value, "key": cls.normalize_phone(user.phone_number), "id": user.id})
+        broker.publish(db, LOOKUP_CHANNEL, {"kind": LookupKind.REFERRAL_CODE.value, "key": user.referral_code, "id": user.id})
+
+    @staticmethod
+    def announce_transaction(db: Session, transaction: Transaction) -> None:
+        """Publish a new transaction UID; delivered when `db` commits."""
+        if not settings.lookup_index_enabled:
+            return
+        if transaction.id is None:
+            db.flush()
+        broker.publish(db, LOOKUP_CHANNEL, {"kind": LookupKind.TRANSACTION_UID.value, "key": transaction.transaction_uid, "id": transaction.id})
+
+    # Queries
+
+    @classmethod
+    def candidates(cls, query: str) -> List[Tuple[LookupKind, str]]:
+        """Which indexes to search, and with which normalised prefix."""
+        if PHONE_PATTERN.match(query):
+            digits = query.lstrip("+")
+            candidates = [(LookupKind.PHONE, digits)]
+            if len(digits) <= FULL_PHONE_DIGITS:
+                candidates.append((LookupKind.PHONE, "91" + digits))
+            candidates.append((LookupKind.REFERRAL_CODE, digits))
+            return candidates
+        upper = query.upper()
+        return [(LookupKind.REFERRAL_CODE, upper), (LookupKind.TRANSACTION_UID, upper)]
+
+    def search_index(self, query: str, limit: int) -> List[LookupMatch]:
+        matches = []
+        seen = set()
+        for kind, prefix in self.candidates(query):
+            for key, id_ in self.indexes[kind].search(prefix, limit):
+                if (kind, id_) in seen:
+                    continue
+                seen.add((kind, id_))
+                matches.append(LookupMatch(kind=kind, value=key, id=id_))
+                if len(matches) >= limit:
+                    return matches
+        return matches
+
+    @classmethod
+    def search_database(cls, db: Session, query: str, limit: int) -> List[LookupMatch]:
+        """Prefix search in Postgres, used until the in-memory index is ready."""
+        matches = []
+        for kind, prefix in cls.candidates(query):
+            pattern = search_service.escape_like(prefix) + "%"
+            if kind == LookupKind.PHONE:
+                rows = (
+                    db.query(User.phone_number, User.id)
+                    .filter(or_(User.phone_number.like(pattern, escape="\\"), User.phone_number.like("+" + pattern, escape="\\")))
+                    .limit(limit)
+                    .all()
+                )
+            elif kind == LookupKind.REFERRAL_CODE:
+                rows = db.query(User.referral_code, User.id).filter(User.referral_code.like(pattern, escape="\\")).limit(limit).all()
+            else:
+                rows = (
+                    db.query(Transaction.transaction_uid, Transaction.id)
+                    .filter(Transaction.transaction_uid.like(pattern, escape="\\"))
+                    .limit(limit)
+                    .all()
+                )
+            for value, id_ in rows:
+                if kind == LookupKind.PHONE:
+                    value = cls.normalize_phone(value)
+                if any(m.kind == kind and m.id == id_ for m in matches):
+                    continue
+                matches.append(LookupMatch(kind=kind, value=value, id=id_))
+                if len(matches) >= limit:
+                    return matches
+        return matches
+
+    def lookup(self, db: Session, query: str, limit: int = 10) -> LookupResponse:
+        query = query.strip()
+        if self.ready and settings.lookup_index_enabled:
+            return LookupResponse(query=query, matches=self.search_index(query, limit), source="index")
+        return LookupResponse(query=query, matches=self.search_database(db, query, limit), source="database")
+
+    def stats(self) -> LookupIndexStats:
+        memory = {kind.value: index.memory_bytes() for kind, index in self.indexes.items()}
+        return LookupIndexStats(
+            ready=self.ready,
+            built_at=self.built_at,
+            build_seconds=self.build_seconds,
+            entries={kind.value: len(index) for kind, index in self.indexes.items()},
+            memory_bytes=memory,
+            total_memory_bytes=sum(memory.values())
+        )
+
+
+lookup_service = LookupService()
@@ -2,6 +2,8 @@ from typing import List, Dict, Any
 import asyncio
 from fastapi import WebSocket
 
+from app.core.metrics import WEBSOCKET_CONNECTIONS
+
 class NotificationService:
     _user_connections: Dict[int, List[WebSocket]] = {}
     _admin_connections: List[WebSocket] = []
@@ -70,4 +72,32 @@ class NotificationService:
             # No running event loop, notifications will be skipped
             pass
 
+    @classmethod
+    async def broadcast_to_all(cls, message: Dict[str, Any]):
+        """Broadcast to every connected client, admins and users."""
+        await cls.broadcast_to_admins(message)
+        for user_id in list(cls._user_connections):
+            await cls.broadcast_to_user(user_id, message)
+
+    @classmethod
+    async def close_all(cls, code: int = 1012, reason: str = "Server restarting"):
+        """Tell every connected client to reconnect and close its socket (1012 = service restart)."""
+        connections = list(cls._admin_connections)
+        for user_connections in cls._user_connections.values():
+            connections.extend(user_connections)
+        cls._admin_connections.clear()
+        cls._user_connections.clear()
+
+        for connection in connections:
+            try:
+                await connection.send_json({"type": "server_shutdown", "message": reason})
+                await connection.close(code=code, reason=reason)
+            except:
+                pass
+
+WEBSOCKET_CONNECTIONS.labels("admin").set_function(lambda: len(NotificationService._admin_connections))
+WEBSOCKET_CONNECTIONS.labels("user").set_function(
+    lambda: sum(len(connections) for connections in NotificationService._user_connections.values())
+)
+
 notification_service = NotificationService()
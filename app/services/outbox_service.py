@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db_context
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """Transactional outbox for work that should not slow down the request path.
+
+    Events are inserted in the same transaction as the change that causes them
+    and processed later by a background worker, one handler per event type.
+    """
+
+    _handlers: Dict[str, Callable[[Session, Dict[str, Any]], None]] = {}
+
+    @classmethod
+    def register_handler(cls, event_type: str, handler: Callable[[Session, Dict[str, Any]], None]):
+        cls._handlers[event_type] = handler
+
+    @staticmethod
+    def enqueue(db: Session, event_type: str, payload: Dict[str, Any]) -> OutboxEvent:
+        """Add an event to the outbox. It is committed together with the caller's transaction."""
+        event = OutboxEvent(event_type=event_type, payload=payload, status='pending', attempts=0)
+        db.add(event)
+        return event
+
+    @classmethod
+    def process_batch(cls, db: Session, limit: Optional[int] = None) -> int:
+        """Process up to `limit` due events and return how many were handled.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED so several workers can
+        drain the outbox concurrently. Each event runs in a savepoint; a
+        failing handler is retried with backoff until outbox_max_attempts.
+        """
+        limit = limit or settings.outbox_batch_size
+        now = datetime.utcnow()
+
+        events = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.status == 'pending', OutboxEvent.available_at <= now)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for event in events:
+            handler = cls._handlers.get(event.event_type)
+            try:
+                if handler is None:
+                    raise ValueError(f"No handler registered for outbox event '{event.event_type}'")
+                with db.begin_nested():
+                    handler(db, event.payload)
+                event.status = 'processed'
+                event.processed_at = datetime.utcnow()
+            except Exception as e:
+                logger.exception("Outbox event %s (%s) failed", event.id, event.event_type)
+                event.attempts += 1
+                event.last_error = str(e)
+                if event.attempts >= settings.outbox_max_attempts:
+                    event.status = 'failed'
+                else:
+                    event.available_at = datetime.utcnow() + timedelta(seconds=2 ** event.attempts)
+
+        db.commit()
+        return len(events)
+
+    @classmethod
+    def process_pending(cls) -> int:
+        with get_db_context() as db:
+            return cls.process_batch(db)
+
+    @classmethod
+    async def run_worker(cls, stop_event: asyncio.Event):
+        """Drain the outbox until stop_event is set, sleeping when it is empty."""
+        while not stop_event.is_set():
+            try:
+                processed = await asyncio.to_thread(cls.process_pending)
+            except Exception:
+                logger.exception("Outbox worker iteration failed")
+                processed = 0
+
+            if processed < settings.outbox_batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=settings.outbox_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+
+outbox_service = OutboxService()
@@ -0,0 +1,187 @@
+import asyncio
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.db.database import engine
+from app.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("transactions", "activity_logs", "notifications")
+
+# Advisory lock id shared by every worker running partition maintenance
+MAINTENANCE_LOCK_KEY = 731_4902
+
+PARTITIONS_SQL = text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(:table AS regclass)
+""")
+PARTITION_NAME = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionService:
+    """Monthly range partitions on created_at.
+
+    transactions, activity_logs and notifications are partitioned by month,
+    so queries filtering on created_at (dashboard charts, activity log date
+    ranges) only scan the months they cover, and old months can be archived
+    by detaching whole partitions instead of running large DELETEs.
+
+    Each table has one partition per month, named <table>_YYYY_MM, plus
+    <table>_default, which catches rows outside every month.
+    ensure_partitions() keeps partition_months_ahead future months created,
+    so the default partition normally stays empty. If rows did land there,
+    they are moved into their month's partition when it is created.
+    """
+
+    @staticmethod
+    def partition_name(table: str, month: date) -> str:
+        return f"{table}_{month:%Y_%m}"
+
+    @staticmethod
+    def is_partitioned(connection: Connection, table: str) -> bool:
+        kind = connection.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+        ).scalar()
+        return kind == "p"
+
+    @staticmethod
+    def partitions(connection: Connection, table: str) -> List[Tuple[str, date]]:
+        """Monthly partitions of `table` as (name, first day of month), oldest first."""
+        months = []
+        for name in connection.execute(PARTITIONS_SQL, {"table": table}).scalars():
+            match = PARTITION_NAME.search(name)
+            if match:
+                months.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(months, key=lambda partition: partition[1])
+
+    @classmethod
+    def create_partition(cls, connection: Connection, table: str, month: date) -> Optional[str]:
+        """Create `table`'s partition for `month` unless it exists; returns its name if created."""
+        name = cls.partition_name(table, month)
+        if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            return None
+        bounds = {"start": month, "end": add_months(month, 1)}
+        connection.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        # Attaching fails while the default partition holds rows of this month
+        connection.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM {table}_default WHERE created_at >= :start AND created_at < :end RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """),
+            bounds,
+        )
+        connection.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')")
+        )
+        return name
+
+    @classmethod
+    def ensure_partitions(cls, months_ahead: Optional[int] = None) -> List[str]:
+        """Create any missing partitions from this month to `months_ahead` months out.
+
+        Workers race for a transaction-level advisory lock; the losers return
+        straight away. Returns the names of the partitions created.
+        """
+        months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+        current = datetime.utcnow().date().replace(day=1)
+        created = []
+        with engine.begin() as connection:
+            if not connection.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar():
+                return created
+            for table in PARTITIONED_TABLES:
+                if not cls.is_partitioned(connection, table):
+                    continue
+                for offset in range(months_ahead + 1):
+                    name = cls.create_partition(connection, table, add_months(current, offset))
+                    if name:
+                        created.append(name)
+        if created:
+            logger.info("Created partitions: %s", ", ".join(created))
+        return created
+
+    async def run_worker(self, stop_event: asyncio.Event):
+        """Ensure partitions now and every partition_maintenance_interval_seconds until stop_event is set."""
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.ensure_partitions)
+            except Exception:
+                logger.exception("Partition maintenance failed")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.partition_maintenance_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    @classmethod
+    def archive(
+        cls,
+        table: str,
+        older_than_months: Optional[int] = None,
+        export_dir: Optional[str] = None,
+        drop: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Detach, export and drop `table`'s partitions older than `older_than_months`.
+
+        Each partition is detached first, so no request can change it while
+        it is exported as gzipped CSV (with a header) to
+        <export_dir>/<partition>.csv.gz. It is dropped only once the file is
+        complete. If the export fails, the partition is left detached. Put it
+        back with ALTER TABLE ... ATTACH PARTITION, or re-run the export by hand.
+
+        transaction_uids keeps the UIDs of archived transactions, so they are
+        never reused.
+        """
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"Unknown partitioned table {table!r}, expected one of {', '.join(PARTITIONED_TABLES)}")
+        older_than_months = settings.partition_retention_months if older_than_months is None else older_than_months
+        if older_than_months < 1:
+            raise ValueError("older_than_months must be at least 1")
+        export_dir = export_dir or settings.partition_archive_dir
+        cutoff = add_months(datetime.utcnow().date().replace(day=1), -older_than_months)
+
+        with engine.connect() as connection:
+            if not cls.is_partitioned(connection, table):
+                raise ValueError(f"{table} is not partitioned; run 'alembic upgrade head'")
+            cold = [name for name, month in cls.partitions(connection, table) if month < cutoff]
+
+        os.makedirs(export_dir, exist_ok=True)
+        report = []
+        with ImportService.connect() as conn:
+            conn.autocommit = True
+            cursor = conn.cursor()
+            for name in cold:
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                path = os.path.join(export_dir, f"{name}.csv.gz")
+                size = 0
+                with gzip.open(path + ".part", "wb") as file:
+                    with cursor.copy(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)") as copy:
+                        for block in copy:
+                            file.write(block)
+                            size += len(block)
+                os.replace(path + ".part", path)
+                cursor.execute(f"SELECT count(*) FROM {name}")
+                rows = cursor.fetchone()[0]
+                if drop:
+                    cursor.execute(f"DROP TABLE {name}")
+                report.append({"partition": name, "rows": rows, "bytes": size, "file": path, "dropped": drop})
+        return report
+
+
+partition_service = PartitionService()
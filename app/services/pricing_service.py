@@ -0,0 +1,176 @@
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, NamedTuple, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.schemas.settings import PlatformSettings
+from app.schemas.transaction import QuoteType, TransactionQuote, BatchQuoteItem, BatchQuoteResponse
+from app.services.settings_service import settings_service
+from app.services.exchange_rate_service import exchange_rate_service
+
+CENTS = Decimal("0.01")  # DECIMAL(15, 2) amount columns
+CRYPTO_UNITS = Decimal("0.000001")  # DECIMAL(15, 6) crypto_amount
+MICRO = Decimal(1_000_000)
+PAYOUT_EXCHANGE_RATE = Decimal("1.0")
+
+
+class Price(NamedTuple):
+    gross: Decimal
+    fee: Decimal
+    bonus: Decimal
+    net: Decimal
+
+
+def quantize(value: Decimal, exp: Decimal = CENTS) -> Decimal:
+    return value.quantize(exp, rounding=ROUND_HALF_UP)
+
+
+class PricingService:
+    """Gross, platform fee, bonus and net amounts for deposits and UPI payouts.
+
+    Every amount is rounded half-up to the paisa, like round() in Postgres,
+    so what is quoted is exactly what DECIMAL(15, 2) stores: the fee and the
+    bonus are computed from the rounded gross amount and net is their exact
+    sum. Deposits are priced in INR from the crypto amount at the platform
+    exchange rate; payouts are already in INR.
+    """
+
+    @staticmethod
+    def price(gross: Decimal, fee_percent: Decimal, bonus_percent: Decimal) -> Price:
+        gross = quantize(gross)
+        fee = quantize(gross * fee_percent / 100)
+        bonus = quantize(gross * bonus_percent / 100)
+        return Price(gross, fee, bonus, gross - fee + bonus)
+
+    @classmethod
+    def price_deposit(cls, crypto_amount: Decimal, platform_settings: PlatformSettings) -> Price:
+        gross = quantize(crypto_amount, CRYPTO_UNITS) * platform_settings.usdt_to_inr_rate
+        return cls.price(gross, platform_settings.platform_fee_percent, platform_settings.bonus_percent)
+
+    @classmethod
+    def price_payout(cls, upi_amount: Decimal, platform_settings: PlatformSettings) -> Price:
+        return cls.price(upi_amount, platform_settings.platform_fee_percent, platform_settings.bonus_percent)
+
+    @staticmethod
+    def exchange_rate(quote_type: QuoteType, platform_settings: PlatformSettings) -> Decimal:
+        if quote_type == QuoteType.CRYPTO_DEPOSIT:
+            return platform_settings.usdt_to_inr_rate
+        return PAYOUT_EXCHANGE_RATE
+
+    @staticmethod
+    def check_limits(quote_type: QuoteType, amount: Decimal, platform_settings: PlatformSettings) -> None:
+        """Raise 400 when `amount` is outside the configured deposit or payout limits."""
+        if quote_type == QuoteType.CRYPTO_DEPOSIT:
+            if amount < platform_settings.min_deposit_usdt:
+                raise HTTPException(status_code=400, detail=f"Minimum deposit is {platform_settings.min_deposit_usdt} USDT")
+            if amount > platform_settings.max_deposit_usdt:
+                raise HTTPException(status_code=400, detail=f"Maximum deposit is {platform_settings.max_deposit_usdt} USDT")
+        else:
+            # UPI payouts use the withdrawal limits
+            if amount < platform_settings.min_withdrawal_inr:
+                raise HTTPException(status_code=400, detail=f"Minimum UPI payout is {platform_settings.min_withdrawal_inr} INR")
+            if amount > platform_settings.max_withdrawal_inr:
+                raise HTTPException(status_code=400, detail=f"Maximum UPI payout is {platform_settings.max_withdrawal_inr} INR")
+
+    @classmethod
+    def price_batch(cls, quote_type: QuoteType, amounts: Sequence[Decimal], platform_settings: PlatformSettings) -> List[Price]:
+        """Price many amounts at once, with the same results as price_deposit/price_payout.
+
+        Works in integer paise (micro-USDT for deposits) with the percentages
+        as basis points, so each amount costs a few integer operations
+        instead of a chain of Decimal multiplications and quantize calls.
+        """
+        deposit = quote_type == QuoteType.CRYPTO_DEPOSIT
+        fee_bp = platform_settings.platform_fee_percent.scaleb(2)
+        bonus_bp = platform_settings.bonus_percent.scaleb(2)
+        rate = platform_settings.usdt_to_inr_rate.scaleb(4)
+        if any(value != value.to_integral_value() for value in (fee_bp, bonus_bp, rate)):
+            # More precision than the columns hold; stay with Decimal
+            price_one = cls.price_deposit if deposit else cls.price_payout
+            return [price_one(amount, platform_settings) for amount in amounts]
+        fee_bp, bonus_bp, rate = int(fee_bp), int(bonus_bp), int(rate)
+
+        if deposit:
+            # micro-USDT * (rate * 10^4) is in units of 10^-10 INR; round half up to paise
+            gross_paise = [
+                (int((amount * MICRO).to_integral_value(ROUND_HALF_UP)) * rate + 50_000_000) // 100_000_000
+                for amount in amounts
+            ]
+        else:
+            gross_paise = [int((amount * 100).to_integral_value(ROUND_HALF_UP)) for amount in amounts]
+
+        prices = []
+        append = prices.append
+        for gross in gross_paise:
+            # Half-up rounding of gross * bp / 10^4
+            fee = (gross * fee_bp + 5000) // 10000
+            bonus = (gross * bonus_bp + 5000) // 10000
+            append(Price(Decimal(gross) * CENTS, Decimal(fee) * CENTS, Decimal(bonus) * CENTS, Decimal(gross - fee + bonus) * CENTS))
+        return prices
+
+    @classmethod
+    def quote(cls, db: Session, quote_type: QuoteType, amount: Decimal, at: Optional[datetime] = None) -> TransactionQuote:
+        """Price one amount at the current settings.
+
+        With `at`, deposits use the exchange rate in force at that time (fees
+        and bonus are always the current ones) and the limits, which only
+        apply to new transactions, are not checked.
+        """
+        platform_settings = settings_service.get_platform_settings(db)
+        rate_effective_at = None
+        if at is None:
+            cls.check_limits(quote_type, amount, platform_settings)
+        elif quote_type == QuoteType.CRYPTO_DEPOSIT:
+            historical = exchange_rate_service.rate_at(at)
+            if historical is None:
+                raise HTTPException(status_code=404, detail="No exchange rate recorded at that time")
+            rate, rate_effective_at = historical
+            platform_settings = platform_settings.model_copy(update={"usdt_to_inr_rate": rate})
+
+        if quote_type == QuoteType.CRYPTO_DEPOSIT:
+            price = cls.price_deposit(amount, platform_settings)
+        else:
+            price = cls.price_payout(amount, platform_settings)
+        return TransactionQuote(
+            type=quote_type,
+            amount=amount,
+            exchange_rate=cls.exchange_rate(quote_type, platform_settings),
+            rate_effective_at=rate_effective_at,
+            platform_fee_percent=platform_settings.platform_fee_percent,
+            bonus_percent=platform_settings.bonus_percent,
+            gross_inr_amount=price.gross,
+            platform_fee_amount=price.fee,
+            bonus_amount=price.bonus,
+            net_inr_amount=price.net
+        )
+
+    @classmethod
+    def quote_batch(cls, db: Session, quote_type: QuoteType, amounts: Sequence[Decimal]) -> BatchQuoteResponse:
+        platform_settings = settings_service.get_platform_settings(db)
+        prices = cls.price_batch(quote_type, amounts, platform_settings)
+        if quote_type == QuoteType.CRYPTO_DEPOSIT:
+            low, high = platform_settings.min_deposit_usdt, platform_settings.max_deposit_usdt
+        else:
+            low, high = platform_settings.min_withdrawal_inr, platform_settings.max_withdrawal_inr
+
+        return BatchQuoteResponse(
+            type=quote_type,
+            exchange_rate=cls.exchange_rate(quote_type, platform_settings),
+            platform_fee_percent=platform_settings.platform_fee_percent,
+            bonus_percent=platform_settings.bonus_percent,
+            quotes=[
+                BatchQuoteItem(
+                    amount=amount, gross_inr_amount=price.gross, platform_fee_amount=price.fee,
+                    bonus_amount=price.bonus, net_inr_amount=price.net, within_limits=low <= amount <= high
+                )
+                for amount, price in zip(amounts, prices)
+            ],
+            total_gross_inr_amount=sum((price.gross for price in prices), Decimal("0.00")),
+            total_platform_fee_amount=sum((price.fee for price in prices), Decimal("0.00")),
+            total_bonus_amount=sum((price.bonus for price in prices), Decimal("0.00")),
+            total_net_inr_amount=sum((price.net for price in prices), Decimal("0.00"))
+        )
+
+
+pricing_service = PricingService()
@@ -0,0 +1,99 @@
+from decimal import Decimal
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.team import TeamMember
+from app.models.commission import Commission
+
+
+class ReconciliationService:
+    @staticmethod
+    def _counter_drift():
+        """Build a subquery of users whose counters differ from the source tables."""
+        team_counts = (
+            select(TeamMember.parent_user_id.label("user_id"), func.count(TeamMember.id).label("team_size"))
+            .group_by(TeamMember.parent_user_id)
+            .subquery()
+        )
+        commission_sums = (
+            select(
+                Commission.referrer_user_id.label("user_id"),
+                func.sum(Commission.commission_amount).label("total_commission")
+            )
+            .group_by(Commission.referrer_user_id)
+            .subquery()
+        )
+
+        expected_team_size = func.coalesce(team_counts.c.team_size, 0)
+        expected_commission = func.coalesce(commission_sums.c.total_commission, 0)
+
+        return (
+            select(
+                User.id.label("user_id"),
+                User.team_size.label("current_team_size"),
+                expected_team_size.label("team_size"),
+                User.total_commission_earned.label("current_total_commission"),
+                expected_commission.label("total_commission"),
+            )
+            .outerjoin(team_counts, team_counts.c.user_id == User.id)
+            .outerjoin(commission_sums, commission_sums.c.user_id == User.id)
+            .where(or_(
+                User.team_size.is_distinct_from(expected_team_size),
+                User.total_commission_earned.is_distinct_from(expected_commission),
+            ))
+            .subquery()
+        )
+
+    @classmethod
+    def reconcile_user_counters(cls, db: Session, fix: bool = True, sample_size: int = 20) -> dict:
+        """Recompute users.team_size and users.total_commission_earned in bulk and report drift.
+
+        Counters are recomputed with grouped aggregates over team_members and
+        commissions and written back with a single UPDATE ... FROM. Run it
+        outside peak hours: increments committed while it runs may be
+        overwritten by the recomputed values until the next run.
+        """
+        drift = cls._counter_drift()
+
+        summary = db.execute(
+            select(
+                func.count(drift.c.user_id),
+                func.coalesce(func.sum(func.abs(drift.c.team_size - func.coalesce(drift.c.current_team_size, 0))), 0),
+                func.coalesce(func.sum(func.abs(drift.c.total_commission - func.coalesce(drift.c.current_total_commission, 0))), 0),
+            )
+        ).one()
+
+        sample = db.execute(select(drift).order_by(drift.c.user_id).limit(sample_size)).all()
+
+        fixed = 0
+        if fix and summary[0]:
+            result = db.execute(
+                update(User)
+                .where(User.id == drift.c.user_id)
+                .values(team_size=drift.c.team_size, total_commission_earned=drift.c.total_commission)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            fixed = result.rowcount
+
+        return {
+            "drifted_users": summary[0],
+            "team_size_drift": int(summary[1]),
+            "total_commission_drift": Decimal(summary[2]),
+            "fixed_users": fixed,
+            "sample": [
+                {
+                    "user_id": row.user_id,
+                    "team_size": {"stored": row.current_team_size, "expected": row.team_size},
+                    "total_commission_earned": {
+                        "stored": row.current_total_commission,
+                        "expected": row.total_commission
+                    },
+                }
+                for row in sample
+            ],
+        }
+
+
+reconciliation_service = ReconciliationService()
@@ -0,0 +1,146 @@
+import re
+from enum import Enum
+from typing import List, Tuple
+from sqlalchemy import func, or_, inspect
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.transaction import Transaction
+
+PHONE_PATTERN = re.compile(r"^\+?\d+$")
+# Upper case with at least one hex digit after the prefix; "upi" or "Depa" are words
+UID_PATTERN = re.compile(r"^(DEP|UPI|WDR)[0-9A-F]+$")
+UID_PREFIX_PATTERN = re.compile(r"^(DEP|UPI|WDR)[0-9A-F]*$", re.IGNORECASE)
+UID_LENGTH = 11
+FULL_PHONE_DIGITS = 10
+MIN_FUZZY_LENGTH = 3  # pg_trgm cannot use the index for shorter patterns
+
+
+class SearchMode(str, Enum):
+    EXACT = "exact"
+    PREFIX = "prefix"
+    FUZZY = "fuzzy"
+
+
+# Matched case-insensitively through lower(column) text_pattern_ops indexes
+CASE_FOLDED_COLUMNS = ("name", "email")
+
+
+class SearchService:
+    """Turns admin search input into index-friendly filters.
+
+    Full phone numbers and transaction UIDs are matched exactly. Digit input
+    of three or more characters is matched anywhere in the phone number (and
+    transaction UID), and other text of three or more characters anywhere in
+    the searched columns; both are served by the pg_trgm GIN indexes.
+    Shorter input and UID prefixes are matched by prefix, served by btree
+    pattern_ops indexes.
+    """
+
+    @staticmethod
+    def escape_like(term: str) -> str:
+        return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def phone_variants(term: str) -> List[str]:
+        """Forms a full number may be stored in: with or without '+', and an
+        Indian number with or without its 91 country code."""
+        digits = term.lstrip("+")
+        variants = {digits, "+" + digits}
+        if len(digits) == FULL_PHONE_DIGITS or (len(digits) == FULL_PHONE_DIGITS + 2 and digits.startswith("91")):
+            national = digits[-FULL_PHONE_DIGITS:]
+            variants.update({national, "91" + national, "+91" + national})
+        return sorted(variants)
+
+    @classmethod
+    def classify(cls, term: str) -> Tuple[str, SearchMode]:
+        """Pick the search strategy from the shape of the input: (kind, mode)."""
+        if PHONE_PATTERN.match(term):
+            digits = term.lstrip("+")
+            if len(digits) >= FULL_PHONE_DIGITS:
+                return "phone", SearchMode.EXACT
+            if len(digits) >= MIN_FUZZY_LENGTH:
+                return "phone", SearchMode.FUZZY
+            return "phone", SearchMode.PREFIX
+        if UID_PATTERN.match(term):
+            if len(term) == UID_LENGTH:
+                return "uid", SearchMode.EXACT
+            return "uid", SearchMode.PREFIX
+        if len(term) < MIN_FUZZY_LENGTH:
+            return "text", SearchMode.PREFIX
+        return "text", SearchMode.FUZZY
+
+    @classmethod
+    def prefix_match(cls, column, term: str):
+        """LIKE 'term%' in the form the column's btree pattern_ops index serves."""
+        escaped = cls.escape_like(term)
+        if column.key in CASE_FOLDED_COLUMNS:
+            return func.lower(column).like(escaped.lower() + "%", escape="\\")
+        # Phone numbers are digits and UIDs upper case
+        return column.like(escaped.upper() + "%", escape="\\")
+
+    @classmethod
+    def phone_filter(cls, term: str, mode: SearchMode):
+        if mode == SearchMode.EXACT:
+            return User.phone_number.in_(cls.phone_variants(term))
+        digits = term.lstrip("+")
+        if mode == SearchMode.FUZZY:
+            return User.phone_number.like("%" + cls.escape_like(digits) + "%", escape="\\")
+        return or_(*[cls.prefix_match(User.phone_number, v) for v in (digits, "+" + digits)])
+
+    @classmethod
+    def text_filter(cls, term: str, mode: SearchMode, *columns):
+        if mode == SearchMode.PREFIX:
+            return or_(*[cls.prefix_match(column, term) for column in columns])
+        pattern = "%" + cls.escape_like(term) + "%"
+        return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+    @classmethod
+    def user_filter(cls, term: str):
+        """Filter for searching users by phone number, name or email."""
+        term = term.strip()
+        kind, mode = cls.classify(term)
+        if kind == "phone":
+            return cls.phone_filter(term, mode)
+        return cls.text_filter(term, mode, User.name, User.email, User.phone_number)
+
+    @classmethod
+    def transaction_filter(cls, term: str):
+        """Filter for searching transactions (joined to users) by phone, name or UID."""
+        term = term.strip()
+        kind, mode = cls.classify(term)
+        if kind == "phone":
+            if mode == SearchMode.PREFIX:
+                return cls.phone_filter(term, mode)
+            # Digits may also be part of a transaction UID
+            return or_(
+                cls.phone_filter(term, mode),
+                Transaction.transaction_uid.like("%" + cls.escape_like(term.lstrip("+")) + "%", escape="\\")
+            )
+        if kind == "uid":
+            uid = term.upper()
+            if mode == SearchMode.EXACT:
+                return Transaction.transaction_uid == uid
+            return cls.prefix_match(Transaction.transaction_uid, uid)
+        text_match = cls.text_filter(term, mode, User.phone_number, User.name, Transaction.transaction_uid)
+        if UID_PREFIX_PATTERN.match(term):
+            # A word such as "upi" may also be the start of a UID
+            return or_(cls.prefix_match(Transaction.transaction_uid, term), text_match)
+        return text_match
+
+    @staticmethod
+    def bounded_count(query: Query, cap: int = None) -> Tuple[int, bool]:
+        """Count matching rows but stop after `cap`; returns (count, capped)."""
+        cap = cap or settings.search_count_cap
+        # Select the primary key rather than a bare literal so the FROM clause
+        # survives even when no filter references the table
+        primary_key = inspect(query.column_descriptions[0]["entity"]).primary_key
+        subquery = query.order_by(None).with_entities(*primary_key).limit(cap + 1).subquery()
+        total = query.session.query(func.count()).select_from(subquery).scalar()
+        if total > cap:
+            return cap, True
+        return total, False
+
+
+search_service = SearchService()
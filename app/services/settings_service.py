@@ -1,12 +1,22 @@
 from sqlalchemy.orm import Session
 from app.models.settings import PlatformSetting
 from app.schemas.settings import PlatformSettings
+from app.core.broker import broker
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import get_db_context
 from decimal import Decimal
 
+SETTINGS_CHANNEL = "platform_settings"
+_CACHE_KEY = "platform_settings"
+
+# Platform settings are read on every deposit and payout but change rarely
+platform_settings_cache = TTLCache(maxsize=1, ttl=settings.platform_settings_cache_ttl_seconds)
+
 class SettingsService:
     @staticmethod
-    def get_platform_settings(db: Session) -> PlatformSettings:
-        """Get current platform settings."""
+    def load_platform_settings(db: Session) -> PlatformSettings:
+        """Read platform settings from the database."""
         settings_dict = {}
         settings_rows = db.query(PlatformSetting).all()
         for setting in settings_rows:
@@ -17,4 +27,33 @@ class SettingsService:
         
         return PlatformSettings(**settings_dict)
 
+    @classmethod
+    def get_platform_settings(cls, db: Session) -> PlatformSettings:
+        """Get current platform settings, cached for platform_settings_cache_ttl_seconds."""
+        platform_settings = platform_settings_cache.get(_CACHE_KEY)
+        if platform_settings is None:
+            platform_settings = cls.load_platform_settings(db)
+            platform_settings_cache.set(_CACHE_KEY, platform_settings)
+        return platform_settings
+
+    @staticmethod
+    def announce_change(db: Session):
+        """Tell every worker to drop its cached settings once `db` commits."""
+        broker.publish(db, SETTINGS_CHANNEL, {})
+
+    @staticmethod
+    def invalidate(_message: dict = None):
+        platform_settings_cache.clear()
+
+    @classmethod
+    def warm(cls):
+        with get_db_context() as db:
+            cls.get_platform_settings(db)
+
+    @classmethod
+    def start(cls):
+        broker.subscribe(SETTINGS_CHANNEL, cls.invalidate)
+        # Changes announced while the listener was disconnected were missed
+        broker.add_reconnect_hook(cls.invalidate)
+
 settings_service = SettingsService()
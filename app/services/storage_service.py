@@ -1,5 +1,3 @@
-import boto3
-from botocore.exceptions import NoCredentialsError
 from fastapi import UploadFile, HTTPException
 from app.core.config import settings
 
@@ -7,6 +5,10 @@ class StorageService:
     @staticmethod
     def upload_to_s3(file: UploadFile, filename: str) -> str:
         """Upload file to S3 and return the URL."""
+        # boto3 takes a noticeable share of startup time, so import it on first use
+        import boto3
+        from botocore.exceptions import NoCredentialsError
+
         try:
             s3_client = boto3.client(
                 's3',
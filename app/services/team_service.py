@@ -0,0 +1,156 @@
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import select, insert, update, literal, union_all, func, BigInteger, Integer
+from sqlalchemy.orm import Session, aliased
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.models.team import TeamMember
+from app.models.user import User
+from app.schemas.team import TeamMember as TeamMemberResponse, TeamLevelStats, TeamTree, PaginatedTeamResponse
+
+
+class TeamService:
+    @staticmethod
+    def link_to_referrer(db: Session, child_user_id: int, referrer_user_id: int) -> None:
+        """Add closure rows for a new user in a single INSERT ... SELECT.
+
+        The direct (level 1) row and a copy of every referrer ancestor row
+        shifted one level down are written by one statement, then the
+        team_size counter of every new ancestor is bumped by a second one.
+        Nothing is committed here so the caller can keep user creation and
+        the team rows in the same transaction.
+        """
+        direct = select(
+            literal(referrer_user_id, BigInteger),
+            literal(child_user_id, BigInteger),
+            literal(1, Integer),
+        )
+        ancestors = select(
+            TeamMember.parent_user_id,
+            literal(child_user_id, BigInteger),
+            TeamMember.level + 1,
+        ).where(TeamMember.child_user_id == referrer_user_id)
+
+        # Levels deeper than the configured maximum are not tracked
+        if settings.referral_max_depth > 0:
+            ancestors = ancestors.where(TeamMember.level < settings.referral_max_depth)
+
+        db.execute(
+            insert(TeamMember).from_select(
+                ["parent_user_id", "child_user_id", "level"],
+                union_all(direct, ancestors),
+            )
+        )
+
+        new_parents = select(TeamMember.parent_user_id).where(TeamMember.child_user_id == child_user_id)
+        db.execute(
+            update(User)
+            .where(User.id.in_(new_parents))
+            .values(team_size=User.team_size + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def ensure_in_team(db: Session, user_id: int, root_user_id: int) -> None:
+        """Allow expanding a subtree only for the user themselves or one of their descendants."""
+        if root_user_id == user_id:
+            return
+        exists = db.query(TeamMember.id).filter(
+            TeamMember.parent_user_id == user_id,
+            TeamMember.child_user_id == root_user_id
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Team member not found")
+
+    @staticmethod
+    def get_team_page(
+        db: Session,
+        root_user_id: int,
+        level: Optional[int] = None,
+        page: int = 1,
+        limit: int = 20
+    ) -> PaginatedTeamResponse:
+        """Get one page of a user's descendants joined with their user rows."""
+        query = db.query(TeamMember).filter(TeamMember.parent_user_id == root_user_id)
+        if level is not None:
+            query = query.filter(TeamMember.level == level)
+
+        total = query.count()
+
+        direct = aliased(TeamMember)
+        direct_referrals = (
+            select(func.count(direct.id))
+            .where(direct.parent_user_id == TeamMember.child_user_id, direct.level == 1)
+            .correlate(TeamMember)
+            .scalar_subquery()
+        )
+        rows = (
+            query.join(User, User.id == TeamMember.child_user_id)
+            .with_entities(
+                TeamMember.id,
+                TeamMember.level,
+                TeamMember.created_at,
+                User.id.label("user_id"),
+                User.phone_number,
+                User.name,
+                User.total_deposited,
+                direct_referrals.label("direct_referrals"),
+            )
+            .order_by(TeamMember.level, TeamMember.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+            .all()
+        )
+
+        members = [
+            TeamMemberResponse(
+                id=row.id,
+                user_id=row.user_id,
+                phone_number=row.phone_number,
+                name=row.name,
+                level=row.level,
+                total_deposited=row.total_deposited or Decimal("0.00"),
+                direct_referrals=row.direct_referrals,
+                joined_at=row.created_at
+            ) for row in rows
+        ]
+
+        return PaginatedTeamResponse(
+            members=members,
+            total=total,
+            page=page,
+            limit=limit,
+            total_pages=(total + limit - 1) // limit
+        )
+
+    @staticmethod
+    def get_level_stats(db: Session, root_user_id: int) -> TeamTree:
+        """Get member counts and deposit totals per level below a user."""
+        rows = (
+            db.query(
+                TeamMember.level,
+                func.count(TeamMember.id).label("members"),
+                func.coalesce(func.sum(User.total_deposited), 0).label("total_deposited"),
+            )
+            .join(User, User.id == TeamMember.child_user_id)
+            .filter(TeamMember.parent_user_id == root_user_id)
+            .group_by(TeamMember.level)
+            .order_by(TeamMember.level)
+            .all()
+        )
+
+        levels = [
+            TeamLevelStats(level=row.level, members=row.members, total_deposited=row.total_deposited)
+            for row in rows
+        ]
+
+        return TeamTree(
+            root_user_id=root_user_id,
+            total_members=sum(item.members for item in levels),
+            total_deposited=sum((item.total_deposited for item in levels), Decimal("0.00")),
+            levels=levels
+        )
+
+
+team_service = TeamService()
@@ -0,0 +1,156 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.security import create_access_token
+from app.models.admin import Admin
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.user import RefreshTokenResponse
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class TokenService:
+    """Rotating refresh tokens.
+
+    The client gets an opaque random token; only its SHA-256 is stored. Each
+    refresh marks the presented token as rotated and issues a new one in the
+    same family. If a rotated token is presented again, someone else holds a
+    copy, so every token in the family is revoked and both parties have to
+    log in again.
+    """
+
+    @staticmethod
+    def issue_refresh_token(db: Session, subject_type: str, subject_id: int, family_id: Optional[str] = None) -> str:
+        """Add a refresh token to the session; the caller commits."""
+        token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            token_hash=hash_token(token),
+            family_id=family_id or uuid.uuid4().hex,
+            subject_type=subject_type,
+            subject_id=subject_id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+        ))
+        return token
+
+    @staticmethod
+    def revoke_family(db: Session, family_id: str) -> None:
+        db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+
+    @staticmethod
+    def revoke_subject(db: Session, subject_type: str, subject_id: int) -> None:
+        """Revoke every refresh token of a user or admin (e.g. when blocked)."""
+        db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.subject_type == subject_type,
+                RefreshToken.subject_id == subject_id,
+                RefreshToken.revoked_at.is_(None)
+            )
+            .values(revoked_at=datetime.utcnow())
+        )
+
+    @staticmethod
+    def access_claims(db: Session, subject_type: str, subject_id: int) -> Optional[dict]:
+        """Claims for a new access token, or None if the account may no longer log in."""
+        if subject_type == "admin":
+            admin = db.query(Admin.id, Admin.role).filter_by(id=subject_id, is_active=True).first()
+            return {"sub": str(admin.id), "role": admin.role} if admin else None
+        user = db.query(User.id).filter_by(id=subject_id, is_active=True, is_blocked=False).first()
+        return {"sub": str(user.id), "role": "user"} if user else None
+
+    @classmethod
+    def rotate(cls, db: Session, token: str) -> RefreshTokenResponse:
+        """Exchange a refresh token for a new access token and refresh token."""
+        stored = db.query(RefreshToken).filter_by(token_hash=hash_token(token)).with_for_update().first()
+        if stored is None:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        if stored.rotated_at is not None or stored.revoked_at is not None:
+            if stored.revoked_at is None:
+                # Reuse of a rotated token: the family is compromised
+                cls.revoke_family(db, stored.family_id)
+                db.commit()
+            raise HTTPException(status_code=401, detail="Refresh token has been revoked")
+
+        if stored.expires_at < datetime.utcnow():
+            raise HTTPException(status_code=401, detail="Refresh token has expired")
+
+        claims = cls.access_claims(db, stored.subject_type, stored.subject_id)
+        if claims is None:
+            cls.revoke_family(db, stored.family_id)
+            db.commit()
+            raise HTTPException(status_code=401, detail="Account is inactive or blocked")
+
+        stored.rotated_at = datetime.utcnow()
+        refresh_token = cls.issue_refresh_token(db, stored.subject_type, stored.subject_id, stored.family_id)
+        db.commit()
+
+        return RefreshTokenResponse(
+            access_token=create_access_token(data=claims),
+            refresh_token=refresh_token,
+            token_type="bearer"
+        )
+
+    @classmethod
+    def logout(cls, db: Session, token: str) -> None:
+        """Revoke the family of `token`. Unknown tokens are ignored."""
+        stored = db.query(RefreshToken).filter_by(token_hash=hash_token(token)).first()
+        if stored is not None:
+            cls.revoke_family(db, stored.family_id)
+            db.commit()
+
+    @classmethod
+    def set_user_blocked(cls, db: Session, user_id: int, blocked: bool) -> User:
+        """Block or unblock a user. Blocking revokes their refresh tokens, and
+        their access tokens stop working on every worker once this commits."""
+        user = db.query(User).filter_by(id=user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        user.is_blocked = blocked
+        if blocked:
+            cls.revoke_subject(db, "user", user_id)
+        message = revocation_list.announce(db, "user", user_id, blocked or not user.is_active)
+        db.commit()
+        # Don't wait for the broker round trip on this worker
+        revocation_list.apply(message)
+        return user
+
+    @classmethod
+    def update_admin(cls, db: Session, admin_id: int, is_active: Optional[bool] = None, role: Optional[str] = None) -> Admin:
+        """Activate, deactivate or change the role of an admin. Both take effect
+        on existing access tokens on every worker once this commits;
+        deactivating also revokes their refresh tokens."""
+        admin = db.query(Admin).filter_by(id=admin_id).first()
+        if not admin:
+            raise HTTPException(status_code=404, detail="Admin not found")
+
+        if is_active is not None:
+            admin.is_active = is_active
+        if role is not None:
+            admin.role = role
+        if not admin.is_active:
+            cls.revoke_subject(db, "admin", admin_id)
+        message = revocation_list.announce(db, "admin", admin_id, not admin.is_active, admin.role)
+        db.commit()
+        # Don't wait for the broker round trip on this worker
+        revocation_list.apply(message)
+        return admin
+
+
+token_service = TokenService()
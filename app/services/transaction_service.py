@@ -7,10 +7,15 @@ from fastapi import HTTPException
 
 from app.models.transaction import Transaction
 from app.models.user import User
-from app.schemas.transaction import TransactionStatus
+from app.schemas.transaction import TransactionStatus, QuoteType
 from app.services.storage_service import StorageService
 from app.services.settings_service import settings_service
+from app.services.pricing_service import pricing_service
 from app.services.notification_service import notification_service
+from app.services.outbox_service import outbox_service
+from app.services.lookup_service import lookup_service
+from app.services.transaction_stats_service import transaction_stats_service
+from app.services.commission_service import DEPOSIT_APPROVED_EVENT
 
 class TransactionService:
     @staticmethod
@@ -26,17 +31,11 @@ class TransactionService:
         platform_settings = settings_service.get_platform_settings(db)
         
         # Validate amount limits
-        if crypto_amount < platform_settings.min_deposit_usdt:
-            raise HTTPException(status_code=400, detail=f"Minimum deposit is {platform_settings.min_deposit_usdt} USDT")
-        if crypto_amount > platform_settings.max_deposit_usdt:
-            raise HTTPException(status_code=400, detail=f"Maximum deposit is {platform_settings.max_deposit_usdt} USDT")
+        pricing_service.check_limits(QuoteType.CRYPTO_DEPOSIT, crypto_amount, platform_settings)
 
         # Calculate amounts
         exchange_rate = platform_settings.usdt_to_inr_rate
-        gross_inr = crypto_amount * exchange_rate
-        platform_fee = gross_inr * (platform_settings.platform_fee_percent / 100)
-        bonus = gross_inr * (platform_settings.bonus_percent / 100)
-        net_inr = gross_inr - platform_fee + bonus
+        gross_inr, platform_fee, bonus, net_inr = pricing_service.price_deposit(crypto_amount, platform_settings)
         
         # Get user's payment details
         user = db.query(User).filter_by(id=user_id).first()
@@ -72,6 +71,8 @@ class TransactionService:
         user.total_usd_sent = (user.total_usd_sent or Decimal('0.00')) + crypto_amount
 
         db.add(transaction)
+        lookup_service.announce_transaction(db, transaction)
+        transaction_stats_service.record_created(db, transaction)
         db.commit()
         db.refresh(transaction)
 
@@ -104,10 +105,7 @@ class TransactionService:
         platform_settings = settings_service.get_platform_settings(db)
 
         # Validate amount limits (using withdrawal limits for UPI payouts)
-        if upi_amount < platform_settings.min_withdrawal_inr:
-            raise HTTPException(status_code=400, detail=f"Minimum UPI payout is {platform_settings.min_withdrawal_inr} INR")
-        if upi_amount > platform_settings.max_withdrawal_inr:
-            raise HTTPException(status_code=400, detail=f"Maximum UPI payout is {platform_settings.max_withdrawal_inr} INR")
+        pricing_service.check_limits(QuoteType.UPI_PAYOUT, upi_amount, platform_settings)
 
         # Find user by phone number
         user = db.query(User).filter_by(phone_number=user_phone).first()
@@ -117,10 +115,7 @@ class TransactionService:
             raise HTTPException(status_code=400, detail="Payment details not set. Please bind UPI or bank account")
         
         # Calculate amounts
-        gross_inr = upi_amount
-        platform_fee = gross_inr * (platform_settings.platform_fee_percent / 100)
-        bonus = gross_inr * (platform_settings.bonus_percent / 100)
-        net_inr = gross_inr - platform_fee + bonus
+        gross_inr, platform_fee, bonus, net_inr = pricing_service.price_payout(upi_amount, platform_settings)
         
         # Create UPI payout transaction
         transaction_uid = f"UPI{uuid.uuid4().hex[:8].upper()}"
@@ -153,6 +148,8 @@ class TransactionService:
         user.total_withdrawn = (user.total_withdrawn or Decimal('0.00')) + net_inr
 
         db.add(transaction)
+        lookup_service.announce_transaction(db, transaction)
+        transaction_stats_service.record_created(db, transaction)
         db.commit()
         db.refresh(transaction)
 
@@ -185,10 +182,7 @@ class TransactionService:
         platform_settings = settings_service.get_platform_settings(db)
         
         # Validate amount limits (using withdrawal limits for UPI payouts)
-        if upi_amount < platform_settings.min_withdrawal_inr:
-            raise HTTPException(status_code=400, detail=f"Minimum UPI payout is {platform_settings.min_withdrawal_inr} INR")
-        if upi_amount > platform_settings.max_withdrawal_inr:
-            raise HTTPException(status_code=400, detail=f"Maximum UPI payout is {platform_settings.max_withdrawal_inr} INR")
+        pricing_service.check_limits(QuoteType.UPI_PAYOUT, upi_amount, platform_settings)
         
         # Get user's payment details
         user = db.query(User).filter_by(id=user_id).first()
@@ -198,10 +192,7 @@ class TransactionService:
             raise HTTPException(status_code=400, detail="Payment details not set. Please bind UPI or bank account")
         
         # Calculate amounts
-        gross_inr = upi_amount
-        platform_fee = gross_inr * (platform_settings.platform_fee_percent / 100)
-        bonus = gross_inr * (platform_settings.bonus_percent / 100)
-        net_inr = gross_inr - platform_fee + bonus
+        gross_inr, platform_fee, bonus, net_inr = pricing_service.price_payout(upi_amount, platform_settings)
         
         # Create UPI payout transaction as completed
         transaction_uid = f"UPI{uuid.uuid4().hex[:8].upper()}"
@@ -241,6 +232,8 @@ class TransactionService:
         # Update user's total_withdrawn when admin UPI payout is created
         user.total_withdrawn = (user.total_withdrawn or Decimal('0.00')) + net_inr
 
+        lookup_service.announce_transaction(db, transaction)
+        transaction_stats_service.record_created(db, transaction)
         db.commit()
         db.refresh(transaction)
 
@@ -258,13 +251,15 @@ class TransactionService:
         transaction_fee: Optional[Decimal] = None,
         platform_fee: Optional[Decimal] = None
     ) -> Transaction:
-        transaction = db.query(Transaction).filter_by(id=transaction_id).first()
+        # Locked so two concurrent reviews cannot both see it pending
+        transaction = db.query(Transaction).filter_by(id=transaction_id).with_for_update().first()
         if not transaction:
             raise HTTPException(status_code=404, detail="Transaction not found")
         
         if transaction.status != 'pending':
             raise HTTPException(status_code=400, detail="Transaction already reviewed")
         
+        old_status = transaction.status
         transaction.status = status.value
         transaction.admin_id = admin_id
         transaction.admin_reviewed_at = datetime.utcnow()
@@ -278,6 +273,9 @@ class TransactionService:
                 user = transaction.user
                 user.total_deposited += transaction.net_inr_amount
                 user.wallet_balance += transaction.net_inr_amount
+
+                # Referral commissions are credited asynchronously by the outbox worker
+                outbox_service.enqueue(db, DEPOSIT_APPROVED_EVENT, {"transaction_id": transaction.id})
             elif transaction.type == 'withdrawal':
                 # For withdrawal, debit user balance
                 user = transaction.user
@@ -288,6 +286,7 @@ class TransactionService:
                 transaction.payment_reference = payment_reference
                 transaction.payment_completed_at = datetime.utcnow()
         
+        transaction_stats_service.record_status_change(db, transaction, old_status)
         db.commit()
         return transaction
 
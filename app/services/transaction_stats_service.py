@@ -0,0 +1,104 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.utils import to_ist
+from app.models.transaction import Transaction
+from app.models.transaction_stats import UserTransactionStats
+from app.schemas.transaction import TransactionSummary, TransactionStatusCount, MonthlyTransactionTotal
+
+
+def stats_month(created_at: Optional[datetime]) -> date:
+    """First day of the IST month `created_at` (naive UTC) falls in."""
+    return to_ist(created_at or datetime.utcnow()).date().replace(day=1)
+
+
+class TransactionStatsService:
+    """Per-user aggregates behind /transactions/summary.
+
+    user_transaction_stats holds one row per user, IST month, type and
+    status with the count and amount sums of those transactions. Creating a
+    transaction adds it to its status row, and a review moves it from the
+    old status row to the new one. Both are single-row UPSERTs in the same
+    database transaction as the change itself, so the summary is one
+    indexed read of a few dozen rows however many transactions the user has.
+    Rows stay in place when their partitions are archived, like the
+    counters on User.
+    """
+
+    @staticmethod
+    def add(db: Session, transaction: Transaction, status: str, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) `transaction` from its `status` row."""
+        values = {
+            "user_id": transaction.user_id,
+            "month": stats_month(transaction.created_at),
+            "type": transaction.type,
+            "status": status,
+            "count": sign,
+            "crypto_amount": sign * (transaction.crypto_amount or Decimal("0")),
+            "gross_inr_amount": sign * (transaction.gross_inr_amount or Decimal("0")),
+            "net_inr_amount": sign * (transaction.net_inr_amount or Decimal("0")),
+        }
+        statement = pg_insert(UserTransactionStats).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "month", "type", "status"],
+            set_={
+                column: getattr(UserTransactionStats, column) + getattr(statement.excluded, column)
+                for column in ("count", "crypto_amount", "gross_inr_amount", "net_inr_amount")
+            },
+        )
+        db.execute(statement)
+
+    @classmethod
+    def record_created(cls, db: Session, transaction: Transaction) -> None:
+        cls.add(db, transaction, transaction.status)
+
+    @classmethod
+    def record_status_change(cls, db: Session, transaction: Transaction, old_status: str) -> None:
+        if old_status == transaction.status:
+            return
+        cls.add(db, transaction, old_status, -1)
+        cls.add(db, transaction, transaction.status)
+
+    @staticmethod
+    def summary(db: Session, user_id: int, months: int = 12) -> TransactionSummary:
+        """All-time counts by type and status, and per-month totals for the last `months` months."""
+        current = stats_month(None)
+        index = current.year * 12 + current.month - months
+        since = date(index // 12, index % 12 + 1, 1)
+
+        rows = (
+            db.query(UserTransactionStats)
+            .filter(UserTransactionStats.user_id == user_id, UserTransactionStats.count != 0)
+            .order_by(UserTransactionStats.month.desc(), UserTransactionStats.type, UserTransactionStats.status)
+            .all()
+        )
+
+        counts: Dict[Tuple[str, str], int] = {}
+        monthly = []
+        for row in rows:
+            counts[(row.type, row.status)] = counts.get((row.type, row.status), 0) + row.count
+            if row.month >= since:
+                monthly.append(MonthlyTransactionTotal(
+                    month=f"{row.month:%Y-%m}",
+                    type=row.type,
+                    status=row.status,
+                    count=row.count,
+                    crypto_amount=row.crypto_amount,
+                    gross_inr_amount=row.gross_inr_amount,
+                    net_inr_amount=row.net_inr_amount
+                ))
+
+        return TransactionSummary(
+            total_count=sum(counts.values()),
+            counts=[
+                TransactionStatusCount(type=type_, status=status, count=count)
+                for (type_, status), count in sorted(counts.items())
+            ],
+            monthly=monthly
+        )
+
+
+transaction_stats_service = TransactionStatsService()
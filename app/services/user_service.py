@@ -1,3 +1,4 @@
+from typing import List
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.user import User
@@ -7,20 +8,8 @@ from app.models.transaction import Transaction
 from app.schemas.user import UserProfile, TeamMemberSchema, CommissionSchema, BindUPI, BindBankAccount
 
 class UserService:
-    def get_user_profile(self, db: Session, user_id: int) -> UserProfile:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Calculate total team size (users where this user is the parent)
-        team_size = db.query(TeamMember).filter(TeamMember.parent_user_id == user_id).count()
-        
-        # Calculate total commission (commissions where this user is the referrer)
-        total_commission = 0
-        commissions = db.query(Commission).filter(Commission.referrer_user_id == user_id).all()
-        for comm in commissions:
-            total_commission += float(comm.commission_amount)
-
+    @staticmethod
+    def build_user_profile(user: User) -> UserProfile:
         return UserProfile(
             id=user.id,
             name=user.name,
@@ -37,30 +26,49 @@ class UserService:
             wallet_balance=float(user.wallet_balance),
             total_deposited=float(user.total_deposited),
             total_withdrawn=float(user.total_withdrawn),
-            total_commission_earned=float(user.total_commission_earned),
+            total_commission_earned=float(user.total_commission_earned or 0),
             total_usd_sent=float(user.total_usd_sent or 0),
             referral_code=user.referral_code,
-            team_size=team_size,
-            total_commission=total_commission,
+            team_size=user.team_size or 0,
+            total_commission=float(user.total_commission_earned or 0),
             is_active=user.is_active,
             created_at=user.created_at
         )
 
-    def get_team_members(self, db: Session, user_id: int):
-        # Get team members where the current user is the parent
-        members = db.query(TeamMember).filter(TeamMember.parent_user_id == user_id).all()
-        result = []
-        for member in members:
-            # Get the child user details
-            user_details = db.query(User).filter(User.id == member.child_user_id).first()
-            if user_details:
-                result.append(TeamMemberSchema(
-                    user_id=user_details.id,
-                    phone_number=user_details.phone_number,
-                    joined_at=member.created_at,
-                    level=member.level
-                ))
-        return result
+    def get_user_profile(self, db: Session, user_id: int) -> UserProfile:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        return self.build_user_profile(user)
+
+    def get_user_profiles(self, db: Session, user_ids: List[int]) -> List[UserProfile]:
+        """Get profiles for a batch of users with a single query, keeping the order of user_ids."""
+        if not user_ids:
+            return []
+
+        users = {user.id: user for user in db.query(User).filter(User.id.in_(user_ids)).all()}
+        return [self.build_user_profile(users[user_id]) for user_id in user_ids if user_id in users]
+
+    def get_team_members(self, db: Session, user_id: int, page: int = 1, limit: int = 100):
+        # Get a page of team members where the current user is the parent, joined with their user rows
+        members = (
+            db.query(TeamMember.level, TeamMember.created_at, User.id, User.phone_number)
+            .join(User, User.id == TeamMember.child_user_id)
+            .filter(TeamMember.parent_user_id == user_id)
+            .order_by(TeamMember.level, TeamMember.id)
+            .offset((page - 1) * limit)
+            .limit(limit)
+            .all()
+        )
+        return [
+            TeamMemberSchema(
+                user_id=member.id,
+                phone_number=member.phone_number,
+                joined_at=member.created_at,
+                level=member.level
+            ) for member in members
+        ]
 
     def get_commissions(self, db: Session, user_id: int):
         # Get commissions where this user is the referrer (earned the commission)
@@ -70,7 +78,7 @@ class UserService:
                 id=c.id,
                 amount=float(c.commission_amount),
                 from_user_id=c.referred_user_id,
-                level=1,  # Level info not stored in commission, default to 1
+                level=c.level,
                 created_at=c.created_at
             ) for c in commissions
         ]
@@ -97,7 +105,7 @@ class UserService:
         db.refresh(user)
 
         # Return updated profile
-        return self.get_user_profile(db, user_id)
+        return self.build_user_profile(user)
 
     def bind_bank_account(self, db: Session, user_id: int, bank_data: BindBankAccount) -> UserProfile:
         """Bind bank account details (IMPS) to user account and clear UPI data."""
@@ -121,6 +129,6 @@ class UserService:
         db.refresh(user)
 
         # Return updated profile
-        return self.get_user_profile(db, user_id)
+        return self.build_user_profile(user)
 
 user_service = UserService()
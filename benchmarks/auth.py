@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark authenticated request throughput.
+
+Validates the same access token with get_current_user from several threads,
+once against the in-memory revocation list and once with the previous
+per-request database lookup, then repeats both through the full app on an
+authenticated endpoint that does no other database work
+(GET /transactions/quote). Needs at least one active user.
+
+Usage: python benchmarks/auth.py [threads] [seconds]
+"""
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.security import create_access_token, get_current_user
+from app.db.database import get_db_context
+from app.models.user import User
+
+
+def throughput(func, threads: int, seconds: float) -> float:
+    """Calls per second of `func` from `threads` threads over `seconds`."""
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        calls = 0
+        while time.perf_counter() < deadline:
+            func()
+            calls += 1
+        return calls
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        total = sum(pool.map(lambda _: worker(), range(threads)))
+    return total / (time.perf_counter() - started)
+
+
+def run_benchmark(threads: int = 4, seconds: float = 5.0):
+    with get_db_context() as db:
+        user = db.query(User).filter_by(is_active=True, is_blocked=False).first()
+    if user is None:
+        print("No active user; seed some data first (benchmarks/seed_data.py)")
+        sys.exit(1)
+
+    token = create_access_token(data={"sub": str(user.id), "role": "user"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    revocation_list.reload()
+
+    from main import app
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/transactions/quote?type=upi_payout&amount=1000", headers=headers).status_code == 200
+
+    print(f"{threads} threads, {seconds:.0f}s each ({len(revocation_list)} revoked principals in memory)")
+    results = {}
+    for mode, stateless in (("database lookup", False), ("revocation list", True)):
+        settings.auth_stateless_validation = stateless
+        results[mode] = (
+            throughput(lambda: get_current_user(credentials), threads, seconds),
+            throughput(lambda: client.get("/transactions/quote?type=upi_payout&amount=1000", headers=headers), threads, seconds),
+        )
+        print(f"  {mode:16s} get_current_user {results[mode][0]:9,.0f}/s   GET /transactions/quote {results[mode][1]:7,.0f} req/s")
+
+    before, after = results["database lookup"], results["revocation list"]
+    print(f"  speedup          get_current_user {after[0] / before[0]:8.1f}x   GET /transactions/quote {after[1] / before[1]:7.1f}x")
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    run_benchmark(threads, seconds)
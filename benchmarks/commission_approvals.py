@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark deposit approvals with referral commissions.
+
+Builds a referral chain of the given depth, creates pending deposits for
+the deepest user, then measures approvals per second and how fast the
+outbox worker credits the resulting commissions.
+
+Usage: python benchmarks/commission_approvals.py [deposits] [depth]
+"""
+import sys
+import os
+import time
+import secrets
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import get_db_context
+from app.models.user import User
+from app.models.team import TeamMember
+from app.models.transaction import Transaction
+from app.models.commission import Commission
+from app.models.outbox import OutboxEvent
+from app.schemas.transaction import TransactionStatus
+from app.services.team_service import team_service
+from app.services.transaction_service import TransactionService
+from app.services.commission_service import CommissionService
+from app.services.outbox_service import OutboxService
+from app.services.settings_service import settings_service
+
+
+def create_chain(db, depth: int) -> list:
+    """Create `depth + 1` users, each referred by the previous one."""
+    user_ids = []
+    for _ in range(depth + 1):
+        user = User(
+            phone_number="+9" + "".join(secrets.choice("0123456789") for _ in range(12)),
+            password_hash="benchmark",
+            referral_code=secrets.token_hex(4).upper(),
+            referred_by_user_id=user_ids[-1] if user_ids else None,
+            upi_id="bench@upi",
+            is_upi_bound=True
+        )
+        db.add(user)
+        db.flush()
+        if user_ids:
+            team_service.link_to_referrer(db, user.id, user_ids[-1])
+        user_ids.append(user.id)
+    db.commit()
+    return user_ids
+
+
+def run_benchmark(deposits: int = 500, depth: int = 10):
+    with get_db_context() as db:
+        percents = CommissionService.get_level_percents(settings_service.get_platform_settings(db))
+        print(f"Commission percents per level: {[str(p) for p in percents] or 'none configured'}")
+
+        user_ids = create_chain(db, depth)
+        leaf_id = user_ids[-1]
+
+        transactions = [
+            Transaction(
+                transaction_uid=f"BENCH{secrets.token_hex(6).upper()}",
+                user_id=leaf_id,
+                type='crypto_deposit',
+                status='pending',
+                crypto_amount=Decimal("100"),
+                net_inr_amount=Decimal("9800.00"),
+                gross_inr_amount=Decimal("10000.00")
+            )
+            for _ in range(deposits)
+        ]
+        db.add_all(transactions)
+        db.commit()
+        transaction_ids = [t.id for t in transactions]
+
+        started = time.perf_counter()
+        for transaction_id in transaction_ids:
+            TransactionService.review_transaction(db, transaction_id, None, TransactionStatus.APPROVED)
+        approve_seconds = time.perf_counter() - started
+        print(f"Approvals: {deposits} in {approve_seconds:.2f}s ({deposits / approve_seconds:.1f}/s)")
+
+        started = time.perf_counter()
+        while OutboxService.process_batch(db):
+            pass
+        credit_seconds = time.perf_counter() - started
+        credited = db.query(Commission).filter(Commission.transaction_id.in_(transaction_ids)).count()
+        print(f"Commission crediting: {deposits} deposits, {credited} commission rows in {credit_seconds:.2f}s "
+              f"({deposits / credit_seconds:.1f} deposits/s)")
+
+        # Clean up
+        db.query(Commission).filter(Commission.transaction_id.in_(transaction_ids)).delete(synchronize_session=False)
+        db.query(OutboxEvent).filter(OutboxEvent.event_type == 'deposit_approved').filter(
+            OutboxEvent.payload["transaction_id"].as_integer().in_(transaction_ids)
+        ).delete(synchronize_session=False)
+        db.query(Transaction).filter(Transaction.id.in_(transaction_ids)).delete(synchronize_session=False)
+        db.query(TeamMember).filter(TeamMember.child_user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(user_ids)).update({"referred_by_user_id": None}, synchronize_session=False)
+        db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+if __name__ == "__main__":
+    deposits = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    run_benchmark(deposits, depth)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Drive the main user and admin flows against a running server and record
+throughput and latency per endpoint.
+
+Each thread logs in as a random seeded user (or as bench_admin) and then
+loops over its flow with weighted random picks. Results are written as
+JSON: requests, errors, requests per second and p50/p95/p99/mean latency in
+milliseconds per endpoint, plus a total. Run benchmarks/seed_data.py first.
+
+`compare` checks a candidate run against a baseline and exits with status 1
+when an endpoint's p95 or p99 got slower, or its throughput dropped, by more
+than the threshold percentage, or when its error rate went up.
+
+Usage: python benchmarks/load_test.py run [base_url] [duration_seconds] [threads] [output] [users]
+       python benchmarks/load_test.py compare <baseline.json> <candidate.json> [threshold_pct]
+"""
+import sys
+import json
+import time
+import random
+import secrets
+import threading
+import http.client
+from datetime import datetime
+from urllib.parse import urlsplit, urlencode
+
+# Must match benchmarks/seed_data.py
+PHONE_BASE = 7000000000
+PASSWORD = "benchmark"
+ADMIN_USERNAME = "bench_admin"
+WARMUP_SECONDS = 5
+ADMIN_THREAD_SHARE = 0.2
+MIN_REQUESTS_TO_COMPARE = 50
+
+# (weight, method, route label, path or path factory, form body factory)
+USER_FLOW = [
+    (10, "GET", "/user/profile", "/user/profile", None),
+    (10, "GET", "/transactions/balance", "/transactions/balance", None),
+    (8, "GET", "/transactions/my-transactions", "/transactions/my-transactions", None),
+    (5, "GET", "/user/team/members", "/user/team/members?page=1&limit=20", None),
+    (5, "GET", "/user/team/levels", "/user/team/levels", None),
+    (4, "GET", "/user/commissions", "/user/commissions", None),
+    (2, "GET", "/config/banners", "/config/banners", None),
+    (1, "POST", "/transactions/deposit", "/transactions/deposit", lambda rng: {
+        "crypto_network": "TRC20",
+        "crypto_amount": "%.2f" % rng.uniform(10, 500),
+        "crypto_tx_hash": secrets.token_hex(32),
+    }),
+]
+
+ADMIN_FLOW = [
+    (6, "GET", "/dashboard/stats", "/dashboard/stats", None),
+    (3, "GET", "/dashboard/recent-activity", "/dashboard/recent-activity", None),
+    (2, "GET", "/dashboard/transactions-chart", "/dashboard/transactions-chart", None),
+    (8, "GET", "/admin/transactions/pending", "/admin/transactions/pending?page=1&limit=20", None),
+    (6, "GET", "/admin/transactions", lambda rng: f"/admin/transactions?page={rng.randint(1, 50)}&limit=20", None),
+    (4, "GET", "/admin/users", lambda rng: f"/admin/users?page={rng.randint(1, 50)}&limit=20", None),
+    (4, "GET", "/admin/users/search", lambda rng: f"/admin/users/search?mobile_number={rng.randint(700, 709)}{rng.randint(0, 9999)}", None),
+    (4, "GET", "/admin/transactions/search-by-mobile", lambda rng: f"/admin/transactions/search-by-mobile?mobile_number={rng.randint(7000000, 7000999)}", None),
+    (6, "GET", "/admin/lookup", lambda rng: f"/admin/lookup?q={rng.randint(70000, 70099)}", None),
+]
+
+
+class Client:
+    """One keep-alive HTTP connection, reconnecting after errors."""
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.token = None
+        self.connection = None
+
+    def request(self, method: str, path: str, form: dict = None, body: dict = None):
+        headers = {}
+        payload = None
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if form is not None:
+            payload = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        elif body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if self.connection is None:
+            self.connection = self.connection_class(self.host, timeout=30)
+        try:
+            self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except Exception:
+            self.connection.close()
+            self.connection = None
+            raise
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.lock = threading.Lock()
+        self.recording = False
+
+    def add(self, label: str, elapsed: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        with self.lock:
+            self.latencies.setdefault(label, []).append(elapsed)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+
+def timed(client: Client, recorder: Recorder, method: str, label: str, path: str, **kwargs):
+    started = time.perf_counter()
+    try:
+        status, body = client.request(method, path, **kwargs)
+    except Exception:
+        status, body = 0, b""
+    recorder.add(f"{method} {label}", time.perf_counter() - started, 0 < status < 400)
+    return status, body
+
+
+def login(client: Client, recorder: Recorder, admin: bool, rng: random.Random, users: int) -> bool:
+    client.token = None
+    if admin:
+        status, body = timed(client, recorder, "POST", "/auth/admin/login", "/auth/admin/login",
+                             body={"username": ADMIN_USERNAME, "password": PASSWORD})
+    else:
+        status, body = timed(client, recorder, "POST", "/auth/login", "/auth/login",
+                             body={"phone_number": f"+91{PHONE_BASE + rng.randrange(users)}", "password": PASSWORD})
+    if status != 200:
+        return False
+    client.token = json.loads(body)["access_token"]
+    return True
+
+
+def worker(base_url: str, admin: bool, users: int, stop: threading.Event, recorder: Recorder, seed: int):
+    rng = random.Random(seed)
+    client = Client(base_url)
+    flow = ADMIN_FLOW if admin else USER_FLOW
+    weights = [step[0] for step in flow]
+    requests_since_login = 0
+
+    while not stop.is_set():
+        # Users come and go; re-login now and then so /auth/login is part of the mix
+        if client.token is None or requests_since_login >= 200:
+            if not login(client, recorder, admin, rng, users):
+                time.sleep(1)
+                continue
+            requests_since_login = 0
+        _, method, label, path, form = rng.choices(flow, weights)[0]
+        path = path(rng) if callable(path) else path
+        timed(client, recorder, method, label, path, form=form(rng) if form else None)
+        requests_since_login += 1
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+def summarize(latencies, errors: int, duration: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+    }
+
+
+def run_benchmark(base_url: str = "http://127.0.0.1:8000", duration: float = 60, threads: int = 16,
+                  output: str = "load_test.json", users: int = 1_000_000):
+    recorder = Recorder()
+    stop = threading.Event()
+    admin_threads = max(1, round(threads * ADMIN_THREAD_SHARE))
+    workers = [
+        threading.Thread(target=worker, args=(base_url, i < admin_threads, users, stop, recorder, i), daemon=True)
+        for i in range(threads)
+    ]
+    print(f"{threads} threads ({admin_threads} admin) against {base_url}, {WARMUP_SECONDS}s warm-up + {duration:g}s")
+    for thread in workers:
+        thread.start()
+    time.sleep(WARMUP_SECONDS)
+    recorder.recording = True
+    started = time.perf_counter()
+    time.sleep(duration)
+    recorder.recording = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in workers:
+        thread.join(timeout=35)
+
+    endpoints = {
+        label: summarize(latencies, recorder.errors.get(label, 0), elapsed)
+        for label, latencies in sorted(recorder.latencies.items())
+    }
+    all_latencies = [value for latencies in recorder.latencies.values() for value in latencies]
+    result = {
+        "base_url": base_url,
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "duration_seconds": round(elapsed, 2),
+        "threads": threads,
+        "endpoints": endpoints,
+        "total": summarize(all_latencies, sum(recorder.errors.values()), elapsed) if all_latencies else None,
+    }
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"{'endpoint':48s} {'requests':>9s} {'errors':>7s} {'rps':>8s} {'p50':>8s} {'p95':>8s} {'p99':>8s}")
+    for label, stats in list(endpoints.items()) + ([("TOTAL", result["total"])] if result["total"] else []):
+        print(f"{label:48s} {stats['requests']:>9,} {stats['errors']:>7,} {stats['rps']:>8.1f} "
+              f"{stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms")
+    print(f"Results written to {output}")
+
+
+def compare(baseline_path: str, candidate_path: str, threshold: float = 10.0) -> int:
+    """Print per-endpoint changes and return the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["endpoints"]
+    with open(candidate_path) as f:
+        candidate = json.load(f)["endpoints"]
+
+    regressions = 0
+    print(f"{'endpoint':48s} {'rps':>16s} {'p95':>18s} {'p99':>18s}")
+    for label in sorted(set(baseline) & set(candidate)):
+        old, new = baseline[label], candidate[label]
+        if min(old["requests"], new["requests"]) < MIN_REQUESTS_TO_COMPARE:
+            print(f"{label:48s} too few requests to compare")
+            continue
+
+        def change(key):
+            return (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+
+        problems = []
+        if change("rps") < -threshold:
+            problems.append("throughput")
+        if change("p95_ms") > threshold:
+            problems.append("p95")
+        if change("p99_ms") > threshold:
+            problems.append("p99")
+        if new["errors"] / new["requests"] > old["errors"] / old["requests"]:
+            problems.append("errors")
+        regressions += bool(problems)
+        print(f"{label:48s} {change('rps'):>+15.1f}% {change('p95_ms'):>+17.1f}% {change('p99_ms'):>+17.1f}%"
+              + (f"  REGRESSION ({', '.join(problems)})" if problems else ""))
+
+    for label in sorted(set(baseline) ^ set(candidate)):
+        print(f"{label:48s} only in {'baseline' if label in baseline else 'candidate'}")
+    print(f"{regressions} endpoint(s) regressed by more than {threshold:g}%")
+    return regressions
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        if len(sys.argv) < 4:
+            print("Usage: python benchmarks/load_test.py compare <baseline.json> <candidate.json> [threshold_pct]")
+            sys.exit(2)
+        threshold = float(sys.argv[4]) if len(sys.argv) > 4 else 10.0
+        sys.exit(1 if compare(sys.argv[2], sys.argv[3], threshold) else 0)
+
+    args = sys.argv[2:] if len(sys.argv) > 1 and sys.argv[1] == "run" else sys.argv[1:]
+    base_url = args[0] if len(args) > 0 else "http://127.0.0.1:8000"
+    duration = float(args[1]) if len(args) > 1 else 60
+    threads = int(args[2]) if len(args) > 2 else 16
+    output = args[3] if len(args) > 3 else "load_test.json"
+    users = int(args[4]) if len(args) > 4 else 1_000_000
+    run_benchmark(base_url, duration, threads, output, users)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the in-memory admin lookup index.
+
+Builds the phone, referral code and transaction UID indexes from synthetic
+data (no database needed), then reports build time, memory footprint and
+typeahead latency for random prefixes.
+
+Usage: python benchmarks/lookup_index.py [users] [transactions_per_user] [queries]
+"""
+import sys
+import os
+import time
+import random
+import string
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas.lookup import LookupKind
+from app.services.lookup_service import PrefixIndex, LookupService
+
+
+def synthetic_keys(users: int, transactions_per_user: int):
+    rng = random.Random(42)
+    phones = sorted(("91" + str(rng.randrange(6000000000, 9999999999)), i) for i in range(1, users + 1))
+    codes = sorted(("".join(rng.choices(string.ascii_uppercase + string.digits, k=8)), i) for i in range(1, users + 1))
+    uids = sorted(
+        (rng.choice(("DEP", "UPI")) + "%08X" % rng.getrandbits(32), i)
+        for i in range(1, users * transactions_per_user + 1)
+    )
+    return {LookupKind.PHONE: phones, LookupKind.REFERRAL_CODE: codes, LookupKind.TRANSACTION_UID: uids}
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+def run_benchmark(users: int = 5_000_000, transactions_per_user: int = 2, queries: int = 20000):
+    print(f"Generating {users:,} users and {users * transactions_per_user:,} transactions...")
+    keys = synthetic_keys(users, transactions_per_user)
+
+    service = LookupService()
+    total_memory = 0
+    for kind, rows in keys.items():
+        started = time.perf_counter()
+        index = PrefixIndex.from_sorted(rows)
+        elapsed = time.perf_counter() - started
+        service.indexes[kind] = index
+        memory = index.memory_bytes()
+        total_memory += memory
+        print(
+            f"{kind.value:16s} {len(index):>11,} keys  build {elapsed:6.2f}s  "
+            f"{memory / 1024 / 1024:8.1f} MiB  ({memory / max(len(index), 1):.1f} B/key)"
+        )
+    print(f"Total index memory: {total_memory / 1024 / 1024:.1f} MiB per worker")
+
+    # Same keys as a plain sorted list of str, for comparison
+    naive = sum(sys.getsizeof(key) + 8 + sys.getsizeof(id_) for key, id_ in keys[LookupKind.PHONE])
+    print(f"Phones as list[str] + ids would take ~{naive / 1024 / 1024:.1f} MiB")
+    service.ready = True
+
+    rng = random.Random(7)
+    samples = []
+    for kind, rows in keys.items():
+        for _ in range(queries // len(keys)):
+            key = rows[rng.randrange(len(rows))][0]
+            if kind == LookupKind.PHONE:
+                key = key[2:]
+            samples.append(key[:rng.randint(2, len(key))])
+
+    # A handful of live inserts land in the delta list
+    for i in range(1000):
+        service.apply({"kind": LookupKind.PHONE.value, "key": "91" + str(rng.randrange(6000000000, 9999999999)), "id": users + i})
+
+    timings = []
+    for query in samples:
+        started = time.perf_counter()
+        service.search_index(query, 10)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    print(
+        f"Lookup ({len(samples):,} queries, limit 10): p50 {percentile(timings, 0.50) * 1e6:.0f} us  "
+        f"p99 {percentile(timings, 0.99) * 1e6:.0f} us  max {timings[-1] * 1e6:.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    transactions_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+    run_benchmark(users, transactions_per_user, queries)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark connection checkout latency across pool modes.
+
+For each mode, repeatedly checks out a connection and runs SELECT 1,
+timing the checkout alone and checkout + query. Against a remote database
+the pre-ping round trip and the per-request connect of NullPool dominate.
+
+Usage: python benchmarks/pool_checkout.py [iterations] [pause_seconds]
+
+pause_seconds sleeps between checkouts; set it above DB_PRE_PING_IDLE_SECONDS
+to see the idle pre-ping kick in.
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import create_db_engine
+
+MODES = [
+    ("queue, pre-ping always", "queue", "always"),
+    ("queue, pre-ping idle", "queue", "idle"),
+    ("queue, no pre-ping", "queue", "off"),
+    ("null pool", "null", "off"),
+]
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct))]
+
+
+def run_mode(pool_mode: str, pre_ping: str, iterations: int, pause: float):
+    engine = create_db_engine(pool_mode=pool_mode, pre_ping=pre_ping)
+    # Open the first connection outside the measurement
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+
+    checkout_times = []
+    total_times = []
+    for _ in range(iterations):
+        if pause:
+            time.sleep(pause)
+        started = time.perf_counter()
+        connection = engine.connect()
+        checked_out = time.perf_counter()
+        connection.exec_driver_sql("SELECT 1")
+        connection.close()
+        finished = time.perf_counter()
+        checkout_times.append(checked_out - started)
+        total_times.append(finished - started)
+
+    engine.dispose()
+    checkout_times.sort()
+    total_times.sort()
+    return checkout_times, total_times
+
+
+def run_benchmark(iterations: int = 500, pause: float = 0.0):
+    print(f"{'mode':26s} {'checkout p50':>13s} {'p95':>9s} {'+SELECT 1 p50':>14s} {'p95':>9s}")
+    for label, pool_mode, pre_ping in MODES:
+        checkout_times, total_times = run_mode(pool_mode, pre_ping, iterations, pause)
+        print(
+            f"{label:26s} {percentile(checkout_times, 0.5) * 1000:10.3f} ms {percentile(checkout_times, 0.95) * 1000:6.3f} ms"
+            f" {percentile(total_times, 0.5) * 1000:11.3f} ms {percentile(total_times, 0.95) * 1000:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pause = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    run_benchmark(iterations, pause)
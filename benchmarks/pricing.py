@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark fee calculation.
+
+Prices the same random amounts three ways: the arithmetic the transaction
+service used to do inline (unrounded Decimal products), PricingService's
+per-call price_deposit/price_payout, and price_batch in integer paise.
+Checks that the batch results match the per-call ones exactly.
+
+Usage: python benchmarks/pricing.py [amounts] [iterations]
+"""
+import sys
+import os
+import random
+import time
+from decimal import Decimal
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.schemas.settings import PlatformSettings
+from app.schemas.transaction import QuoteType
+from app.services.pricing_service import PricingService
+
+
+def legacy_price(gross_inr: Decimal, platform_settings: PlatformSettings):
+    """The inline calculation create_upi_payout did before PricingService."""
+    platform_fee = gross_inr * (platform_settings.platform_fee_percent / 100)
+    bonus = gross_inr * (platform_settings.bonus_percent / 100)
+    return gross_inr, platform_fee, bonus, gross_inr - platform_fee + bonus
+
+
+def timeit(func, iterations: int) -> float:
+    """Mean milliseconds per call."""
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e3
+
+
+def run_benchmark(count: int = 10000, iterations: int = 20):
+    platform_settings = PlatformSettings(
+        usdt_to_inr_rate=Decimal("88.37"), platform_fee_percent=Decimal("2.50"), bonus_percent=Decimal("0.75"),
+        min_deposit_usdt=Decimal("10"), max_deposit_usdt=Decimal("100000"),
+        min_withdrawal_inr=Decimal("100"), max_withdrawal_inr=Decimal("1000000"),
+    )
+    rng = random.Random(42)
+    deposits = [Decimal(rng.randint(10_000_000, 50_000_000_000)).scaleb(-6) for _ in range(count)]
+    payouts = [Decimal(rng.randint(10_000, 100_000_000)).scaleb(-2) for _ in range(count)]
+
+    for quote_type, amounts, price_one in (
+        (QuoteType.CRYPTO_DEPOSIT, deposits, PricingService.price_deposit),
+        (QuoteType.UPI_PAYOUT, payouts, PricingService.price_payout),
+    ):
+        per_call = [price_one(amount, platform_settings) for amount in amounts]
+        assert PricingService.price_batch(quote_type, amounts, platform_settings) == per_call
+
+        if quote_type == QuoteType.CRYPTO_DEPOSIT:
+            legacy_inputs = [amount * platform_settings.usdt_to_inr_rate for amount in amounts]
+        else:
+            legacy_inputs = amounts
+        unrounded = sum(1 for value, price in zip(legacy_inputs, per_call) if legacy_price(value, platform_settings)[3] != price.net)
+
+        print(f"{quote_type.value}, {count:,} amounts ({unrounded:,} legacy net amounts not at paisa precision):")
+        results = [
+            ("legacy inline Decimal", timeit(lambda: [legacy_price(value, platform_settings) for value in legacy_inputs], iterations)),
+            ("per-call, rounded", timeit(lambda: [price_one(amount, platform_settings) for amount in amounts], iterations)),
+            ("price_batch", timeit(lambda: PricingService.price_batch(quote_type, amounts, platform_settings), iterations)),
+        ]
+        for label, millis in results:
+            print(f"  {label:24s} {millis:8.2f} ms   {millis * 1e3 / count:6.2f} us/amount")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run_benchmark(count, iterations)
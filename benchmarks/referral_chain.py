@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark user registration into a deep referral chain.
+
+Registers a chain of users where each user refers the next one, then
+measures how long linking a new user under the deepest member takes.
+
+Usage: python benchmarks/referral_chain.py [depth] [samples]
+"""
+import sys
+import os
+import time
+import secrets
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import get_db_context
+from app.models.user import User
+from app.models.team import TeamMember
+from app.schemas.user import UserRegister
+from app.services.auth_service import AuthService
+from app.services.team_service import team_service
+
+
+def random_phone() -> str:
+    return "+9" + "".join(secrets.choice("0123456789") for _ in range(12))
+
+
+def run_benchmark(depth: int = 50, samples: int = 200):
+    """Build a referral chain of the given depth and time registrations."""
+    created_ids = []
+
+    with get_db_context() as db:
+        referral_code = None
+        register_times = []
+        for _ in range(depth):
+            started = time.perf_counter()
+            user = AuthService.register_user(
+                db, UserRegister(phone_number=random_phone(), password="benchmark", referral_code=referral_code)
+            )
+            register_times.append(time.perf_counter() - started)
+            created_ids.append(user.id)
+            referral_code = user.referral_code
+
+        leaf_id = created_ids[-1]
+        closure_rows = db.query(TeamMember).filter_by(child_user_id=leaf_id).count()
+        print(f"Chain depth: {depth}, closure rows for leaf: {closure_rows}")
+        print(f"register_user (incl. bcrypt): avg {sum(register_times) / depth * 1000:.2f} ms")
+
+        # Time only the closure copy under the deepest member
+        link_times = []
+        for _ in range(samples):
+            user = User(phone_number=random_phone(), password_hash="x", referral_code=secrets.token_hex(4).upper())
+            db.add(user)
+            db.flush()
+            started = time.perf_counter()
+            team_service.link_to_referrer(db, user.id, leaf_id)
+            link_times.append(time.perf_counter() - started)
+            db.rollback()
+
+        link_times.sort()
+        print(f"link_to_referrer at level {depth + 1}: "
+              f"avg {sum(link_times) / samples * 1000:.3f} ms, "
+              f"p50 {link_times[samples // 2] * 1000:.3f} ms, "
+              f"p95 {link_times[int(samples * 0.95)] * 1000:.3f} ms")
+
+        # Clean up the chain
+        db.query(TeamMember).filter(TeamMember.child_user_id.in_(created_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(created_ids)).update({"referred_by_user_id": None}, synchronize_session=False)
+        db.query(User).filter(User.id.in_(created_ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    run_benchmark(depth, samples)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Seed a local database with benchmark volumes through COPY.
+
+Creates `users` users in referral trees up to `max_depth` levels deep (with
+their team_members closure rows and team_size counters, kept to
+REFERRAL_MAX_DEPTH levels like the API does), `transactions` transactions
+spread over the last year with their user_transaction_stats, and a
+`bench_admin` admin. Every
+seeded user has the phone number +91<7000000000 + n> and the password
+"benchmark", which is what benchmarks/load_test.py logs in with.
+
+Meant for a disposable local database: run `alembic upgrade head` first.
+
+Usage: python benchmarks/seed_data.py [users] [transactions] [max_depth]
+(max_depth defaults to REFERRAL_MAX_DEPTH, or 30 when that is unlimited)
+"""
+import sys
+import os
+import time
+import random
+from datetime import datetime, timedelta
+from array import array
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import get_db_context
+from app.models.admin import Admin
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.import_service import ImportService, TRANSACTION_STATS_SQL
+
+PHONE_BASE = 7000000000
+PASSWORD = "benchmark"
+ADMIN_USERNAME = "bench_admin"
+ROOT_PROBABILITY = 0.001  # chance that a user signs up without a referral code
+REFERRER_WINDOW = 50  # referrers are picked among the most recent users, which keeps trees deep
+DEFAULT_MAX_DEPTH = settings.referral_max_depth or 30
+
+TRANSACTION_TYPES = (("crypto_deposit", 0.6), ("upi_payout", 0.3), ("withdrawal", 0.1))
+TRANSACTION_STATUSES = (("completed", 0.55), ("approved", 0.2), ("pending", 0.15), ("rejected", 0.1))
+
+
+def phone_for(n: int) -> str:
+    return f"+91{PHONE_BASE + n}"
+
+
+def build_referrals(users: int, max_depth: int, rng: random.Random):
+    """Referrer index (-1 for roots) and depth of each seeded user."""
+    referrers = array("q")
+    depths = array("H")
+    for n in range(users):
+        if n == 0 or rng.random() < ROOT_PROBABILITY:
+            referrers.append(-1)
+            depths.append(0)
+            continue
+        referrer = n - rng.randint(1, min(n, REFERRER_WINDOW))
+        if depths[referrer] + 1 > max_depth:
+            referrers.append(-1)
+            depths.append(0)
+        else:
+            referrers.append(referrer)
+            depths.append(depths[referrer] + 1)
+    return referrers, depths
+
+
+def tracked_ancestors(n: int, referrers):
+    """(ancestor index, level) pairs of user `n` that team_members tracks."""
+    parent, level = referrers[n], 1
+    while parent >= 0 and (settings.referral_max_depth == 0 or level <= settings.referral_max_depth):
+        yield parent, level
+        parent, level = referrers[parent], level + 1
+
+
+def run_benchmark(users: int = 1_000_000, transactions: int = 10_000_000, max_depth: int = DEFAULT_MAX_DEPTH):
+    rng = random.Random(42)
+    password_hash = AuthService.hash_password(PASSWORD)
+
+    with get_db_context() as db:
+        if db.query(User.id).filter(User.phone_number == phone_for(0)).first():
+            print("Benchmark data is already seeded (user +91%d exists)." % PHONE_BASE)
+            return
+        if not db.query(Admin.id).filter(Admin.username == ADMIN_USERNAME).first():
+            db.add(Admin(username=ADMIN_USERNAME, email="bench_admin@example.com", password_hash=password_hash, role="super_admin"))
+            db.commit()
+        first_user_id = (db.execute(text("SELECT COALESCE(MAX(id), 0) FROM users")).scalar()) + 1
+        first_transaction_id = (db.execute(text("SELECT COALESCE(MAX(id), 0) FROM transactions")).scalar()) + 1
+
+    referrers, depths = build_referrals(users, max_depth, rng)
+    now = datetime.utcnow()
+    # Users sign up in order over the last year; descendants are counted for team_size
+    signup = [now - timedelta(days=365 * (users - n) / users) for n in range(0, users, max(users // 1000, 1))]
+    team_sizes = array("I", bytes(4 * users))
+    for n in range(users):
+        for parent, _ in tracked_ancestors(n, referrers):
+            team_sizes[parent] += 1
+
+    def user_rows():
+        for n in range(users):
+            referrer = referrers[n]
+            created = signup[n * len(signup) // users].strftime("%Y-%m-%d %H:%M:%S")
+            yield (
+                str(first_user_id + n), phone_for(n), password_hash, "B%07X" % n,
+                "B%07X" % referrer if referrer >= 0 else None,
+                str(first_user_id + referrer) if referrer >= 0 else None,
+                f"Bench User {n}", "%.2f" % rng.uniform(0, 50000), "0.00", "0.00", "0.00", "0.00", str(team_sizes[n]),
+                f"bench{n}@upi", "t", "t", "f", created, created,
+            )
+
+    def closure_rows():
+        for n in range(users):
+            for parent, level in tracked_ancestors(n, referrers):
+                yield str(first_user_id + parent), str(first_user_id + n), str(level)
+
+    def transaction_rows():
+        types, type_weights = zip(*TRANSACTION_TYPES)
+        statuses, status_weights = zip(*TRANSACTION_STATUSES)
+        for i in range(transactions):
+            n = rng.randrange(users)
+            kind = rng.choices(types, type_weights)[0]
+            status = rng.choices(statuses, status_weights)[0]
+            crypto = rng.uniform(10, 2000)
+            gross = crypto * 88
+            fee = gross * 0.02
+            created = (now - timedelta(seconds=rng.randrange(365 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+            yield (
+                str(first_transaction_id + i), "BT%010X" % (first_transaction_id + i), str(first_user_id + n), kind, status,
+                "TRC20", "%.6f" % crypto, "88.00", "2.00", "%.2f" % fee, "%.2f" % gross, "%.2f" % (gross - fee),
+                created, created,
+            )
+
+    with ImportService.connect() as connection, connection.cursor() as cursor:
+        started = time.perf_counter()
+        count = ImportService.copy_rows(
+            cursor, "users",
+            ("id", "phone_number", "password_hash", "referral_code", "referred_by_code", "referred_by_user_id", "name",
+             "wallet_balance", "total_deposited", "total_withdrawn", "total_commission_earned", "total_usd_sent",
+             "team_size", "upi_id", "is_upi_bound", "is_active", "is_blocked", "created_at", "updated_at"),
+            user_rows(),
+        )
+        print(f"users:         {count:>11,} rows in {time.perf_counter() - started:6.1f}s (max depth {max(depths)})")
+
+        started = time.perf_counter()
+        count = ImportService.copy_rows(cursor, "team_members", ("parent_user_id", "child_user_id", "level"), closure_rows())
+        print(f"team_members:  {count:>11,} rows in {time.perf_counter() - started:6.1f}s")
+
+        started = time.perf_counter()
+        count = ImportService.copy_rows(
+            cursor, "transactions",
+            ("id", "transaction_uid", "user_id", "type", "status", "crypto_network", "crypto_amount", "exchange_rate",
+             "platform_fee_percent", "platform_fee_amount", "gross_inr_amount", "net_inr_amount", "created_at", "updated_at"),
+            transaction_rows(),
+        )
+        print(f"transactions:  {count:>11,} rows in {time.perf_counter() - started:6.1f}s")
+
+        started = time.perf_counter()
+        cursor.execute(
+            f"WITH inserted AS (SELECT * FROM transactions WHERE id >= %(first)s) {TRANSACTION_STATS_SQL}",
+            {"first": first_transaction_id},
+        )
+        print(f"stats:         {cursor.rowcount:>11,} rows in {time.perf_counter() - started:6.1f}s")
+
+        # COPY with explicit ids does not advance the sequences
+        cursor.execute("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))")
+        cursor.execute("SELECT setval(pg_get_serial_sequence('transactions', 'id'), (SELECT MAX(id) FROM transactions))")
+
+        started = time.perf_counter()
+        cursor.execute("ANALYZE users, team_members, transactions, user_transaction_stats")
+        print(f"ANALYZE in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    transactions = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000
+    max_depth = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_MAX_DEPTH
+    run_benchmark(users, transactions, max_depth)
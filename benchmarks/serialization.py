@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization.
+
+Encodes a 100-row PaginatedTransactionResponse the ways FastAPI can:
+pydantic-core straight to bytes (the response_model path), stdlib json
+after jsonable_encoder (what a custom default response class falls back
+to), and orjson. Also compares the IST conversion against the previous
+per-field serializer that built a new timezone on every call, and the
+dashboard's plain-dict responses with and without ORJSONResponse.
+
+Usage: python benchmarks/serialization.py [rows] [iterations]
+"""
+import sys
+import os
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List, Optional
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, field_serializer
+
+from app.core.responses import ORJSONResponse
+from app.core.utils import IST_OFFSET, to_ist
+from app.schemas.transaction import PaginatedTransactionResponse, TransactionResponse
+
+
+def legacy_to_ist(dt: Optional[datetime]) -> Optional[datetime]:
+    """to_ist as it was: a new timezone object and astimezone() on every call."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone(IST_OFFSET))
+
+
+class LegacyTransactionResponse(TransactionResponse):
+    created_at: Optional[datetime] = None
+
+    @field_serializer("created_at")
+    def serialize_created_at(self, value: Optional[datetime]) -> Optional[datetime]:
+        return legacy_to_ist(value)
+
+
+class LegacyPaginatedTransactionResponse(PaginatedTransactionResponse):
+    transactions: List[LegacyTransactionResponse]
+
+
+def synthetic_transactions(rows: int):
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=i, transaction_uid=f"DEP{i:08X}", type="crypto_deposit", status="completed",
+            user=SimpleNamespace(id=i % 97, name=f"User {i % 97}", email=None, phone_number=f"+9170000{i:05d}", referral_code=f"R{i:07d}"),
+            crypto_network="TRC20", crypto_amount=Decimal("125.500000"), remaining_crypto=None,
+            gross_inr_amount=Decimal("11044.00"), net_inr_amount=Decimal("10823.12"), platform_fee_amount=Decimal("220.88"),
+            bonus_amount=Decimal("0.00"), payment_reference=None, created_at=now - timedelta(minutes=i),
+        )
+        for i in range(rows)
+    ]
+
+
+def timeit(func, iterations: int) -> float:
+    """Mean microseconds per call."""
+    func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_benchmark(rows: int = 100, iterations: int = 2000):
+    orm_rows = synthetic_transactions(rows)
+    page = {"transactions": orm_rows, "total": rows, "page": 1, "limit": rows, "total_pages": 1}
+
+    stamp = datetime.utcnow()
+    print(f"to_ist per call:          legacy {timeit(lambda: legacy_to_ist(stamp), iterations * 50):6.2f} us   "
+          f"current {timeit(lambda: to_ist(stamp), iterations * 50):6.2f} us")
+
+    adapter = TypeAdapter(PaginatedTransactionResponse)
+    legacy_adapter = TypeAdapter(LegacyPaginatedTransactionResponse)
+    model = PaginatedTransactionResponse.model_validate(page, from_attributes=True)
+    legacy_model = LegacyPaginatedTransactionResponse.model_validate(page, from_attributes=True)
+    assert adapter.dump_json(model) == legacy_adapter.dump_json(legacy_model)
+
+    print(f"\n{rows}-row PaginatedTransactionResponse ({len(adapter.dump_json(model)):,} bytes):")
+    results = [
+        ("validate from ORM rows", timeit(lambda: PaginatedTransactionResponse.model_validate(page, from_attributes=True), iterations)),
+        ("dump_json (response_model path)", timeit(lambda: adapter.dump_json(model), iterations)),
+        ("dump_json, legacy serializers", timeit(lambda: legacy_adapter.dump_json(legacy_model), iterations)),
+        ("model_dump + orjson", timeit(lambda: orjson.dumps(model.model_dump(mode="json")), iterations)),
+        ("jsonable_encoder + json.dumps", timeit(lambda: json.dumps(jsonable_encoder(model)).encode(), iterations)),
+    ]
+    for label, micros in results:
+        print(f"  {label:34s} {micros:9.1f} us")
+
+    activity = [
+        {"id": t.id, "transaction_uid": t.transaction_uid, "type": t.type, "status": t.status,
+         "amount": float(t.net_inr_amount), "user_id": t.user.id, "created_at": t.created_at}
+        for t in orm_rows
+    ]
+    response = ORJSONResponse(activity)
+    assert json.loads(response.render(activity)) == json.loads(json.dumps(jsonable_encoder(activity)))
+    print(f"\n{rows}-row dashboard activity list (plain dicts):")
+    print(f"  {'jsonable_encoder + json.dumps':34s} {timeit(lambda: json.dumps(jsonable_encoder(activity)).encode(), iterations):9.1f} us")
+    print(f"  {'ORJSONResponse.render':34s} {timeit(lambda: response.render(activity), iterations):9.1f} us")
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    run_benchmark(rows, iterations)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark application startup.
+
+Measures, each in a fresh interpreter:
+  - import time of `main` (the app and everything it imports)
+  - time from launching uvicorn until the first request is answered
+
+Usage: python benchmarks/startup.py [runs] [port]
+"""
+import sys
+import os
+import time
+import subprocess
+import statistics
+import http.client
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time() -> float:
+    """Seconds to import main in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 10):
+    """Top modules by cumulative import time (python -X importtime)."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def time_to_first_request(port: int, timeout: float = 60.0) -> float:
+    """Seconds from starting uvicorn until /health/live answers."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"], cwd=ROOT
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", "/health/live")
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError("server did not answer")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_benchmark(runs: int = 5, port: int = 8791):
+    imports = [import_time() for _ in range(runs)]
+    print(f"import main: median {statistics.median(imports) * 1000:.0f} ms (min {min(imports) * 1000:.0f} ms)")
+
+    print("Slowest imports (cumulative):")
+    for cumulative, name in slowest_imports():
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    first = [time_to_first_request(port) for _ in range(runs)]
+    print(f"time to first request: median {statistics.median(first) * 1000:.0f} ms (min {min(first) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8791
+    run_benchmark(runs, port)
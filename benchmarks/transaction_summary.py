@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark the transaction summary.
+
+For the user with the most transactions, compares GET /transactions/summary
+with what the mobile app did before: page through
+/transactions/my-transactions and count and sum client-side. Checks that both
+give the same per-type/per-status counts.
+
+Usage: python benchmarks/transaction_summary.py [iterations] [page_size]
+"""
+import sys
+import os
+import time
+from collections import Counter
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.core.security import create_access_token
+from app.db.database import get_db_context
+from app.models.transaction import Transaction
+
+
+def client_side_summary(client: TestClient, headers: dict, page_size: int):
+    """Fetch every page of my-transactions; returns (counts by (type, status), requests made)."""
+    counts = Counter()
+    requests = 0
+    offset = 0
+    while True:
+        page = client.get(f"/transactions/my-transactions?limit={page_size}&offset={offset}", headers=headers).json()
+        requests += 1
+        for transaction in page:
+            counts[(transaction["type"], transaction["status"])] += 1
+        if len(page) < page_size:
+            return counts, requests
+        offset += page_size
+
+
+def run_benchmark(iterations: int = 20, page_size: int = 20):
+    with get_db_context() as db:
+        row = (
+            db.query(Transaction.user_id, func.count(Transaction.id))
+            .group_by(Transaction.user_id)
+            .order_by(func.count(Transaction.id).desc())
+            .first()
+        )
+    if row is None:
+        print("No transactions; seed some data first (benchmarks/seed_data.py)")
+        sys.exit(1)
+    user_id, transactions = row
+
+    from main import app
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id), 'role': 'user'})}"}
+
+    expected, requests = client_side_summary(client, headers, page_size)
+    summary = client.get("/transactions/summary", headers=headers).json()
+    actual = Counter({(entry["type"], entry["status"]): entry["count"] for entry in summary["counts"]})
+    assert actual == expected, f"summary {dict(actual)} != client-side {dict(expected)}"
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        client_side_summary(client, headers, page_size)
+    paged = (time.perf_counter() - started) / iterations
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        client.get("/transactions/summary", headers=headers)
+    aggregated = (time.perf_counter() - started) / iterations
+
+    print(f"User {user_id}: {transactions} transactions, {len(summary['monthly'])} monthly rows")
+    print(f"  my-transactions pages: {requests:3d} requests {paged * 1000:8.1f} ms")
+    print(f"  /transactions/summary:   1 request  {aggregated * 1000:8.1f} ms ({paged / aggregated:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run_benchmark(iterations, page_size)
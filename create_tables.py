@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Script to create all tables in an empty database and mark it as migrated.
+
+The app no longer runs create_all on startup; use this once for a fresh
+(e.g. local) database, then 'alembic upgrade head' for later changes.
+
+Usage: python create_tables.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.config import Config
+
+from app.db.database import init_db, PROJECT_ROOT
+
+def create_tables():
+    """Create tables from the models and stamp the Alembic head."""
+    init_db()
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    command.stamp(config, "head")
+    print("Tables created and stamped at the Alembic head.")
+
+if __name__ == "__main__":
+    create_tables()
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for production.
+
+Usage: gunicorn main:app -c gunicorn.conf.py
+
+Runs WEB_CONCURRENCY uvicorn workers. The app is imported once in the
+master (preload_app) and forked; each worker then drops the inherited
+pools of the primary and replica engines so no database connection is
+shared between processes. Pool sizes per worker are derived from
+WEB_CONCURRENCY and DB_MAX_CONNECTIONS in app/db/database.py.
+"""
+import os
+
+from app.core.config import settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = settings.web_concurrency
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# SIGTERM: stop accepting, close WebSockets with 1012 so clients reconnect
+# elsewhere, finish in-flight requests, then run the lifespan shutdown
+graceful_timeout = settings.graceful_timeout_seconds
+timeout = 60
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from app.db.database import engine, replica_engine
+
+    # Connections opened in the master (if any) belong to it; start with empty pools
+    engine.dispose(close=False)
+    if replica_engine is not None and replica_engine is not engine:
+        replica_engine.dispose(close=False)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Script to bulk import users or transactions from CSV or NDJSON with COPY.
+
+The header (or the keys of the first NDJSON object) names the columns.
+Users need phone_number, password_hash (bcrypt) and referral_code; referrers
+are linked through referred_by_code and their team rows are built in one
+pass. Transactions need transaction_uid, type and either user_id or
+user_phone_number.
+
+Secondary indexes are dropped for the import and rebuilt at the end, which
+locks the tables until it commits; pass --keep-indexes on a live database.
+
+Usage: python import_data.py <users|transactions> <file.csv|file.ndjson> [--keep-indexes]
+"""
+import sys
+import os
+import psycopg
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.import_service import ImportService
+
+def import_data():
+    """Import one file and print a rows-per-second report."""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if len(args) != 2 or args[0] not in ("users", "transactions"):
+        print("Usage: python import_data.py <users|transactions> <file.csv|file.ndjson> [--keep-indexes]")
+        sys.exit(2)
+    kind, path = args
+
+    try:
+        report = ImportService.run(kind, path, defer_indexes="--keep-indexes" not in sys.argv)
+    except (ValueError, psycopg.Error) as e:
+        print(f"Import failed, nothing was written: {e}")
+        sys.exit(1)
+
+    print(f"Imported {report['rows']:,} {kind} in {report['total_seconds']:.1f}s ({report['rows_per_second']:,.0f} rows/s)")
+    print(f"  COPY into staging: {report['copy_seconds']:.1f}s ({report['rows'] / max(report['copy_seconds'], 1e-9):,.0f} rows/s)")
+    print(f"  INSERT ... SELECT: {report['insert_seconds']:.1f}s")
+    if kind == "users":
+        print(f"  Referrers linked:  {report['linked_referrers']:,}")
+        print(f"  Team rows built:   {report['team_rows']:,} in {report['team_seconds']:.1f}s")
+    if "index_seconds" in report:
+        print(f"  Index rebuild:     {report['index_seconds']:.1f}s")
+
+if __name__ == "__main__":
+    import_data()
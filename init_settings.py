@@ -38,6 +38,12 @@ def init_platform_settings():
             "data_type": "number",
             "description": "Referral commission percentage"
         },
+        {
+            "setting_key": "commission_level_percents",
+            "setting_value": "[]",
+            "data_type": "json",
+            "description": "Referral commission percentage per level, e.g. [5, 2, 1] (empty uses commission_percent for direct referrers)"
+        },
         {
             "setting_key": "min_deposit_usdt",
             "setting_value": "10",
@@ -1,19 +1,100 @@
 import os
+import signal
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.db.database import init_db
-from app.routers import auth, user, transactions, dashboard, notifications, storage, app_config
+from app.routers import auth, user, transactions, dashboard, notifications, storage, app_config, lookup, metrics, health, activity
+from app.core.broker import broker
+from app.core.revocation import revocation_list
+from app.db.database import replica_router
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware, TimedJSONResponse
+from app.core.startup import warm_up
+from app.services.outbox_service import outbox_service
+from app.services.activity_service import activity_service
+from app.services.partition_service import partition_service
+from app.services.lookup_service import lookup_service
+from app.services.health_service import health_service
+from app.services.notification_service import notification_service
+from app.services.settings_service import settings_service
+from app.services.exchange_rate_service import exchange_rate_service
+
+
+def drain_websockets_on_sigterm(loop: asyncio.AbstractEventLoop):
+    """Close notification WebSockets as soon as SIGTERM arrives so clients
+    reconnect to another worker, then let the server's own handler run."""
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handler(signum, frame):
+        loop.call_soon_threadsafe(lambda: loop.create_task(notification_service.close_all()))
+        if callable(previous):
+            previous(signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, handler)
+    except ValueError:
+        # Not running in the main thread (e.g. under a test client)
+        pass
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    # Initialize database tables
-    init_db()
+    # Alembic owns the schema: check the revision instead of reflecting tables,
+    # and open pool connections / load settings concurrently
+    await warm_up()
+
+    drain_websockets_on_sigterm(asyncio.get_running_loop())
+
+    # Background worker for outbox events (e.g. referral commissions)
+    stop_event = asyncio.Event()
+    outbox_task = None
+    if settings.outbox_worker_enabled:
+        outbox_task = asyncio.create_task(outbox_service.run_worker(stop_event))
+
+    # Batched audit log writes
+    activity_task = asyncio.create_task(activity_service.run_worker(stop_event))
+
+    # Keeps next months' partitions created
+    partition_task = None
+    if settings.partition_maintenance_enabled:
+        partition_task = asyncio.create_task(partition_service.run_worker(stop_event))
+
+    # Event loop lag for the readiness probe
+    loop_lag_task = asyncio.create_task(health_service.monitor_loop_lag(stop_event))
+
+    # Cross-worker cache invalidation, the exchange rate history, the access
+    # token revocation list, read-your-writes replica pinning and the in-memory
+    # admin lookup index, kept in sync via LISTEN/NOTIFY
+    settings_service.start()
+    exchange_rate_service.start(asyncio.get_running_loop())
+    revocation_list.start()
+    replica_router.start()
+    if settings.lookup_index_enabled:
+        lookup_service.start()
+    broker.start()
+
     yield
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+    await notification_service.close_all()
+    stop_event.set()
+    if outbox_task:
+        await outbox_task
+    # Drains whatever is still buffered
+    await activity_task
+    if partition_task:
+        await partition_task
+    await loop_lag_task
+    # Joining the listener thread blocks for up to a few seconds; keep it off the event loop
+    await asyncio.to_thread(broker.stop)
+
+app = FastAPI(
+    title=settings.app_name,
+    lifespan=lifespan,
+    # Times JSON encoding for the Server-Timing header when SQL profiling is on
+    **({"default_response_class": TimedJSONResponse} if settings.sql_profiling_enabled else {})
+)
 
 # Configure CORS
 app.add_middleware(
@@ -24,6 +105,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and per-request SQL metrics, exposed on /metrics
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in SQL profiler: slow request / N+1 reports and Server-Timing on X-Debug-Timing
+if settings.sql_profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include API routers
 app.include_router(auth, tags=["Authentication"])
 app.include_router(user, tags=["User"])
@@ -31,6 +120,11 @@ app.include_router(transactions, tags=["Transactions"])
 app.include_router(dashboard, tags=["Dashboard"])
 app.include_router(notifications, tags=["Notifications"])
 app.include_router(app_config, tags=["App Config"])
+app.include_router(lookup, tags=["Admin Lookup"])
+app.include_router(activity, tags=["Admin Activity"])
+app.include_router(health, tags=["Health"])
+if settings.metrics_enabled:
+    app.include_router(metrics, tags=["Metrics"])
 
 @app.get("/")
 def root():
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Script to maintain the monthly partitions of transactions, activity_logs and
+notifications.
+
+'ensure' creates the partitions for this month and the next
+PARTITION_MONTHS_AHEAD months (the API also does this in the background).
+'archive' detaches every partition older than PARTITION_RETENTION_MONTHS
+(or --older-than), writes it to PARTITION_ARCHIVE_DIR as <partition>.csv.gz
+and drops it; --keep leaves the detached table in place. Run it from cron,
+e.g. monthly.
+
+Usage: python manage_partitions.py ensure [months_ahead]
+       python manage_partitions.py archive <transactions|activity_logs|notifications|all> [--older-than=N] [--keep]
+"""
+import sys
+import os
+import psycopg
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.partition_service import PartitionService, PARTITIONED_TABLES
+
+USAGE = (
+    "Usage: python manage_partitions.py ensure [months_ahead]\n"
+    "       python manage_partitions.py archive <transactions|activity_logs|notifications|all> [--older-than=N] [--keep]"
+)
+
+def manage_partitions():
+    """Create upcoming partitions or archive old ones and print what was done."""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].split("=", 1) if "=" in arg else (arg[2:], "") for arg in sys.argv[1:] if arg.startswith("--"))
+
+    if args[:1] == ["ensure"] and len(args) <= 2:
+        created = PartitionService.ensure_partitions(int(args[1]) if len(args) > 1 else None)
+        print(f"Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+        return
+
+    if args[:1] != ["archive"] or len(args) != 2 or args[1] not in PARTITIONED_TABLES + ("all",):
+        print(USAGE)
+        sys.exit(2)
+
+    tables = PARTITIONED_TABLES if args[1] == "all" else (args[1],)
+    older_than = int(options["older-than"]) if options.get("older-than") else None
+    for table in tables:
+        try:
+            report = PartitionService.archive(table, older_than, drop="keep" not in options)
+        except (ValueError, psycopg.Error) as e:
+            print(f"Archiving {table} failed: {e}")
+            sys.exit(1)
+        if not report:
+            print(f"{table}: nothing to archive")
+        for entry in report:
+            print(
+                f"{entry['partition']}: {entry['rows']:,} rows, {entry['bytes'] / 1e6:.1f} MB -> {entry['file']}"
+                f"{'' if entry['dropped'] else ' (detached, kept)'}"
+            )
+
+if __name__ == "__main__":
+    manage_partitions()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to recompute denormalized user counters (team_size, total_commission_earned)
+and report how far they had drifted.
+
+Usage: python reconcile_counters.py [--dry-run]
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import get_db_context
+from app.services.reconciliation_service import ReconciliationService
+
+def reconcile_counters():
+    """Reconcile user counters and print a drift report."""
+    dry_run = "--dry-run" in sys.argv
+
+    with get_db_context() as db:
+        report = ReconciliationService.reconcile_user_counters(db, fix=not dry_run)
+
+    print(f"Users with drifted counters: {report['drifted_users']}")
+    print(f"Total team_size drift: {report['team_size_drift']}")
+    print(f"Total commission drift: {report['total_commission_drift']}")
+    for row in report["sample"]:
+        print(
+            f"  user {row['user_id']}: "
+            f"team_size {row['team_size']['stored']} -> {row['team_size']['expected']}, "
+            f"total_commission_earned {row['total_commission_earned']['stored']} -> {row['total_commission_earned']['expected']}"
+        )
+
+    if dry_run:
+        print("Dry run, no counters were changed.")
+    else:
+        print(f"Counters fixed for {report['fixed_users']} users.")
+
+if __name__ == "__main__":
+    reconcile_counters()